@@ -21,10 +21,10 @@ if errorlevel 1 (
 
 :: Check if required packages are installed
 echo Checking Python packages...
-python -c "import selenium, pandas, openpyxl" >nul 2>&1
+python -c "import selenium, pandas, openpyxl, requests" >nul 2>&1
 if errorlevel 1 (
     echo Some required packages are missing. Installing...
-    pip install selenium pandas openpyxl webdriver-manager
+    pip install selenium pandas openpyxl webdriver-manager requests
     if errorlevel 1 (
         echo ERROR: Failed to install required packages
         pause
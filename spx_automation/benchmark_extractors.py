@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+SPX Extraction Engine Benchmark
+Compares the DOM-walk, JS-snapshot and HTML-parse engines on identical pages
+
+Synthetic SPX-like detail and task list pages are written to disk and opened in
+headless Chrome, then every engine extracts the same page several times.
+Use --offline to time only the HTML parser against the fixtures (or a saved
+page via --html) without starting a browser.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from spx_extractors import parse_task_rows_html, parse_tracking_html
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<div class="ssc-table">
+<table>
+<thead><tr>{header}</tr></thead>
+<tbody>
+{rows}
+</tbody>
+</table>
+</div>
+<ul class="ssc-pager"><li class="pager-item active">1</li><li class="pager-item">2</li></ul>
+<span class="pager-total">Total {total}</span>
+</body>
+</html>
+"""
+
+
+def build_detail_page(row_count):
+    """Detail page: Sender ID, Sender Name, SPX Tracking Number, Receive Time"""
+    header = "".join(f"<th>{name}</th>" for name in ("Sender ID", "Sender Name", "SPX Tracking Number", "Receive Time"))
+    rows = []
+    for index in range(row_count):
+        sender_id = 1257601721 + index % 5
+        rows.append(
+            f"<tr><td>{sender_id}</td><td>Seller {index % 5}</td>"
+            f"<td><span class=\"tracking\">PH25124920{index:05d}S</span></td>"
+            f"<td>2025-08-05 14:{index % 60:02d}:00</td></tr>"
+        )
+    return PAGE_TEMPLATE.format(title="Receive Task Detail", header=header, rows="\n".join(rows), total=row_count)
+
+
+def build_task_list_page(row_count):
+    """Task list page: Task ID, Station, Complete Time, Status badge"""
+    header = "".join(f"<th>{name}</th>" for name in ("Receive Task ID", "Station", "Complete Time", "Status"))
+    rows = []
+    for index in range(row_count):
+        done = index % 6 != 0
+        badge = '<span class="ssc-tag status-success">Done</span>' if done else '<span class="ssc-tag status-pending">Pending</span>'
+        rows.append(
+            f"<tr><td>DRT20250805{index:02d}VEC</td><td>PH Hub</td>"
+            f"<td>2025-08-05 {index % 24:02d}:30:00</td><td>{badge}</td></tr>"
+        )
+    return PAGE_TEMPLATE.format(title="Receive Task", header=header, rows="\n".join(rows), total=row_count)
+
+
+def write_fixtures(directory, row_count):
+    """Write the detail and task list fixtures, returning their paths"""
+    os.makedirs(directory, exist_ok=True)
+    detail_path = os.path.join(directory, "receive_task_detail.html")
+    list_path = os.path.join(directory, "receive_task_list.html")
+    with open(detail_path, "w", encoding="utf-8") as f:
+        f.write(build_detail_page(row_count))
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write(build_task_list_page(row_count))
+    return detail_path, list_path
+
+
+def summarize(label, timings_ms, commands=None):
+    """Print mean/median timing and remote command count for one engine"""
+    line = f"  {label:<10} mean {statistics.mean(timings_ms):8.2f} ms   median {statistics.median(timings_ms):8.2f} ms"
+    if commands is not None:
+        line += f"   remote commands/page {commands}"
+    print(line)
+
+
+def run_offline(detail_path, list_path, repeats):
+    """Time the HTML parser alone against saved HTML, no browser required"""
+    for label, path, parse in (("detail", detail_path, parse_tracking_html), ("task list", list_path, parse_task_rows_html)):
+        if not path:
+            continue
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = parse(html)
+            timings.append((time.perf_counter() - start) * 1000)
+        size = sum(len(v) for v in result.values()) if isinstance(result, dict) else len(result)
+        print(f"\n{label} page ({os.path.basename(path)}): {size} records")
+        summarize("html", timings)
+
+
+def run_browser(detail_path, list_path, repeats):
+    """Time every engine against the fixtures in headless Chrome"""
+    from spx_audit_automation import EXTRACTION_ENGINES, SPXAuditAutomationFixed
+
+    automation = SPXAuditAutomationFixed(headless=True)
+    if not automation.setup_driver():
+        print("❌ Could not start Chrome, re-run with --offline to benchmark the HTML parser only")
+        return False
+
+    try:
+        pages = (
+            ("detail", detail_path, automation.get_tracking_numbers_from_page),
+            ("task list", list_path, automation.scan_current_page_tasks),
+        )
+        for label, path, extract in pages:
+            automation.driver.get(Path(path).resolve().as_uri())
+            print(f"\n{label} page ({os.path.basename(path)}):")
+
+            baseline = None
+            for engine in EXTRACTION_ENGINES:
+                automation.extraction_engine = engine
+                timings = []
+                for _ in range(repeats):
+                    automation.page_command_counts = []
+                    start = time.perf_counter()
+                    result = extract()
+                    timings.append((time.perf_counter() - start) * 1000)
+                commands = automation.page_command_counts[0]["commands"] if automation.page_command_counts else None
+                summarize(engine, timings, commands)
+
+                if baseline is None:
+                    baseline = result
+                elif result != baseline:
+                    print(f"  ⚠️ {engine} result differs from {EXTRACTION_ENGINES[0]}")
+        return True
+    finally:
+        automation.driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SPX page extraction engines")
+    parser.add_argument("--rows", type=int, default=24, help="Rows per synthetic page (SPX default page size is 24)")
+    parser.add_argument("--repeats", type=int, default=10, help="Extractions per engine and page")
+    parser.add_argument("--fixtures", help="Directory to write the synthetic fixtures to (default: temporary)")
+    parser.add_argument("--offline", action="store_true", help="Benchmark the HTML parser only, without a browser")
+    parser.add_argument("--html", help="Saved detail page HTML to parse instead of the synthetic fixture (offline)")
+    args = parser.parse_args()
+
+    fixtures_dir = args.fixtures or tempfile.mkdtemp(prefix="spx_bench_")
+    detail_path, list_path = write_fixtures(fixtures_dir, args.rows)
+    print(f"Fixtures: {fixtures_dir} ({args.rows} rows per page, {args.repeats} repeats)")
+
+    if args.offline or args.html:
+        run_offline(args.html or detail_path, None if args.html else list_path, args.repeats)
+        return 0
+
+    return 0 if run_browser(detail_path, list_path, args.repeats) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,7 @@ Handles pagination and correctly counts tracking numbers per sender ID
 
 import time
 import json
-import csv
-import pandas as pd
+import base64
 import os
 import sys
 from datetime import datetime
@@ -18,10 +17,29 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 import logging
 import re
 import math
+import argparse
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+from spx_extractors import (
+    TABLE_SNAPSHOT_JS, TASK_ROWS_JS, TABLES_HTML_JS, parse_tracking_rows, looks_like_complete_time,
+    split_task_rows, parse_tracking_html, parse_task_rows_html, decode_task_records, decode_tracking_records,
+    find_total, PAGE_STATE_JS, CLICK_NEXT_PAGE_JS, PAGER_INFO_JS, OPEN_PAGE_SIZE_SELECTOR_JS,
+    PICK_LARGEST_PAGE_SIZE_JS, GOTO_PAGE_JS, LOGIN_STATE_JS, merge_task_pages, parse_complete_time, page_older_than
+)
+from spx_http_client import SPXApiError, SPXHttpClient, fetch_task_details_concurrently
+from spx_chromedriver import ChromeDriverResolver, find_chrome_binary
+from spx_daemon import DEFAULT_DAEMON_PORT, DEFAULT_DEBUG_PORT, run_daemon
+from spx_session import SPX_HOME_URL, snapshot_session, restore_session, save_session_file, load_session_file
+from spx_driver_pool import run_driver_pool
+from spx_pipeline import run_list_detail_pipeline
+from spx_ledger import TaskLedger, audit_failed
+from spx_results import DEFAULT_RESULTS_PATH, ResultsStore
+from spx_checkpoint import RunCheckpoint
+from spx_exporters import AuditExportSink, JsonArrayWriter, CsvRowWriter, ExcelStreamWriter
+from spx_waits import (WaitEngine, document_ready, tbody_has_rows, page_changed, row_count_above, on_page,
+                       page_or_login, logged_in)
 
 # Get script directory for output files
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -30,6 +48,12 @@ OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'output')
 # Ensure output directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Tasks audited by earlier runs, skipped unless refresh is requested
+DEFAULT_LEDGER_PATH = os.path.join(OUTPUT_DIR, 'spx_ledger.sqlite3')
+
+# One fsynced JSONL progress file per run, used by --resume
+CHECKPOINT_DIR = os.path.join(OUTPUT_DIR, 'checkpoints')
+
 # Configure logging with output directory
 logging.basicConfig(
     level=logging.INFO,
@@ -41,20 +65,160 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Page extraction engines: 'snapshot' pulls a table in one execute_script call,
+# 'html' fetches the table HTML once and parses it in Python,
+# 'dom' walks rows and cells element by element (one remote call each)
+EXTRACTION_ENGINES = ('snapshot', 'html', 'dom')
+
+# SPX_HOME_URL is defined once in spx_session, which restores sessions onto it
+RECEIVE_TASKS_URL = SPX_HOME_URL + "inbound-management/receive-task"
+RECEIVE_TASK_DETAIL_URL = RECEIVE_TASKS_URL + "/detail/{task_id}"
+
+# Login cookies and localStorage saved after a login and reused by later runs
+DEFAULT_SESSION_PATH = os.path.join(OUTPUT_DIR, 'spx_session.json')
+
+# Login completion is detected instead of confirmed with Enter; SPX_AUTH_COOKIE names a
+# cookie whose appearance also counts as logged in
+SPX_AUTH_COOKIE = os.getenv("SPX_AUTH_COOKIE")
+INTERACTIVE_LOGIN_TIMEOUT = 300
+
+# Random-access page navigation: 'router' jumps through the pager's jump-to-page input
+# without reloading, 'url' loads the page number from a query parameter (falling back to
+# 'router' if the app ignores it), 'click' only steps through the pager one page at a time
+PAGE_NAVIGATION_MODES = ('router', 'url', 'click')
+
+# Query parameters read by 'url' page navigation
+PAGE_QUERY_PARAM = os.getenv("SPX_PAGE_QUERY_PARAM", "page")
+PAGE_SIZE_QUERY_PARAM = os.getenv("SPX_PAGE_SIZE_QUERY_PARAM", "pageSize")
+
+# Safety limit to prevent infinite pagination loops within one task,
+# used only when the page count cannot be planned from the "Total N" pager text
+MAX_DETAIL_PAGES = 50
+
 class SPXAuditAutomationFixed:
-    def __init__(self, headless=False, wait_time=10):
+    def __init__(self, headless=False, wait_time=10, extraction_engine='snapshot', capture_network=False,
+                 http_fetch=False, concurrency=1, rate_limit=None, tabs=1, workers=1, recycle_after=50,
+                 page_navigation='router', pipeline=False, ledger_path=DEFAULT_LEDGER_PATH, refresh=False,
+                 since=None, until=None, resume=None, defer_excel=False, results_path=DEFAULT_RESULTS_PATH,
+                 profile_dir=None, session_file=None, login_timeout=None,
+                 offline=False, debugger_address=None):
         """
         Initialize the SPX audit automation with proper tracking number counting
         
         Args:
             headless (bool): Run browser in headless mode
             wait_time (int): Default wait time for elements
+            extraction_engine (str): Page extraction engine, one of EXTRACTION_ENGINES
+            capture_network (bool): Read task and tracking records from SPX's own API responses
+                via Chrome's network log, falling back to the extraction engine
+            http_fetch (bool): After login, fetch the task list and details from SPX's backend
+                over a pooled HTTP session instead of rendering pages
+            concurrency (int): Task details fetched concurrently in HTTP mode
+            rate_limit (float): Maximum HTTP requests per second to the SPX host (None for unlimited)
+            tabs (int): Browser tabs in the logged-in session used to pipeline task detail pages
+            workers (int): Chrome worker processes sharing the login session (process-pool mode)
+            recycle_after (int): Restart a pool worker's Chrome after this many tasks
+            page_navigation (str): How pages are addressed, one of PAGE_NAVIGATION_MODES
+            pipeline (bool): Stream tasks from each scanned list page straight to concurrent
+                detail consumers instead of scanning the whole list first
+            ledger_path (str): SQLite ledger of audited tasks (None to audit every task every run)
+            refresh (bool): Re-audit tasks already in the ledger (their records are replaced)
+            since (datetime): Only audit tasks completed at or after this time; the list scan stops
+                at the first page older than it (defaults to the ledger's watermark)
+            until (datetime): Only audit tasks completed at or before this time
+            resume (str): Run ID whose checkpoint is reloaded to continue an interrupted run
+            defer_excel (bool): Return once the JSON and CSV are on disk and finish the
+                Excel workbook in the background (see export_sink.wait())
+            results_path (str): SQLite results database queried with spx_results.py (None to skip it)
+            profile_dir (str): Persistent Chrome profile (--user-data-dir) that keeps the login between runs
+            session_file (str): Saved login session reused by later runs (None, the default, to always log in by hand)
+            login_timeout (float): Seconds to wait for a manual login to complete; defaults to
+                INTERACTIVE_LOGIN_TIMEOUT, or wait_time when headless since nobody can log in there
+            offline (bool): Only use a ChromeDriver already on this machine, never download one
+            debugger_address (str): 'host:port' of a running Chrome started with --remote-debugging-port;
+                the run attaches to it instead of launching a browser and leaves it open afterwards
         """
+        if extraction_engine not in EXTRACTION_ENGINES:
+            raise ValueError(f"Unknown extraction engine '{extraction_engine}', expected one of {EXTRACTION_ENGINES}")
+        if page_navigation not in PAGE_NAVIGATION_MODES:
+            raise ValueError(f"Unknown page navigation '{page_navigation}', expected one of {PAGE_NAVIGATION_MODES}")
+        
+        self.headless = headless
         self.wait_time = wait_time
+        self.extraction_engine = extraction_engine
         self.driver = None
         self.wait = None
+        self.waits = None
         self.audit_data = []
         
+        # Remote WebDriver command accounting
+        self.remote_command_count = 0
+        self.page_command_counts = []
+        
+        # Network capture state: decoded API payloads waiting to be consumed, keyed by kind
+        self.capture_network = capture_network
+        self.captured = {"tasks": [], "tracking": []}
+        self.api_endpoints = {}
+        self.last_api_total = None
+        self._pending_responses = {}
+        
+        # Browserless fetching over the exported login session
+        self.http_fetch = http_fetch
+        self.http_client = None
+        self.concurrency = max(1, concurrency)
+        self.rate_limit = rate_limit
+        
+        # Detail pages pipelined across tabs of the one logged-in browser,
+        # or sharded across separate Chrome processes
+        self.tabs = max(1, tabs)
+        self.workers = max(1, workers)
+        self.recycle_after = recycle_after
+        self.pool_stats = {}
+        
+        # Random-access pagination; URL addressing is dropped for the run once the app ignores it
+        self.page_navigation = page_navigation
+        self.url_pagination = page_navigation == 'url'
+        
+        # Streaming list -> detail pipeline
+        self.pipeline = pipeline
+        self.pipeline_stats = {}
+        
+        # Incremental audits: the ledger is opened by audit_all_tasks, not by pool workers
+        self.ledger_path = ledger_path
+        self.refresh = refresh
+        self.ledger = None
+        
+        # Completion-time window; the list is newest first, so scanning stops below the lower bound
+        self.since = since
+        self.until = until
+        self.scan_lower_bound = since
+        self.full_run = False
+        # Set by the list scanners once they reach the last page or the lower bound
+        self.scan_complete = False
+        self.scan_errors = 0
+        
+        # Crash-safe progress of this run, opened by audit_all_tasks
+        self.resume_run_id = resume
+        self.checkpoint = None
+        
+        # Output files written task by task while the run is in progress
+        self.export_sink = None
+        self.defer_excel = defer_excel
+        
+        # Queryable per-sender results, added to at the end of each run
+        self.results_path = results_path
+        
+        # Login reuse across runs: a persistent profile and/or a saved session file
+        self.profile_dir = profile_dir
+        self.session_file = session_file
+        if login_timeout is None:
+            login_timeout = wait_time if headless else INTERACTIVE_LOGIN_TIMEOUT
+        self.login_timeout = login_timeout
+        
+        # ChromeDriver resolved from the local per-Chrome-version cache, without a network check
+        self.offline = offline
+        self.driver_resolver = ChromeDriverResolver(allow_download=not offline)
+        
         # Setup Chrome options
         self.chrome_options = Options()
         if headless:
@@ -69,65 +233,282 @@ class SPXAuditAutomationFixed:
         self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        if profile_dir:
+            self.chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+        
         # User agent
         self.chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36")
+        
+        # Background tabs must keep rendering while another tab is in front, and commands
+        # must not block on a full page load so other tabs can be polled meanwhile
+        if self.tabs > 1:
+            self.chrome_options.page_load_strategy = 'eager'
+            self.chrome_options.add_argument("--disable-background-timer-throttling")
+            self.chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+            self.chrome_options.add_argument("--disable-renderer-backgrounding")
+        
+        # Performance log carries the Network.* DevTools events used by capture mode
+        if capture_network:
+            self.chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        
+        # An attached browser was started by someone else, so the launch options above do not apply
+        self.debugger_address = debugger_address
+        if debugger_address:
+            self.chrome_options = Options()
+            self.chrome_options.debugger_address = debugger_address
+            if self.tabs > 1:
+                self.chrome_options.page_load_strategy = 'eager'
+            if capture_network:
+                self.chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     
     def find_chrome_binary(self):
-        """Find Chrome binary in common installation locations"""
-        common_paths = [
-            # Google Chrome
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            r"C:\Users\{}\AppData\Local\Google\Chrome\Application\chrome.exe".format(os.getenv('USERNAME')),
-            
-            # Microsoft Edge (Chromium-based)
-            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
-        ]
-        
-        for path in common_paths:
-            if os.path.exists(path):
-                logger.info(f"Found Chrome/Chromium binary at: {path}")
-                return path
-        
-        return None
+        """Find Chrome binary in common Windows, Linux and macOS installation locations"""
+        path = find_chrome_binary()
+        if path:
+            logger.info(f"Found Chrome/Chromium binary at: {path}")
+        return path
     
     def setup_driver(self):
         """Setup Chrome WebDriver with fallback options"""
+        started = time.time()
         try:
             # Find Chrome binary
             chrome_binary_path = self.find_chrome_binary()
             
-            if chrome_binary_path:
+            if chrome_binary_path and not self.debugger_address:
                 self.chrome_options.binary_location = chrome_binary_path
                 logger.info(f"Using Chrome binary: {chrome_binary_path}")
             
-            # Get ChromeDriver
-            service = Service(ChromeDriverManager().install())
+            # Get ChromeDriver (cached per Chrome version; None lets Selenium Manager find one)
+            driver_path = self.driver_resolver.resolve(chrome_binary_path)
+            service = Service(driver_path) if driver_path else Service()
             
             # Create driver
             self.driver = webdriver.Chrome(service=service, options=self.chrome_options)
+            if self.debugger_address:
+                logger.info(f"[DRIVER] Attached to running Chrome at {self.debugger_address} ({self.driver.current_url})")
+            
+            self.install_command_counter()
+            
+            if self.capture_network:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                logger.info("Network capture enabled")
             
             # Execute script to remove webdriver property
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             self.wait = WebDriverWait(self.driver, self.wait_time)
+            self.waits = WaitEngine(self.driver, timeout=self.wait_time)
             logger.info("Chrome WebDriver initialized successfully")
+            logger.info(f"[DRIVER] setup_driver took {time.time() - started:.2f}s "
+                        f"(driver from {self.driver_resolver.source})")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to initialize WebDriver: {str(e)}")
+            logger.error(f"Failed to initialize WebDriver after {time.time() - started:.2f}s: {str(e)}")
             return False
     
+    def close_driver(self):
+        """Quit a browser this run launched; an attached browser is left running for the next run"""
+        if not self.driver:
+            return
+        if self.debugger_address:
+            # Only the ChromeDriver process started for this run is stopped
+            try:
+                self.driver.service.stop()
+            except Exception as e:
+                logger.debug(f"[DRIVER] Could not stop ChromeDriver: {str(e)}")
+            logger.info(f"[DRIVER] Detached from Chrome at {self.debugger_address}, leaving it running")
+        else:
+            self.driver.quit()
+    
+    def install_command_counter(self):
+        """Wrap driver.execute so every remote WebDriver command is counted"""
+        execute = self.driver.execute
+        
+        def counted_execute(driver_command, params=None):
+            self.remote_command_count += 1
+            return execute(driver_command, params)
+        
+        # Elements issue their commands through their parent driver, so this covers them too
+        self.driver.execute = counted_execute
+    
+    def record_page_commands(self, engine, commands_before):
+        """Record how many remote commands one page extraction cost"""
+        used = self.remote_command_count - commands_before
+        self.page_command_counts.append({"engine": engine, "commands": used})
+        logger.info(f"[CMD] Page extraction ({engine}) used {used} remote WebDriver commands")
+    
+    def log_command_summary(self):
+        """Log remote command usage per extracted page"""
+        if not self.page_command_counts:
+            return
+        
+        total_pages = len(self.page_command_counts)
+        total_commands = sum(page["commands"] for page in self.page_command_counts)
+        logger.info(f"[CMD] {total_pages} pages extracted with {total_commands} remote commands "
+                    f"({total_commands / total_pages:.1f} per page, {self.remote_command_count} in whole run)")
+    
+    def collect_network_payloads(self):
+        """Decode SPX API responses logged since the last call into captured task and tracking records"""
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.warning(f"Could not read performance log: {str(e)}")
+            return
+        
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if "json" in response.get("mimeType", ""):
+                    self._pending_responses[params.get("requestId")] = response.get("url", "")
+            elif method == "Network.loadingFinished":
+                # The body can only be fetched once the response has finished loading
+                url = self._pending_responses.pop(params.get("requestId"), None)
+                if url is not None:
+                    self._decode_network_response(params["requestId"], url)
+    
+    def _decode_network_response(self, request_id, url):
+        """Fetch one response body over CDP and file it as task or tracking records"""
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            text = base64.b64decode(body["body"]).decode("utf-8") if body.get("base64Encoded") else body["body"]
+            payload = json.loads(text)
+        except Exception as e:
+            logger.debug(f"Skipping response {url}: {str(e)}")
+            return
+        
+        endpoint = url.split("?")[0]
+        
+        # Detail records can carry their task ID too, so check for parcels first
+        tracking_data = decode_tracking_records(payload)
+        if tracking_data:
+            kind, records = "tracking", tracking_data
+            self.api_endpoints["task_detail"] = endpoint
+        else:
+            task_rows = decode_task_records(payload)
+            if not task_rows:
+                return
+            kind, records = "tasks", task_rows
+            self.api_endpoints["task_list"] = endpoint
+        
+        self.captured[kind].append(records)
+        self.last_api_total = find_total(payload)
+        logger.info(f"[NET] Captured {len(records)} {kind} records from {endpoint} (total: {self.last_api_total})")
+    
+    def wait_for_captured(self, kind, timeout=None, consume=True):
+        """
+        Poll the network log until a decoded payload of the given kind arrives
+        
+        Args:
+            kind (str): 'tasks' or 'tracking'
+            timeout (float): Seconds to wait, defaults to wait_time
+            consume (bool): Remove the payload so the next page waits for a fresh one
+        
+        Returns:
+            The newest decoded records, or None on timeout
+        """
+        deadline = time.time() + (self.wait_time if timeout is None else timeout)
+        while True:
+            self.collect_network_payloads()
+            if self.captured[kind]:
+                records = self.captured[kind][-1]
+                if consume:
+                    self.captured[kind].clear()
+                return records
+            if time.time() >= deadline:
+                logger.info(f"[NET] No {kind} payload captured within timeout")
+                return None
+            time.sleep(0.25)
+    
+    def reset_network_capture(self):
+        """Drop captured payloads so the next wait only sees responses of the next page load"""
+        self.collect_network_payloads()
+        for records in self.captured.values():
+            records.clear()
+    
+    def current_page_state(self):
+        """Page-state snapshot used as the 'before' reference of a pager click"""
+        try:
+            return self.waits.page_state()
+        except Exception as e:
+            logger.debug(f"Could not read page state: {str(e)}")
+            return None
+    
+    def wait_for_page_change(self, previous_state, name):
+        """Wait until a pager click has rendered a different page"""
+        if previous_state is None:
+            # Nothing to compare against, fall back to a fixed pause
+            self.waits.sleep(name, 3)
+        else:
+            self.waits.until(name, page_changed(previous_state))
+    
+    def session_is_valid(self):
+        """Probe the receive-task page: a live session shows it, an expired one is sent to the login page"""
+        self.driver.get(RECEIVE_TASKS_URL)
+        self.waits.until("session probe", page_or_login("receive-task"))
+        # An empty task list never renders rows, so judge by where the page ended up
+        url = self.driver.current_url
+        return "receive-task" in url and "login" not in url.lower()
+    
+    def resume_saved_session(self):
+        """
+        Reuse the login kept by an attached browser, the Chrome profile or the saved session file
+        
+        Returns:
+            bool: True if the session is still logged in and the interactive login can be skipped
+        """
+        try:
+            # A browser that is kept open may hold a newer login than the file, so try it as it is first
+            if self.debugger_address and self.session_is_valid():
+                logger.info("Attached Chrome is already logged in to SPX, skipping the interactive login")
+                return True
+            
+            session = load_session_file(self.session_file)
+            if session:
+                restore_session(self.driver, session, home_url=SPX_HOME_URL)
+            elif not self.profile_dir:
+                return False
+            
+            if self.session_is_valid():
+                logger.info("Saved SPX session is still logged in, skipping the interactive login")
+                return True
+            logger.info("Saved SPX session has expired, falling back to the interactive login")
+        except Exception as e:
+            logger.warning(f"Could not reuse the saved SPX session: {str(e)}")
+        return False
+    
+    def save_session(self):
+        """Save the current login for later runs"""
+        if not self.session_file:
+            return
+        try:
+            save_session_file(snapshot_session(self.driver), self.session_file)
+        except Exception as e:
+            logger.warning(f"Could not save the SPX session: {str(e)}")
+    
     def open_spx_homepage(self):
-        """Open SPX homepage for login"""
+        """Open SPX homepage for login, unless a saved session is still logged in"""
         try:
-            url = "https://sp.spx.shopee.ph/"
+            if self.resume_saved_session():
+                print("\n✅ Reusing the saved SPX login")
+                # Cookies the site rotated meanwhile are saved for the next run
+                self.save_session()
+                return True
+            
+            url = SPX_HOME_URL
             logger.info(f"Opening SPX homepage: {url}")
             self.driver.get(url)
             
             # Wait for page to load
-            time.sleep(3)
+            self.waits.until("homepage load", document_ready())
             
             print("\n" + "="*60)
             print("SPX WEBSITE OPENED")
@@ -136,29 +517,52 @@ class SPXAuditAutomationFixed:
             print("\nPlease follow these steps:")
             print("1. Look for the Chrome browser window that opened")
             print("2. Login to your SPX account in that window")
-            print("3. Make sure you are successfully logged in")
-            print("4. Return to this terminal and press Enter to continue")
+            print("3. The automation continues by itself as soon as you are logged in")
             print("\nNOTE: Do NOT close the browser window!")
             print("="*60)
             
-            input("\nPress Enter after you have logged in successfully...")
+            if not self.wait_for_login():
+                print(f"\n❌ No login detected within {self.login_timeout:.0f}s")
+                return False
             
-            logger.info("User confirmed login completion")
+            print("\n✅ Login detected")
+            self.save_session()
             return True
             
         except Exception as e:
             logger.error(f"Error opening SPX homepage: {str(e)}")
             return False
     
+    def login_state(self):
+        """LOGIN_STATE_JS snapshot, plus the cookie names when an auth cookie is configured"""
+        state = self.driver.execute_script(LOGIN_STATE_JS)
+        if SPX_AUTH_COOKIE:
+            # HttpOnly cookies are invisible to page scripts
+            state["cookies"] = [cookie["name"] for cookie in self.driver.get_cookies()]
+        return state
+    
+    def wait_for_login(self):
+        """Poll for a logged-in signal instead of waiting for the operator to press Enter"""
+        logger.info(f"Waiting up to {self.login_timeout:.0f}s for the login to complete")
+        state = self.waits.until("login", logged_in(SPX_AUTH_COOKIE), timeout=self.login_timeout,
+                                 probe=self.login_state)
+        if state:
+            logger.info(f"Login detected at {state['url']}")
+        return state is not None
+    
     def navigate_to_receive_tasks(self):
         """Navigate to the receive tasks page after login"""
         try:
-            url = "https://sp.spx.shopee.ph/inbound-management/receive-task"
+            url = RECEIVE_TASKS_URL
             logger.info(f"Navigating to receive tasks: {url}")
+            if self.capture_network:
+                self.reset_network_capture()
             self.driver.get(url)
             
-            # Wait for page to load
-            time.sleep(5)
+            # Wait for page to load (capture mode continues as soon as the task list API responds)
+            captured = self.capture_network and self.wait_for_captured("tasks", consume=False) is not None
+            if not captured:
+                self.waits.until("task list load", tbody_has_rows("receive-task"), timeout=self.wait_time * 2)
             
             print("\n" + "="*60)
             print("RECEIVE TASKS PAGE")
@@ -167,9 +571,6 @@ class SPXAuditAutomationFixed:
             print("Please wait while the page loads...")
             print("="*60)
             
-            # Wait a bit more for the page to fully load
-            time.sleep(3)
-            
             logger.info("Successfully navigated to receive tasks page")
             return True
             
@@ -177,42 +578,48 @@ class SPXAuditAutomationFixed:
             logger.error(f"Error navigating to receive tasks: {str(e)}")
             return False
     
-    def scan_and_extract_tasks(self):
-        """Scan ALL pages of receive task list and extract task data with status checking"""
+    def scan_and_extract_tasks(self, start_page=1):
+        """
+        Scan ALL pages of receive task list and extract task data with status checking
+        
+        Args:
+            start_page (int): First list page to scan, e.g. to resume a scan part-way through
+        """
         try:
             print("\n🔍 Scanning ALL pages for receive task data...")
             
             # Multiple strategies to find task data across all pages
             all_tasks_data = []
             all_skipped_tasks = []
-            current_page = 1
             
-            while True:
-                print(f"\n📄 Processing page {current_page} of receive task list...")
-                logger.info(f"Processing receive task list page {current_page}")
-                
-                # Scan current page
-                page_tasks, page_skipped = self.scan_current_page_tasks()
-                
-                # Add to overall lists
-                all_tasks_data.extend(page_tasks)
-                all_skipped_tasks.extend(page_skipped)
-                
-                print(f"   ✅ Found {len(page_tasks)} Done tasks, skipped {len(page_skipped)} non-Done tasks")
-                
-                # Check if there's a next page
-                has_next = self.check_for_next_page_in_task_list()
-                if not has_next:
-                    print(f"\n📋 Completed scanning all pages. Total pages processed: {current_page}")
-                    break
-                
-                # Navigate to next page
-                if not self.navigate_to_next_page_in_task_list():
-                    print(f"\n⚠️ Failed to navigate to next page. Stopping at page {current_page}")
-                    break
-                
-                current_page += 1
-                time.sleep(2)  # Wait for page to load
+            plan = self.plan_task_list_scan(start_page)
+            if plan is None:
+                return []
+            current_page, planned_pages = plan
+            
+            # Split the remaining pages across tabs once the page count is known
+            pages = None
+            scan_errors = self.scan_errors
+            # (with a lower bound the scan usually stops after a page or two, so it stays sequential)
+            if planned_pages and self.tabs > 1 and planned_pages > current_page and not self.scan_lower_bound:
+                pages = self.scan_task_list_in_tabs(range(current_page, planned_pages + 1))
+                # The main tab was handed other pages meanwhile, so the sequential scan starts over
+                if pages is None and not self.goto_page(current_page, "task list"):
+                    self.navigate_to_receive_tasks()
+                    plan = self.plan_task_list_scan(start_page)
+                    if plan is None:
+                        return []
+                    current_page, planned_pages = plan
+            if pages is not None:
+                all_tasks_data, all_skipped_tasks = merge_task_pages(pages)
+                current_page = planned_pages
+                self.scan_complete = self.scan_errors == scan_errors
+                print(f"\n📋 Completed scanning {len(pages)} pages across {min(self.tabs, len(pages))} tabs")
+            else:
+                for current_page, page_tasks, page_skipped in self.iter_task_list_pages(current_page, planned_pages):
+                    # Add to overall lists
+                    all_tasks_data.extend(page_tasks)
+                    all_skipped_tasks.extend(page_skipped)
             
             # Final summary
             print(f"\n📊 Final Task Status Summary (All Pages):")
@@ -233,12 +640,258 @@ class SPXAuditAutomationFixed:
             logger.error(f"Error scanning all pages for tasks: {str(e)}")
             return []
     
+    def plan_task_list_scan(self, start_page=1):
+        """
+        Maximise the task list page size, plan the page count and jump to the first page to scan
+        
+        Returns:
+            tuple: (first page, planned page count or None), or None if start_page cannot be reached
+        """
+        # Fewer, larger pages; the page count is planned from "Total N" up front
+        pager = self.maximize_page_size("task list")
+        planned_pages = self.plan_page_count(pager)
+        if planned_pages:
+            print(f"📄 {pager['total']} tasks in {planned_pages} pages of {pager['page_size']}")
+        
+        if start_page > 1:
+            if not self.goto_page(start_page, "task list"):
+                print(f"\n⚠️ Could not jump to page {start_page} of the task list")
+                return None
+            return start_page, planned_pages
+        return 1, planned_pages
+    
+    def iter_task_list_pages(self, current_page=1, planned_pages=None):
+        """
+        Scan the task list page by page from the page currently shown
+        
+        Sets scan_complete once the last page or the scan's lower bound is reached; a scan
+        that stops early (a page that cannot be read or reached) leaves it False
+        
+        Yields:
+            tuple: (page number, Done tasks, skipped tasks) as soon as each page is scanned
+        """
+        self.scan_complete = False
+        while True:
+            print(f"\n📄 Processing page {current_page} of receive task list...")
+            logger.info(f"Processing receive task list page {current_page}")
+            
+            # Scan current page
+            scan_errors = self.scan_errors
+            page_tasks, page_skipped = self.scan_current_page_tasks()
+            if self.scan_errors > scan_errors:
+                print(f"\n⚠️ Could not read page {current_page} of the task list, stopping the scan")
+                logger.warning(f"Task list scan stopped at unreadable page {current_page}; the scan is incomplete")
+                return
+            print(f"   ✅ Found {len(page_tasks)} Done tasks, skipped {len(page_skipped)} non-Done tasks")
+            yield current_page, page_tasks, page_skipped
+            
+            if self.reached_lower_bound(current_page, page_tasks + page_skipped):
+                self.scan_complete = True
+                return
+            
+            # Check if there's a next page
+            if planned_pages:
+                has_next = current_page < planned_pages
+            else:
+                has_next = self.check_for_next_page_in_task_list()
+            if not has_next:
+                print(f"\n📋 Completed scanning all pages. Total pages processed: {current_page}")
+                self.scan_complete = True
+                return
+            
+            # Navigate to next page
+            page_info = (current_page, planned_pages) if planned_pages else None
+            if not self.navigate_to_next_page_in_task_list(page_info):
+                print(f"\n⚠️ Failed to navigate to next page. Stopping at page {current_page}")
+                logger.warning(f"Task list scan stopped at page {current_page}; the scan is incomplete")
+                return
+            
+            current_page += 1
+    
+    def scan_task_list_in_tabs(self, page_numbers):
+        """
+        Scan task list pages in parallel across tabs of the logged-in driver
+        
+        The current tab keeps its page; every other tab opens the task list, switches to the
+        same page size and jumps to a page of its own. Like the detail tab pipeline, tabs are
+        polled round-robin and whichever has rendered its page is scanned and handed the next one.
+        
+        Args:
+            page_numbers (iterable): Page numbers to scan; the first is the page currently shown
+        
+        Returns:
+            dict: page number -> (Done tasks, skipped tasks) for every page, or None if pages cannot be addressed
+        """
+        page_numbers = list(page_numbers)
+        queue = list(reversed(page_numbers[1:]))
+        pages = {}
+        attempts = {}
+        timeout = self.wait_time * 3
+        list_url = self.driver.current_url
+        page_size = self.pager_info().get("page_size")
+        
+        # The performance log is shared by all tabs, so tabs read the page itself
+        capture_network = self.capture_network
+        self.capture_network = False
+        
+        main_handle = self.driver.current_window_handle
+        handles = [main_handle]
+        for _ in range(min(self.tabs, len(page_numbers)) - 1):
+            self.driver.switch_to.new_window('tab')
+            self.driver.execute_script("window.location.href = arguments[0];", list_url)
+            handles.append(self.driver.current_window_handle)
+        logger.info(f"[TABS] Scanning {len(page_numbers)} task list pages across {len(handles)} tabs")
+        
+        def start_page(handle, state):
+            """Hand the next queued page to a tab that is showing the list, or retire the tab"""
+            if not queue:
+                return None
+            page = queue.pop()
+            if not self.driver.execute_script(GOTO_PAGE_JS, page):
+                raise RuntimeError("task list has no jump-to-page input")
+            return {"page": page, "ready": True, "stale_key": state["first_row"], "since": time.time()}
+        
+        try:
+            # The current tab already shows the first page at the maximised page size
+            states = {handle: {"page": None, "ready": False, "since": time.time()} for handle in handles[1:]}
+            states[main_handle] = {"page": page_numbers[0], "ready": True, "stale_key": None, "since": time.time()}
+            
+            while any(states.values()):
+                progressed = False
+                
+                for handle in handles:
+                    state = states[handle]
+                    if state is None:
+                        continue
+                    
+                    self.driver.switch_to.window(handle)
+                    page_state = self.driver.execute_script(PAGE_STATE_JS)
+                    
+                    if not state["ready"]:
+                        # A new tab: once the list has rendered, match the page size and take a page
+                        if page_state["rows"] > 0:
+                            if page_size and self.pager_info().get("page_size") != page_size:
+                                self.maximize_page_size("task list tab")
+                                page_state = self.driver.execute_script(PAGE_STATE_JS)
+                            states[handle] = start_page(handle, page_state)
+                            progressed = True
+                        elif time.time() - state["since"] > timeout:
+                            logger.warning(f"[TABS] Task list did not load in tab {handles.index(handle) + 1}")
+                            states[handle] = None
+                        continue
+                    
+                    if not on_page(state["page"])(page_state) or page_state["first_row"] == state["stale_key"]:
+                        if time.time() - state["since"] > timeout:
+                            page = state["page"]
+                            attempts[page] = attempts.get(page, 0) + 1
+                            logger.warning(f"[TABS] Timed out waiting for task list page {page}")
+                            if attempts[page] < 2:
+                                queue.append(page)
+                            states[handle] = start_page(handle, page_state)
+                            progressed = True
+                        continue
+                    
+                    progressed = True
+                    pages[state["page"]] = self.scan_current_page_tasks()
+                    tasks_found, skipped_found = pages[state["page"]]
+                    logger.info(f"[TABS] Task list page {state['page']}: {len(tasks_found)} Done, "
+                                f"{len(skipped_found)} skipped (tab {handles.index(handle) + 1})")
+                    states[handle] = start_page(handle, page_state)
+                
+                if not progressed:
+                    time.sleep(0.1)
+        
+        except Exception as e:
+            logger.warning(f"[TABS] Parallel task list scan stopped, scanning sequentially: {str(e)}")
+            return None
+        
+        finally:
+            self.capture_network = capture_network
+            for handle in handles[1:]:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception:
+                    pass
+            self.driver.switch_to.window(main_handle)
+        
+        # A partial manifest would silently drop tasks: rescan missing pages here or give up
+        for page in sorted(set(page_numbers) - set(pages)):
+            logger.warning(f"[TABS] Task list page {page} was not scanned in a tab, retrying in the main tab")
+            if not self.goto_page(page, "task list"):
+                logger.warning(f"[TABS] Could not reach task list page {page}, scanning sequentially")
+                return None
+            pages[page] = self.scan_current_page_tasks()
+        return pages
+    
     def scan_current_page_tasks(self):
         """Scan current page and extract receive task data with status checking"""
+        engine = self.extraction_engine
+        commands_before = self.remote_command_count
+        
         try:
-            tasks_data = []
-            skipped_tasks = []
+            rows = self._scan_task_rows_network() if self.capture_network else []
+            if rows:
+                engine = 'network'
+            elif engine in ('snapshot', 'html'):
+                scan = self._scan_task_rows_snapshot if engine == 'snapshot' else self._scan_task_rows_html
+                rows = scan()
+                if not rows:
+                    logger.info(f"Task row {engine} scan found no tasks, falling back to per-element scan")
+                    engine = 'dom'
+            
+            if engine == 'dom':
+                rows = self._scan_task_rows_dom()
+            
+            # Dedupe and split by status in one pass
+            tasks_data, skipped_tasks = split_task_rows(rows)
+            for task in tasks_data:
+                logger.info(f"[TASK] Found task: {task['task_id']} - {task['complete_time']} (Status: {task['status']})")
+            for task in skipped_tasks:
+                logger.warning(f"[SKIP] Skipped task: {task['task_id']} - {task['complete_time']} (Status: {task['status']} - Not Done)")
+            
+            self.record_page_commands(engine, commands_before)
+            return tasks_data, skipped_tasks
             
+        except Exception as e:
+            logger.error(f"Error scanning current page for tasks: {str(e)}")
+            self.scan_errors += 1
+            return [], []
+    
+    def _scan_task_rows_network(self):
+        """Take the task rows decoded from this page's task list API response"""
+        rows = self.wait_for_captured("tasks") or []
+        if rows and all(row["status"] == "Unknown" for row in rows):
+            # Numeric-only status codes cannot be classified, let the page scan decide
+            logger.info("[NET] Task payload carries no textual status, falling back to page scan")
+            return []
+        return rows
+    
+    def _scan_task_rows_snapshot(self):
+        """Walk the task table rows in the browser and return them in one execute_script call"""
+        try:
+            rows = self.driver.execute_script(TASK_ROWS_JS) or []
+            logger.info(f"Task row snapshot returned {len(rows)} task rows")
+            return rows
+        except Exception as e:
+            logger.warning(f"Task row snapshot failed: {str(e)}")
+            return []
+    
+    def _scan_task_rows_html(self):
+        """Fetch the task table HTML once and parse the rows locally"""
+        try:
+            rows = parse_task_rows_html(self.fetch_tables_html())
+            logger.info(f"Task table HTML parse returned {len(rows)} task rows")
+            return rows
+        except Exception as e:
+            logger.warning(f"Task table HTML parse failed: {str(e)}")
+            return []
+    
+    def _scan_task_rows_dom(self):
+        """Find task rows by walking every element containing 'DRT' (one remote call per lookup)"""
+        rows = []
+        
+        try:
             # Strategy 1: Look for any elements containing "DRT" (task ID pattern)
             drt_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'DRT')]")
             
@@ -261,7 +914,7 @@ class SPXAuditAutomationFixed:
                                 # Extract time and status from row cells
                                 for cell in cells:
                                     cell_text = cell.text.strip()
-                                    if "2025-08" in cell_text or ":" in cell_text:
+                                    if looks_like_complete_time(cell_text):
                                         complete_time = cell_text
                                     
                                     # Look for status indicators
@@ -295,7 +948,7 @@ class SPXAuditAutomationFixed:
                                     siblings = parent.find_elements(By.XPATH, ".//*")
                                     for sibling in siblings:
                                         sibling_text = sibling.text.strip()
-                                        if "2025-08" in sibling_text or ":" in sibling_text:
+                                        if looks_like_complete_time(sibling_text):
                                             complete_time = sibling_text
                                         
                                         # Check sibling for status
@@ -308,30 +961,19 @@ class SPXAuditAutomationFixed:
                                 except:
                                     pass
                             
-                            task_data = {
+                            rows.append({
                                 "task_id": text,
                                 "complete_time": complete_time,
                                 "status": status
-                            }
-                            
-                            # Check if we already have this task
-                            if not any(task["task_id"] == text for task in tasks_data + skipped_tasks):
-                                # Only process tasks with "Done" status
-                                if status == "Done":
-                                    tasks_data.append(task_data)
-                                    logger.info(f"[TASK] Found task: {text} - {complete_time} (Status: {status})")
-                                else:
-                                    skipped_tasks.append(task_data)
-                                    logger.warning(f"[SKIP] Skipped task: {text} - {complete_time} (Status: {status} - Not Done)")
+                            })
                     
                     except Exception as e:
                         continue
             
-            return tasks_data, skipped_tasks
-            
         except Exception as e:
             logger.error(f"Error scanning current page for tasks: {str(e)}")
-            return [], []
+        
+        return rows
     
     def check_for_next_page_in_task_list(self):
         """Check if there's a next page in the receive task list"""
@@ -413,11 +1055,12 @@ class SPXAuditAutomationFixed:
             logger.warning(f"Error checking for next page in task list: {e}")
             return None
     
-    def navigate_to_next_page_in_task_list(self):
+    def navigate_to_next_page_in_task_list(self, current_page_info=None):
         """Navigate to next page in task list ensuring sequential navigation"""
         try:
-            # Get current page info first
-            current_page_info = self.check_for_next_page_in_task_list()
+            # Get current page info first (unless the caller already planned it)
+            if current_page_info is None:
+                current_page_info = self.check_for_next_page_in_task_list()
             if not current_page_info:
                 logger.error("[ERROR] Could not determine current page info or no more pages")
                 return False
@@ -431,6 +1074,11 @@ class SPXAuditAutomationFixed:
             
             logger.info(f"[NAV] Navigating from page {current_page} to page {next_page}...")
             
+            # Strategy 0: address the page directly
+            if self.goto_page(next_page, "task list"):
+                return True
+            previous_state = self.current_page_state()
+            
             # Strategy 1: Click specific next page number if visible
             try:
                 # Look for the specific next page number in visible page items
@@ -445,7 +1093,7 @@ class SPXAuditAutomationFixed:
                         page_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
                         self.driver.execute_script("arguments[0].click();", page_element)
                         logger.info(f"[CLICK] Successfully clicked page number {next_page}")
-                        time.sleep(3)
+                        self.wait_for_page_change(previous_state, "task list page change")
                         return True
                     except Exception as e:
                         logger.debug(f"Page selector {selector} failed: {str(e)}")
@@ -461,7 +1109,7 @@ class SPXAuditAutomationFixed:
                     "//span[contains(@class, 'pager-next') and contains(@class, 'pager-step') and not(contains(@class, 'pager-step-disabled'))]")))
                 self.driver.execute_script("arguments[0].click();", next_btn)
                 logger.info(f"[NEXT] Successfully clicked next button to go to page {next_page}")
-                time.sleep(3)
+                self.wait_for_page_change(previous_state, "task list page change")
                 return True
             except Exception as e:
                 logger.warning(f"Strategy 2 (next button) failed: {str(e)}")
@@ -475,12 +1123,12 @@ class SPXAuditAutomationFixed:
                 # Clear input and enter next page number
                 jumper_input.clear()
                 jumper_input.send_keys(str(next_page))
-                time.sleep(1)
+                self.waits.sleep("page jumper input", 1)
                 
                 # Click go button
                 self.driver.execute_script("arguments[0].click();", jumper_button)
                 logger.info(f"[JUMP] Successfully used page jumper to go to page {next_page}")
-                time.sleep(3)
+                self.wait_for_page_change(previous_state, "task list page change")
                 return True
             except Exception as e:
                 logger.warning(f"Strategy 3 (page jumper) failed: {str(e)}")
@@ -495,6 +1143,66 @@ class SPXAuditAutomationFixed:
     def get_tracking_numbers_from_page(self):
         """Extract all tracking numbers and their sender IDs from current page"""
         tracking_data = {}
+        engine = self.extraction_engine
+        commands_before = self.remote_command_count
+        
+        try:
+            tracking_data = (self.wait_for_captured("tracking") or {}) if self.capture_network else {}
+            if tracking_data:
+                engine = 'network'
+            elif engine in ('snapshot', 'html'):
+                extract = self._get_tracking_numbers_snapshot if engine == 'snapshot' else self._get_tracking_numbers_html
+                tracking_data = extract()
+                if not tracking_data:
+                    logger.info(f"{engine} extraction found no data, falling back to per-element extraction")
+                    engine = 'dom'
+            
+            if engine == 'dom':
+                tracking_data = self._get_tracking_numbers_dom()
+            
+            # Log results
+            if tracking_data:
+                total_tracking = sum(len(tracks) for tracks in tracking_data.values())
+                logger.info(f"Extracted {total_tracking} tracking numbers for {len(tracking_data)} senders")
+                for sender, tracks in tracking_data.items():
+                    logger.info(f"  Sender {sender}: {len(tracks)} tracking numbers")
+            else:
+                logger.warning("No tracking numbers found on this page")
+            
+        except Exception as e:
+            logger.error(f"Error extracting tracking numbers: {str(e)}")
+        
+        self.record_page_commands(engine, commands_before)
+        return tracking_data
+    
+    def _get_tracking_numbers_snapshot(self):
+        """Pull the whole table body back in one execute_script call and parse it locally"""
+        try:
+            rows = self.driver.execute_script(TABLE_SNAPSHOT_JS) or []
+            logger.info(f"Snapshot returned {len(rows)} table rows to process")
+            return parse_tracking_rows(rows)
+        except Exception as e:
+            logger.warning(f"Snapshot extraction failed: {str(e)}")
+            return {}
+    
+    def _get_tracking_numbers_html(self):
+        """Fetch the table HTML once and parse tracking numbers locally"""
+        try:
+            return parse_tracking_html(self.fetch_tables_html())
+        except Exception as e:
+            logger.warning(f"HTML parse extraction failed: {str(e)}")
+            return {}
+    
+    def fetch_tables_html(self):
+        """Fetch the outerHTML of every table in one call, falling back to the full page source"""
+        html = self.driver.execute_script(TABLES_HTML_JS)
+        if not html:
+            html = self.driver.page_source
+        return html
+    
+    def _get_tracking_numbers_dom(self):
+        """Extract tracking numbers by walking table rows and cells element by element"""
+        tracking_data = {}
         
         try:
             # Strategy 1: Look for tracking numbers in table format (most accurate for SPX)
@@ -591,15 +1299,6 @@ class SPXAuditAutomationFixed:
                 except Exception as e:
                     logger.warning(f"Alternative tracking extraction failed: {str(e)}")
             
-            # Log results
-            if tracking_data:
-                total_tracking = sum(len(tracks) for tracks in tracking_data.values())
-                logger.info(f"Extracted {total_tracking} tracking numbers for {len(tracking_data)} senders")
-                for sender, tracks in tracking_data.items():
-                    logger.info(f"  Sender {sender}: {len(tracks)} tracking numbers")
-            else:
-                logger.warning("No tracking numbers found on this page")
-            
         except Exception as e:
             logger.error(f"Error extracting tracking numbers: {str(e)}")
         
@@ -607,6 +1306,8 @@ class SPXAuditAutomationFixed:
     
     def check_for_next_page(self):
         """Check if there's a next page and navigate to it"""
+        previous_state = self.current_page_state()
+        
         try:
             # Strategy 1: Look for active page number and total pages
             try:
@@ -639,7 +1340,7 @@ class SPXAuditAutomationFixed:
                         if next_page_elem.is_enabled() and next_page_elem.is_displayed():
                             logger.info(f"Clicking page number {next_page_num}")
                             next_page_elem.click()
-                            time.sleep(4)  # Wait for page to load
+                            self.wait_for_page_change(previous_state, "detail page change")
                             return True
                     except:
                         # Fallback: try clicking the next button
@@ -648,7 +1349,7 @@ class SPXAuditAutomationFixed:
                             if next_button.is_enabled() and next_button.is_displayed():
                                 logger.info(f"Clicking next button to go to page {next_page_num}")
                                 next_button.click()
-                                time.sleep(4)
+                                self.wait_for_page_change(previous_state, "detail page change")
                                 return True
                         except:
                             pass
@@ -699,7 +1400,7 @@ class SPXAuditAutomationFixed:
                                     next_page_elem = self.driver.find_element(By.XPATH, f"//li[contains(@class, 'pager-item') and text()='{next_page}']")
                                     logger.info(f"Clicking page {next_page} (calculated from total)")
                                     next_page_elem.click()
-                                    time.sleep(4)
+                                    self.wait_for_page_change(previous_state, "detail page change")
                                     return True
                                 except:
                                     # Try next button
@@ -707,7 +1408,7 @@ class SPXAuditAutomationFixed:
                                         next_button = self.driver.find_element(By.XPATH, "//span[contains(@class, 'pager-next') and not(contains(@class, 'disabled'))]")
                                         logger.info(f"Clicking next button (calculated from total)")
                                         next_button.click()
-                                        time.sleep(4)
+                                        self.wait_for_page_change(previous_state, "detail page change")
                                         return True
                                     except:
                                         pass
@@ -727,7 +1428,7 @@ class SPXAuditAutomationFixed:
                     if "disabled" not in class_attr.lower():
                         logger.info("Found enabled next button")
                         next_button.click()
-                        time.sleep(4)
+                        self.wait_for_page_change(previous_state, "detail page change")
                         return True
                     else:
                         logger.info("Next button found but disabled")
@@ -742,21 +1443,147 @@ class SPXAuditAutomationFixed:
             logger.warning(f"Error checking for next page: {str(e)}")
             return False
     
+    def page_url(self, page, page_size=None):
+        """The current page's URL with the page number (and page size) as query parameters"""
+        parts = urlparse(self.driver.current_url)
+        query = dict(parse_qsl(parts.query))
+        query[PAGE_QUERY_PARAM] = str(page)
+        if page_size:
+            query[PAGE_SIZE_QUERY_PARAM] = str(page_size)
+        return urlunparse(parts._replace(query=urlencode(query)))
+    
+    def goto_page(self, page, label, page_size=None):
+        """
+        Load a page of the current table directly instead of clicking through the pages before it
+        
+        Args:
+            page (int): 1-based page number to show
+            label (str): Table name used in logs and wait names ('task list' or 'detail')
+            page_size (int): Page size to request along with the page in 'url' mode,
+                defaults to the current one so a reload keeps the maximised page size
+        
+        Returns:
+            bool: True once the table shows the requested page
+        """
+        if self.page_navigation == 'click':
+            return False
+        
+        previous_state = self.current_page_state()
+        if previous_state and previous_state["active_page"] == page and previous_state["rows"] > 0:
+            return True
+        
+        if self.url_pagination:
+            page_size = page_size or self.pager_info().get("page_size")
+            if self.capture_network:
+                self.reset_network_capture()
+            self.driver.get(self.page_url(page, page_size))
+            state = self.waits.until(f"{label} url page load", on_page(page))
+            pager = self.pager_info() if state else {}
+            if state and (not page_size or pager.get("page_size") == page_size):
+                logger.info(f"[NAV] {label}: loaded page {page} by URL")
+                return True
+            
+            # The reload landed on the app's default page; use the router from here on
+            logger.warning(f"[NAV] {label}: '{PAGE_QUERY_PARAM}' URL parameter was ignored, "
+                           f"switching to router navigation")
+            self.url_pagination = False
+            if page_size:
+                self.maximize_page_size(label)
+            previous_state = self.current_page_state()
+            if previous_state and previous_state["active_page"] == page and previous_state["rows"] > 0:
+                return True
+        
+        try:
+            if self.capture_network:
+                self.reset_network_capture()
+            if not self.driver.execute_script(GOTO_PAGE_JS, page):
+                logger.debug(f"[NAV] {label}: no jump-to-page input found")
+                return False
+            if self.waits.until(f"{label} page jump", on_page(page, previous_state)):
+                logger.info(f"[NAV] {label}: jumped to page {page}")
+                return True
+        except Exception as e:
+            logger.warning(f"[NAV] {label}: jump to page {page} failed: {str(e)}")
+        
+        return False
+    
+    def pager_info(self):
+        """Read 'Total N', 'N / Page' and the active page of the current table in one call"""
+        try:
+            return self.driver.execute_script(PAGER_INFO_JS) or {}
+        except Exception as e:
+            logger.debug(f"Could not read pager info: {str(e)}")
+            return {}
+    
+    def plan_page_count(self, pager):
+        """Number of pages implied by the pager's total and page size, or None if unknown"""
+        if pager.get("total") and pager.get("page_size"):
+            return max(1, math.ceil(pager["total"] / pager["page_size"]))
+        return None
+    
+    def maximize_page_size(self, label):
+        """
+        Switch the current table to the largest page size offered by its page-size selector
+        
+        Returns:
+            dict: Pager info ({total, page_size, active_page}) after the switch
+        """
+        pager = self.pager_info()
+        total, page_size = pager.get("total"), pager.get("page_size")
+        if not total or not page_size or total <= page_size:
+            return pager
+        
+        try:
+            before = self.current_page_state()
+            if not self.driver.execute_script(OPEN_PAGE_SIZE_SELECTOR_JS):
+                return pager
+            
+            # Options render asynchronously after the selector opens
+            chosen = self.waits.until(f"{label} page size options", lambda size: size is not None, timeout=3,
+                                      probe=lambda: self.driver.execute_script(PICK_LARGEST_PAGE_SIZE_JS, page_size))
+            if chosen and chosen > page_size:
+                self.waits.until(f"{label} page size change", row_count_above(before["rows"] if before else 0))
+                pager = self.pager_info()
+                logger.info(f"[PAGE] {label}: page size {page_size} -> {pager.get('page_size')} for {total} rows")
+        except Exception as e:
+            logger.warning(f"Could not change {label} page size: {str(e)}")
+        
+        return pager
+    
     def process_receive_task_detail(self, task_id):
         """Process a single receive task detail page with pagination support"""
         try:
-            detail_url = f"https://sp.spx.shopee.ph/inbound-management/receive-task/detail/{task_id}"
+            detail_url = RECEIVE_TASK_DETAIL_URL.format(task_id=task_id)
             logger.info(f"Processing task: {task_id}")
+            if self.capture_network:
+                self.reset_network_capture()
             self.driver.get(detail_url)
             
-            # Wait for page load
-            time.sleep(5)
+            # Wait for page load (capture mode continues as soon as the detail API responds)
+            if not (self.capture_network and self.wait_for_captured("tracking", consume=False) is not None):
+                self.waits.until("detail page load", tbody_has_rows(task_id))
+            
+            # Fewer, larger pages; the page limit follows from "Total N" so nothing is truncated
+            pager = self.maximize_page_size("detail")
+            planned_pages = self.plan_page_count(pager)
+            page_limit = planned_pages or MAX_DETAIL_PAGES
             
             all_tracking_data = {}
             page_number = 1
             
+            # An interrupted run continues after the task's last checkpointed page
+            resumed_page, resumed_tracking = (self.checkpoint.resume_pages(task_id, pager.get("page_size"))
+                                              if self.checkpoint else (0, {}))
+            if resumed_page and planned_pages and resumed_page >= planned_pages:
+                logger.info(f"[CHECKPOINT] Task {task_id}: all {planned_pages} pages were read before the interruption")
+                return self.count_tracking_numbers(task_id, resumed_tracking)
+            if resumed_page and self.goto_page(resumed_page + 1, "detail"):
+                logger.info(f"[CHECKPOINT] Task {task_id}: resuming at page {resumed_page + 1}")
+                all_tracking_data = resumed_tracking
+                page_number = resumed_page + 1
+            
             while True:
-                logger.info(f"Processing page {page_number} for task {task_id}")
+                logger.info(f"Processing page {page_number}{f'/{planned_pages}' if planned_pages else ''} for task {task_id}")
                 
                 # Extract tracking numbers from current page
                 page_tracking_data = self.get_tracking_numbers_from_page()
@@ -773,43 +1600,579 @@ class SPXAuditAutomationFixed:
                                 all_tracking_data[sender_id].append(tracking)
                     
                     logger.info(f"Page {page_number}: Found tracking data for {len(page_tracking_data)} senders")
+                    
+                    # Long tasks checkpoint every page so a resume need not start over
+                    if self.checkpoint and planned_pages != 1:
+                        self.checkpoint.add_page(task_id, page_number, pager.get("page_size"), page_tracking_data)
                 else:
                     logger.warning(f"No tracking data found on page {page_number}")
                 
                 # Try to go to next page
-                if not self.check_for_next_page():
+                if planned_pages and page_number >= planned_pages:
+                    logger.info(f"All {planned_pages} planned pages processed for task {task_id}")
+                    break
+                moved = bool(planned_pages) and self.goto_page(page_number + 1, "detail")
+                if not moved and planned_pages:
+                    # A jump that timed out may still have moved the table; only click on from the page just read
+                    state = self.current_page_state() or {}
+                    if state.get("active_page") == page_number + 1:
+                        moved = True
+                    elif state.get("active_page") != page_number:
+                        logger.error(f"Task {task_id}: lost track of the detail pager after page {page_number}")
+                        return {"ERROR": 0}
+                if not moved and not self.check_for_next_page():
                     logger.info(f"No more pages for task {task_id}")
                     break
                 
                 page_number += 1
                 
                 # Safety limit to prevent infinite loops
-                if page_number > 50:
-                    logger.warning(f"Reached page limit (50) for task {task_id}")
+                if page_number > page_limit:
+                    logger.warning(f"Reached page limit ({page_limit}) for task {task_id}")
                     break
             
-            # Convert tracking lists to counts
-            sender_data = {}
-            for sender_id, tracking_list in all_tracking_data.items():
-                sender_data[sender_id] = len(tracking_list)
-                logger.info(f"Sender {sender_id}: {len(tracking_list)} tracking numbers")
+            collected = sum(len(tracking_list) for tracking_list in all_tracking_data.values())
+            if pager.get("total") and collected < pager["total"]:
+                logger.warning(f"Task {task_id}: collected {collected} of {pager['total']} parcels listed in the pager")
             
-            if not sender_data:
-                logger.warning(f"No tracking data extracted for {task_id}, using fallback")
-                sender_data["NO_DATA"] = 0
-            
-            return sender_data
+            return self.count_tracking_numbers(task_id, all_tracking_data)
             
         except Exception as e:
             logger.error(f"Error processing task detail {task_id}: {str(e)}")
             return {"ERROR": 0}
     
+    def count_tracking_numbers(self, task_id, all_tracking_data):
+        """Convert sender -> tracking number lists into sender -> count"""
+        sender_data = {}
+        for sender_id, tracking_list in all_tracking_data.items():
+            sender_data[sender_id] = len(tracking_list)
+            logger.info(f"Sender {sender_id}: {len(tracking_list)} tracking numbers")
+        
+        if not sender_data:
+            logger.warning(f"No tracking data extracted for {task_id}, using fallback")
+            sender_data["NO_DATA"] = 0
+        
+        return sender_data
+    
+    def connect_http_client(self):
+        """Export the logged-in browser session into a pooled HTTP client"""
+        try:
+            self.http_client = SPXHttpClient.from_driver(self.driver, api_endpoints=self.api_endpoints,
+                                                         pool_size=max(10, self.concurrency), rate_limit=self.rate_limit)
+            return True
+        except Exception as e:
+            logger.warning(f"[HTTP] Could not export browser session, staying in the browser: {str(e)}")
+            self.http_client = None
+            return False
+    
+    def iter_task_list_pages_http(self):
+        """
+        Yield (page number, task rows) from the backend, stopping below the scan's lower bound
+        
+        Sets scan_complete once the last page or the lower bound is reached
+        
+        Raises:
+            SPXApiError: The rows carry no textual status (numeric status codes), so Done
+                tasks cannot be told apart; callers fall back to the browser scan
+        """
+        self.scan_complete = False
+        for page, rows, total in self.http_client.iter_task_list_pages():
+            logger.info(f"[HTTP] Task list page {page}: {len(rows)} tasks (total: {total})")
+            if rows and all(row["status"] == "Unknown" for row in rows):
+                raise SPXApiError(f"task list page {page} has no textual task status")
+            yield page, rows
+            if self.reached_lower_bound(page, rows):
+                break
+        self.scan_complete = True
+    
+    def scan_tasks_http(self):
+        """Fetch every task list page from the backend and keep only Done tasks"""
+        try:
+            print("\n🔍 Fetching receive task list over HTTP...")
+            all_rows = []
+            for page, rows in self.iter_task_list_pages_http():
+                all_rows.extend(rows)
+            tasks_data, skipped_tasks = split_task_rows(all_rows)
+            print(f"✅ Total tasks to process: {len(tasks_data)}")
+            print(f"⏭️ Total tasks skipped: {len(skipped_tasks)}")
+            return tasks_data
+        except Exception as e:
+            logger.warning(f"[HTTP] Task list fetch failed, scanning pages in the browser: {str(e)}")
+            self.navigate_to_receive_tasks()
+            return self.scan_and_extract_tasks()
+    
+    def fetch_task_detail(self, task_id):
+        """Get sender counts for one task over HTTP when available, otherwise through the browser"""
+        if self.http_client:
+            try:
+                return self.count_tracking_numbers(task_id, self.http_client.fetch_task_detail(task_id))
+            except Exception as e:
+                logger.warning(f"[HTTP] Detail fetch failed for {task_id}, using the browser: {str(e)}")
+        return self.process_receive_task_detail(task_id)
+    
+    @staticmethod
+    def build_task_audit(task_info, sender_data):
+        """Build the audit record stored in audit_data for one processed task"""
+        return {
+            "receive_task_id": task_info["task_id"],
+            "complete_time": task_info["complete_time"],
+            "status": task_info["status"],
+            "sender_data": sender_data,
+            "total_quantity": sum(sender_data.values()),
+            "sender_count": len(sender_data),
+            "processed_at": datetime.now().isoformat()
+        }
+    
+    def audit_tasks_serially(self, tasks_data):
+        """Process tasks one at a time, appending each result to audit_data"""
+        for i, task_info in enumerate(tasks_data, 1):
+            try:
+                task_id = task_info["task_id"]
+                status = task_info["status"]
+                
+                logger.info(f"Processing task {i}/{len(tasks_data)}: {task_id} (Status: {status})")
+                
+                # Process task detail with pagination
+                sender_data = self.fetch_task_detail(task_id)
+                
+                if sender_data:
+                    task_audit = self.build_task_audit(task_info, sender_data)
+                    self.audit_data.append(task_audit)
+                    self.task_finished(task_audit, i - 1)
+                    
+                    logger.info(f"Task {task_id}: {len(sender_data)} senders, {sum(sender_data.values())} total tracking numbers")
+                else:
+                    self.task_skipped(i - 1)
+                
+            except Exception as e:
+                logger.error(f"Error processing task {task_info.get('task_id', 'unknown')}: {str(e)}")
+                self.task_skipped(i - 1)
+                continue
+    
+    def audit_tasks_concurrently(self, tasks_data):
+        """Fetch task details concurrently over HTTP and merge them into audit_data in task order"""
+        logger.info(f"[HTTP] Fetching {len(tasks_data)} task details with concurrency {self.concurrency}")
+        task_ids = [task_info["task_id"] for task_info in tasks_data]
+        task_audits = {}
+        
+        def on_result(index, task_id, result):
+            # Checkpoint each task as it finishes rather than once all of them are in
+            if not isinstance(result, Exception):
+                task_audits[index] = self.build_task_audit(tasks_data[index], self.count_tracking_numbers(task_id, result))
+                self.task_finished(task_audits[index], index)
+        
+        results = fetch_task_details_concurrently(self.http_client, task_ids, self.concurrency, on_result)
+        
+        for index, (task_info, result) in enumerate(zip(tasks_data, results)):
+            task_id = task_info["task_id"]
+            if index not in task_audits:
+                logger.warning(f"[HTTP] Detail fetch failed for {task_id}, using the browser: {str(result)}")
+                task_audits[index] = self.build_task_audit(task_info, self.process_receive_task_detail(task_id))
+                self.task_finished(task_audits[index], index)
+            
+            sender_data = task_audits[index]["sender_data"]
+            self.audit_data.append(task_audits[index])
+            logger.info(f"Task {task_id}: {len(sender_data)} senders, {sum(sender_data.values())} total tracking numbers")
+    
+    def audit_tasks_in_tabs(self, tasks_data):
+        """
+        Pipeline task detail pages across several tabs of the logged-in driver
+        
+        Each tab starts loading its next page without blocking, so while one tab
+        waits for SPX to render, the others are extracted. Free tabs take the next
+        task from the shared queue; results are merged in original task order.
+        """
+        queue = list(enumerate(tasks_data))
+        queue.reverse()
+        results = {}
+        timeout = self.wait_time * 3
+        
+        # The performance log is shared by all tabs, so tabs read the page itself
+        capture_network = self.capture_network
+        self.capture_network = False
+        
+        main_handle = self.driver.current_window_handle
+        handles = [main_handle]
+        for _ in range(min(self.tabs, len(tasks_data)) - 1):
+            self.driver.switch_to.new_window('tab')
+            handles.append(self.driver.current_window_handle)
+        logger.info(f"[TABS] Processing {len(tasks_data)} tasks across {len(handles)} tabs")
+        
+        def start_task(handle):
+            """Hand the next queued task to a tab and start loading its first page"""
+            if not queue:
+                return None
+            index, task_info = queue.pop()
+            self.driver.switch_to.window(handle)
+            url = RECEIVE_TASK_DETAIL_URL.format(task_id=task_info["task_id"])
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+            logger.info(f"[TABS] Task {index + 1}/{len(tasks_data)}: {task_info['task_id']} loading in tab {handles.index(handle) + 1}")
+            return {"index": index, "task_info": task_info, "page": 1, "tracking": {}, "pager": None,
+                    "stale_key": None, "since": time.time()}
+        
+        def finish_task(state):
+            task_id = state["task_info"]["task_id"]
+            total = (state["pager"] or {}).get("total")
+            collected = sum(len(tracking_list) for tracking_list in state["tracking"].values())
+            if total and collected < total:
+                logger.warning(f"[TABS] Task {task_id}: collected {collected} of {total} parcels listed in the pager")
+            sender_data = self.count_tracking_numbers(task_id, state["tracking"])
+            results[state["index"]] = self.build_task_audit(state["task_info"], sender_data)
+            self.task_finished(results[state["index"]], state["index"])
+            logger.info(f"Task {task_id}: {len(sender_data)} senders, {sum(sender_data.values())} total tracking numbers")
+        
+        def fail_task(state):
+            # Partial counts would look like a complete audit, so the task is left for the next run
+            results[state["index"]] = self.build_task_audit(state["task_info"], {"ERROR": 0})
+            self.task_finished(results[state["index"]], state["index"])
+        
+        try:
+            states = {handle: start_task(handle) for handle in handles}
+            
+            while any(states.values()):
+                progressed = False
+                
+                for handle in handles:
+                    state = states[handle]
+                    if state is None:
+                        continue
+                    
+                    try:
+                        self.driver.switch_to.window(handle)
+                        page = self.driver.execute_script(PAGE_STATE_JS)
+                        task_id = state["task_info"]["task_id"]
+                        
+                        # Ready once the task's own page shows rows that differ from the previous page
+                        ready = task_id in page["url"] and page["rows"] > 0 and page["first_row"] != state["stale_key"]
+                        if not ready:
+                            if time.time() - state["since"] > timeout:
+                                logger.warning(f"[TABS] Timed out waiting for page {state['page']} of {task_id}")
+                                fail_task(state)
+                                states[handle] = start_task(handle)
+                                progressed = True
+                            continue
+                        
+                        progressed = True
+                        if state["pager"] is None:
+                            # Same planning as the single-tab path: fewer, larger pages, limited by "Total N"
+                            state["pager"] = self.maximize_page_size("detail")
+                            page = self.driver.execute_script(PAGE_STATE_JS)
+                        planned_pages = self.plan_page_count(state["pager"])
+                        page_limit = planned_pages or MAX_DETAIL_PAGES
+                        
+                        for sender_id, tracking_list in self.get_tracking_numbers_from_page().items():
+                            known = state["tracking"].setdefault(sender_id, [])
+                            known.extend(tracking for tracking in tracking_list if tracking not in known)
+                        
+                        if state["page"] >= page_limit:
+                            if not planned_pages:
+                                logger.warning(f"[TABS] Reached page limit ({page_limit}) for task {task_id}")
+                            finish_task(state)
+                            states[handle] = start_task(handle)
+                        elif self.driver.execute_script(CLICK_NEXT_PAGE_JS):
+                            state["page"] += 1
+                            state["stale_key"] = page["first_row"]
+                            state["since"] = time.time()
+                        else:
+                            finish_task(state)
+                            states[handle] = start_task(handle)
+                    
+                    except Exception as e:
+                        logger.error(f"[TABS] Error in tab {handles.index(handle) + 1}: {str(e)}")
+                        fail_task(state)
+                        states[handle] = start_task(handle)
+                
+                if not progressed:
+                    time.sleep(0.1)
+        
+        finally:
+            self.capture_network = capture_network
+            for handle in handles[1:]:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception:
+                    pass
+            self.driver.switch_to.window(main_handle)
+        
+        for index in sorted(results):
+            self.audit_data.append(results[index])
+    
+    def worker_automation_options(self):
+        """
+        Options for the SPXAuditAutomationFixed instances that audit details in their own Chrome
+        
+        Returns:
+            dict: Every option of this run that affects driver setup or detail extraction
+        """
+        return {
+            "headless": self.headless,
+            "wait_time": self.wait_time,
+            "extraction_engine": self.extraction_engine,
+            "capture_network": self.capture_network,
+            "page_navigation": self.page_navigation,
+            "offline": self.offline,
+        }
+    
+    def audit_tasks_in_pool(self, tasks_data):
+        """Shard tasks across Chrome worker processes started from this session's login state"""
+        session = snapshot_session(self.driver)
+        automation_options = self.worker_automation_options()
+        logger.info(f"[POOL] Sharding {len(tasks_data)} tasks across {self.workers} Chrome workers")
+        
+        task_audits, self.pool_stats = run_driver_pool(tasks_data, session, self.workers, automation_options,
+                                                       recycle_after=self.recycle_after,
+                                                       on_result=lambda index, task_audit: self.task_finished(task_audit, index))
+        self.audit_data.extend(task_audits)
+    
+    def skip_processed_tasks(self, tasks_data):
+        """Drop tasks the ledger already holds, unless a refresh was requested"""
+        if self.ledger is None or self.refresh or not tasks_data:
+            return tasks_data
+        
+        processed = self.ledger.processed_ids(task["task_id"] for task in tasks_data)
+        if processed:
+            logger.info(f"[LEDGER] Skipping {len(processed)} of {len(tasks_data)} tasks audited by earlier runs")
+        return [task for task in tasks_data if task["task_id"] not in processed]
+    
+    def apply_task_window(self, tasks_data):
+        """Keep tasks completed inside the since/until window (tasks without a readable time are kept)"""
+        if not self.since and not self.until:
+            return tasks_data
+        
+        kept = []
+        for task in tasks_data:
+            completed = parse_complete_time(task["complete_time"])
+            if completed and ((self.since and completed < self.since) or (self.until and completed > self.until)):
+                continue
+            kept.append(task)
+        if len(kept) < len(tasks_data):
+            logger.info(f"[WATERMARK] {len(tasks_data) - len(kept)} tasks fall outside the --since/--until window")
+        return kept
+    
+    def select_new_tasks(self, tasks_data):
+        """Tasks of a scanned page (or list) that this run still has to audit"""
+        tasks_data = self.skip_processed_tasks(self.apply_task_window(tasks_data))
+        if self.checkpoint and self.checkpoint.completed:
+            tasks_data = [task for task in tasks_data if task["task_id"] not in self.checkpoint.completed]
+        return tasks_data
+    
+    def task_finished(self, task_audit, index=None):
+        """
+        Persist a finished task before moving on: stream it to the export files and
+        checkpoint it (failed tasks are exported but left for the resumed run)
+        
+        Args:
+            task_audit (dict): Finished task audit
+            index (int): Position in the task list; the export files keep task order even when
+                tasks finish out of order (tabs, pool, concurrent HTTP, pipeline)
+        """
+        if self.export_sink:
+            self.export_sink.write(task_audit, index)
+        if self.checkpoint and not audit_failed(task_audit):
+            try:
+                self.checkpoint.add_task(task_audit)
+            except Exception as e:
+                logger.error(f"[CHECKPOINT] Could not save task {task_audit['receive_task_id']}: {str(e)}")
+    
+    def task_skipped(self, index):
+        """A task that produced no audit; later tasks held back by the export files can be written"""
+        if self.export_sink:
+            self.export_sink.skip(index)
+    
+    def checkpoint_task_pages(self, task_pages):
+        """Pass scanned task list pages through, saving each to the run's task manifest first"""
+        for page_tasks in task_pages:
+            if self.checkpoint:
+                self.checkpoint.add_tasks(page_tasks)
+            yield page_tasks
+        if self.checkpoint:
+            self.checkpoint.complete_manifest()
+    
+    def reached_lower_bound(self, page, rows):
+        """Whether the list scan can stop after this page: every task on it predates the lower bound"""
+        if self.scan_lower_bound and page_older_than(rows, self.scan_lower_bound):
+            print(f"\n⏹️ Page {page} only holds tasks completed before {self.scan_lower_bound}, stopping the list scan")
+            logger.info(f"[WATERMARK] Stopped the task list scan after page {page}")
+            return True
+        return False
+    
+    def load_watermark(self):
+        """Use the ledger's watermark as the scan's lower bound unless a window or refresh was given"""
+        if self.since or self.refresh or self.ledger is None:
+            return
+        watermark = self.ledger.get_watermark()
+        if watermark:
+            self.scan_lower_bound = parse_complete_time(watermark)
+            logger.info(f"[WATERMARK] Every task completed up to {watermark} is audited; scanning newer pages only")
+    
+    def advance_watermark(self):
+        """Move the ledger's watermark up to the newest completion time this run fully audited"""
+        # Explicit windows and partial runs leave gaps below them, so only full runs count
+        if self.ledger is None or not self.full_run or self.since or self.pipeline_stats.get("failures"):
+            return
+        if any(stats.get("failures") or stats.get("error") for stats in self.pool_stats.values()):
+            return
+        
+        done_times = []
+        failed_times = []
+        for audit in self.audit_data:
+            completed = parse_complete_time(audit["complete_time"])
+            if audit_failed(audit):
+                if completed is None:
+                    return
+                failed_times.append(completed)
+            elif completed:
+                done_times.append(completed)
+        
+        # Tasks older than the oldest failure were all audited; the failure itself was not
+        if failed_times:
+            done_times = [completed for completed in done_times if completed < min(failed_times)]
+        if not done_times:
+            return
+        
+        newest = max(done_times)
+        current = self.ledger.get_watermark()
+        if current and parse_complete_time(current) >= newest:
+            return
+        self.ledger.set_watermark(newest.strftime('%Y-%m-%d %H:%M:%S'))
+        logger.info(f"[WATERMARK] Advanced to {newest:%Y-%m-%d %H:%M:%S}")
+    
+    def restore_manifest_order(self):
+        """After a resume, put reloaded and newly audited tasks back into task list order"""
+        order = {task["task_id"]: index for index, task in enumerate(self.checkpoint.manifest)}
+        self.audit_data.sort(key=lambda task_audit: order.get(task_audit["receive_task_id"], len(order)))
+    
+    def record_to_ledger(self):
+        """Store this run's task audits in the ledger"""
+        if self.ledger is None or not self.audit_data:
+            return
+        try:
+            recorded = self.ledger.record(self.audit_data)
+            logger.info(f"[LEDGER] Recorded {recorded} tasks ({len(self.ledger)} in {self.ledger_path})")
+        except Exception as e:
+            logger.error(f"[LEDGER] Could not record audited tasks: {str(e)}")
+    
+    def record_results(self):
+        """Add this run's task audits to the results database"""
+        if not self.results_path or not self.audit_data:
+            return
+        try:
+            store = ResultsStore(self.results_path)
+            try:
+                recorded = store.record(self.audit_data)
+                logger.info(f"[RESULTS] Stored {recorded} tasks ({len(store)} in {self.results_path})")
+            finally:
+                store.close()
+        except Exception as e:
+            logger.error(f"[RESULTS] Could not store audited tasks: {str(e)}")
+    
+    def audit_tasks(self, tasks_data):
+        """Audit a known list of tasks with the fastest detail mode configured"""
+        if self.http_client and self.concurrency > 1:
+            self.audit_tasks_concurrently(tasks_data)
+        elif self.workers > 1 and not self.http_client:
+            self.audit_tasks_in_pool(tasks_data)
+        elif self.tabs > 1 and not self.http_client:
+            self.audit_tasks_in_tabs(tasks_data)
+        else:
+            self.audit_tasks_serially(tasks_data)
+    
+    def audit_tasks_pipelined(self, max_tasks=None):
+        """
+        Scan the task list and audit task details at the same time
+        
+        Each scanned list page feeds its Done tasks into a bounded queue. In HTTP mode the
+        consumers share the pooled client (`concurrency` of them); otherwise each of the
+        `workers` consumers drives its own Chrome started from this session's login state
+        while this browser keeps scanning the list. When the backend's task list cannot be
+        used (e.g. numeric status codes), this browser scans the list for the HTTP consumers.
+        
+        Returns:
+            bool: True if any task list page was scanned
+        """
+        http_pages = None
+        if self.http_client:
+            # The first page shows whether the backend's list is usable (e.g. textual statuses)
+            http_pages = self.iter_task_list_pages_http()
+            try:
+                first_page = next(http_pages, None)
+            except Exception as e:
+                logger.warning(f"[HTTP] Task list fetch failed, scanning pages in the browser: {str(e)}")
+                http_pages = None
+        
+        if http_pages is not None:
+            def list_pages():
+                if first_page:
+                    yield first_page
+                yield from http_pages
+            task_pages = (self.select_new_tasks(split_task_rows(rows)[0]) for page, rows in list_pages())
+        else:
+            if self.http_client:
+                self.navigate_to_receive_tasks()
+            plan = self.plan_task_list_scan()
+            if plan is None:
+                return False
+            task_pages = (self.select_new_tasks(page_tasks)
+                          for page, page_tasks, page_skipped in self.iter_task_list_pages(*plan))
+        
+        if self.http_client:
+            client = self.http_client
+            consumers = self.concurrency
+            
+            def make_consumer(consumer_id):
+                def process(task_info):
+                    task_id = task_info["task_id"]
+                    return self.build_task_audit(task_info, self.count_tracking_numbers(task_id, client.fetch_task_detail(task_id)))
+                return process, None
+        else:
+            consumers = self.workers
+            session = snapshot_session(self.driver)
+            automation_options = self.worker_automation_options()
+            
+            def make_consumer(consumer_id):
+                worker = SPXAuditAutomationFixed(**automation_options)
+                if not worker.setup_driver():
+                    raise RuntimeError("could not start Chrome")
+                restore_session(worker.driver, session)
+                
+                def process(task_info):
+                    return worker.build_task_audit(task_info, worker.process_receive_task_detail(task_info["task_id"]))
+                return process, worker.driver.quit
+        
+        print(f"\n🔀 Streaming tasks from the list scan to {consumers} detail consumers...")
+        task_audits, self.pipeline_stats = run_list_detail_pipeline(
+            self.checkpoint_task_pages(task_pages), make_consumer, consumers, max_tasks=max_tasks,
+            on_result=lambda index, task_audit: self.task_finished(task_audit, index),
+            on_failure=lambda index, task_info: self.task_skipped(index))
+        self.audit_data.extend(task_audits)
+        return self.pipeline_stats["pages"] > 0
+    
     def audit_all_tasks(self, max_tasks=None, specific_task=None):
         """Main method to audit all receive tasks with proper tracking number counting and status filtering"""
+        finished = False
         try:
             if not self.setup_driver():
                 return False
             
+            if self.ledger_path:
+                self.ledger = TaskLedger(self.ledger_path)
+                logger.info(f"[LEDGER] {len(self.ledger)} tasks already audited in {self.ledger_path}"
+                            f"{' (refresh: re-auditing them)' if self.refresh else ''}")
+                self.load_watermark()
+            
+            self.checkpoint = RunCheckpoint(CHECKPOINT_DIR, self.resume_run_id)
+            if self.checkpoint.resumed:
+                # Tasks finished before the interruption are part of this run's results
+                self.audit_data.extend(self.checkpoint.completed.values())
+            print(f"\n💾 Run {self.checkpoint.run_id}: progress saved to {self.checkpoint.path}")
+            
+            # Finished tasks go straight to the export files (resumed ones first)
+            self.export_sink = AuditExportSink(OUTPUT_DIR, "spx_audit_data", datetime.now().strftime("%Y%m%d_%H%M%S"),
+                                               defer_excel=self.defer_excel)
+            for task_audit in self.audit_data:
+                self.export_sink.write(task_audit, resumed=True)
+            
             # Step 1: Open SPX homepage for login
             if not self.open_spx_homepage():
                 return False
@@ -818,172 +2181,236 @@ class SPXAuditAutomationFixed:
             if not self.navigate_to_receive_tasks():
                 return False
             
+            if self.http_fetch:
+                self.connect_http_client()
+            
+            # Time from here on is split into waiting vs working (login time excluded)
+            self.waits.start_run()
+            
             # Step 3: Handle specific task processing or scan all tasks
             if specific_task:
                 logger.info(f"Processing specific task: {specific_task}")
                 tasks_data = [{"task_id": specific_task, "complete_time": "N/A", "status": "Done"}]
+            elif self.checkpoint.manifest_complete:
+                # The interrupted run had finished its list scan: continue from its task manifest
+                self.scan_complete = True
+                tasks_data = [task for task in self.checkpoint.manifest if task["task_id"] not in self.checkpoint.completed]
+                print(f"\n♻️ Resuming run {self.checkpoint.run_id}: {len(self.checkpoint.completed)} tasks done, "
+                      f"{len(tasks_data)} to go")
+            elif self.pipeline:
+                # List scan and detail fetching overlap, so there is no separate task list
+                tasks_data = None
+                if not self.audit_tasks_pipelined(max_tasks):
+                    print("\n❌ Could not extract any tasks with 'Done' status.")
+                    return False
             else:
                 # Scan and extract tasks (only Done status tasks will be included)
-                tasks_data = self.scan_and_extract_tasks()
+                tasks_data = self.scan_tasks_http() if self.http_client else self.scan_and_extract_tasks()
                 
                 if not tasks_data:
                     print("\n❌ Could not extract any tasks with 'Done' status.")
                     return False
                 
+                # Only the delta since the last run (inside the --since/--until window), unless refreshing
+                tasks_data = self.select_new_tasks(tasks_data)
+                if not tasks_data:
+                    print("\n✅ Every 'Done' task is already in the ledger, nothing new to audit.")
+                    finished = True
+                    return True
+                
                 # Limit tasks if specified
                 if max_tasks:
                     tasks_data = tasks_data[:max_tasks]
                     logger.info(f"Limited to first {max_tasks} tasks for testing")
             
-            logger.info(f"Starting audit of {len(tasks_data)} tasks with 'Done' status")
-            
-            # Process each task
-            for i, task_info in enumerate(tasks_data, 1):
-                try:
-                    task_id = task_info["task_id"]
-                    complete_time = task_info["complete_time"]
-                    status = task_info["status"]
-                    
-                    logger.info(f"Processing task {i}/{len(tasks_data)}: {task_id} (Status: {status})")
-                    
-                    # Process task detail with pagination
-                    sender_data = self.process_receive_task_detail(task_id)
-                    
-                    if sender_data:
-                        task_audit = {
-                            "receive_task_id": task_id,
-                            "complete_time": complete_time,
-                            "status": status,
-                            "sender_data": sender_data,
-                            "total_quantity": sum(sender_data.values()),
-                            "sender_count": len(sender_data),
-                            "processed_at": datetime.now().isoformat()
-                        }
-                        self.audit_data.append(task_audit)
-                        
-                        logger.info(f"Task {task_id}: {len(sender_data)} senders, {sum(sender_data.values())} total tracking numbers")
-                    
-                    # Delay between requests
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing task {task_info.get('task_id', 'unknown')}: {str(e)}")
-                    continue
+            if tasks_data is not None:
+                if not self.checkpoint.manifest_complete:
+                    self.checkpoint.add_tasks(tasks_data)
+                    self.checkpoint.complete_manifest()
+                logger.info(f"Starting audit of {len(tasks_data)} tasks with 'Done' status")
+                self.audit_tasks(tasks_data)
             
+            self.log_command_summary()
+            self.waits.log_summary()
             logger.info(f"Audit completed. Processed {len(self.audit_data)} tasks successfully")
+            # A list scan that stopped early leaves unscanned pages below the newest tasks
+            self.full_run = not specific_task and not max_tasks and self.scan_complete
+            if not specific_task and not max_tasks and not self.scan_complete:
+                logger.warning("[WATERMARK] The task list scan did not complete, the watermark stays where it is")
+            finished = True
             return True
             
         except Exception as e:
             logger.error(f"Error during audit: {str(e)}")
             return False
         finally:
-            if self.driver:
-                self.driver.quit()
+            if self.checkpoint:
+                self.checkpoint.close()
+                if self.checkpoint.resumed:
+                    self.restore_manifest_order()
+                # Keep the file while a resume still has something to do
+                if (finished and (self.scan_complete or specific_task or max_tasks)
+                        and not self.pipeline_stats.get("failures")
+                        and not any(audit_failed(task_audit) for task_audit in self.audit_data)):
+                    self.checkpoint.remove()
+            if self.export_sink:
+                # Leave complete, valid files behind even when the run is interrupted
+                self.export_sink.close(wait=not self.defer_excel)
+            self.record_to_ledger()
+            self.record_results()
+            self.advance_watermark()
+            if self.ledger is not None:
+                self.ledger.close()
+            if self.http_client:
+                logger.info(f"[HTTP] {self.http_client.request_count} backend requests made")
+                self.http_client.close()
+            self.close_driver()
     
-    def export_to_json(self, filename):
-        """Export audit data to JSON format"""
+    def _export_with(self, writer_class, filename, label):
+        """Write all of audit_data to one file with a streaming writer"""
         try:
-            filepath = os.path.join(OUTPUT_DIR, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.audit_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"Data exported to {filepath}")
-            return True
+            writer = writer_class(os.path.join(OUTPUT_DIR, filename))
+            for task in self.audit_data:
+                writer.write(task)
+            if writer.close():
+                logger.info(f"Data exported to {writer.path}")
+                return True
+            if os.path.exists(writer.path):
+                os.remove(writer.path)
+            logger.warning(f"No data to export to {label}")
+            return False
         except Exception as e:
-            logger.error(f"Error exporting to JSON: {str(e)}")
+            logger.error(f"Error exporting to {label}: {str(e)}")
             return False
     
+    def export_to_json(self, filename):
+        """Export audit data to JSON format"""
+        return self._export_with(JsonArrayWriter, filename, "JSON")
+    
     def export_to_csv(self, filename):
         """Export audit data to CSV format"""
-        try:
-            filepath = os.path.join(OUTPUT_DIR, filename)
-            flattened_data = []
-            
-            for task in self.audit_data:
-                for sender_id, quantity in task["sender_data"].items():
-                    flattened_data.append({
-                        "receive_task_id": task["receive_task_id"],
-                        "complete_time": task["complete_time"],
-                        "status": task["status"],
-                        "sender_id": sender_id,
-                        "tracking_count": quantity,
-                        "total_task_quantity": task["total_quantity"],
-                        "sender_count": task["sender_count"],
-                        "processed_at": task["processed_at"]
-                    })
-            
-            if flattened_data:
-                df = pd.DataFrame(flattened_data)
-                df.to_csv(filepath, index=False, encoding='utf-8')
-                logger.info(f"Data exported to {filepath}")
-                return True
-            else:
-                logger.warning("No data to export to CSV")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error exporting to CSV: {str(e)}")
-            return False
+        return self._export_with(CsvRowWriter, filename, "CSV")
     
     def export_to_excel(self, filename):
         """Export audit data to Excel format"""
-        try:
-            filepath = os.path.join(OUTPUT_DIR, filename)
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Detailed data
-                flattened_data = []
-                for task in self.audit_data:
-                    for sender_id, quantity in task["sender_data"].items():
-                        flattened_data.append({
-                            "receive_task_id": task["receive_task_id"],
-                            "complete_time": task["complete_time"],
-                            "status": task["status"],
-                            "sender_id": sender_id,
-                            "tracking_count": quantity,
-                            "total_task_quantity": task["total_quantity"],
-                            "sender_count": task["sender_count"],
-                            "processed_at": task["processed_at"]
-                        })
-                
-                if flattened_data:
-                    df_detailed = pd.DataFrame(flattened_data)
-                    df_detailed.to_excel(writer, sheet_name='Detailed_Data', index=False)
-                
-                # Task summary
-                summary_data = []
-                for task in self.audit_data:
-                    summary_data.append({
-                        "receive_task_id": task["receive_task_id"],
-                        "complete_time": task["complete_time"],
-                        "status": task["status"],
-                        "total_senders": len(task["sender_data"]),
-                        "total_tracking_numbers": task["total_quantity"],
-                        "processed_at": task["processed_at"]
-                    })
-                
-                if summary_data:
-                    df_summary = pd.DataFrame(summary_data)
-                    df_summary.to_excel(writer, sheet_name='Task_Summary', index=False)
-            
-            logger.info(f"Data exported to {filepath}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error exporting to Excel: {str(e)}")
-            return False
+        return self._export_with(ExcelStreamWriter, filename, "Excel")
     
     def export_all_formats(self, base_filename="spx_audit_data"):
-        """Export data to all formats"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        success = True
-        success &= self.export_to_json(f"{base_filename}_{timestamp}.json")
-        success &= self.export_to_csv(f"{base_filename}_{timestamp}.csv")
-        success &= self.export_to_excel(f"{base_filename}_{timestamp}.xlsx")
+        """
+        Export data to all formats
         
-        return success
+        After audit_all_tasks the files were already streamed task by task and are only
+        finished here; otherwise all of audit_data is written now
+        """
+        if self.export_sink is None:
+            self.export_sink = AuditExportSink(OUTPUT_DIR, base_filename, datetime.now().strftime("%Y%m%d_%H%M%S"),
+                                               defer_excel=self.defer_excel)
+            for task_audit in self.audit_data:
+                self.export_sink.write(task_audit)
+        return self.export_sink.close(wait=not self.defer_excel)
+
+def window_time(text):
+    """argparse type for --since/--until"""
+    value = parse_complete_time(text)
+    if value is None:
+        raise argparse.ArgumentTypeError(f"expected 'YYYY-MM-DD [HH:MM[:SS]]', got '{text}'")
+    return value
+
+def window_end_time(text):
+    """argparse type for --until: a bare date covers the whole day"""
+    value = window_time(text)
+    if len(text.strip()) == len("YYYY-MM-DD"):
+        value = value.replace(hour=23, minute=59, second=59)
+    return value
+
+def parse_args(argv=None):
+    """Command line options; running without any keeps the interactive prompts"""
+    parser = argparse.ArgumentParser(description="SPX Shopee Receive Task Audit Automation")
+    parser.add_argument("--max-tasks", type=int, help="Process only the first N 'Done' tasks (test mode)")
+    parser.add_argument("--task", help="Process one specific task ID (e.g. DRT2025080401VEC)")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-audit tasks already recorded in the ledger instead of skipping them")
+    parser.add_argument("--extraction-engine", choices=EXTRACTION_ENGINES, default='snapshot',
+                        help="How table pages are read (default snapshot)")
+    parser.add_argument("--capture-network", action="store_true",
+                        help="Read task and tracking records from SPX's own API responses via Chrome's network log")
+    parser.add_argument("--http-fetch", action="store_true",
+                        help="After login, fetch the task list and details over HTTP instead of rendering pages")
+    parser.add_argument("--concurrency", type=int, default=1, help="Task details fetched concurrently in HTTP mode")
+    parser.add_argument("--rate-limit", type=float, help="Maximum HTTP requests per second to the SPX host")
+    parser.add_argument("--tabs", type=int, default=1, help="Browser tabs used to pipeline task detail pages")
+    parser.add_argument("--workers", type=int, default=1, help="Chrome worker processes sharing the login session")
+    parser.add_argument("--recycle-after", type=int, default=50,
+                        help="Restart a worker's Chrome after this many tasks (0 to never recycle)")
+    parser.add_argument("--page-navigation", choices=PAGE_NAVIGATION_MODES, default='router',
+                        help="How list and detail pages are addressed (default router)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Stream tasks from each scanned list page straight to the detail consumers")
+    parser.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="SQLite ledger of audited tasks")
+    parser.add_argument("--no-ledger", action="store_true", help="Audit every task without reading or writing the ledger")
+    parser.add_argument("--since", type=window_time,
+                        help="Only audit tasks completed at or after 'YYYY-MM-DD [HH:MM[:SS]]' (overrides the watermark)")
+    parser.add_argument("--until", type=window_end_time,
+                        help="Only audit tasks completed at or before 'YYYY-MM-DD [HH:MM[:SS]]' (a bare date means end of day)")
+    parser.add_argument("--defer-excel", action="store_true",
+                        help="Finish the Excel workbook in the background once the JSON and CSV are written")
+    parser.add_argument("--results-db", default=DEFAULT_RESULTS_PATH,
+                        help="SQLite results database queried with spx_results.py")
+    parser.add_argument("--no-results-db", action="store_true", help="Do not add this run's results to the database")
+    parser.add_argument("--profile-dir", help="Persistent Chrome profile folder that keeps the login between runs")
+    parser.add_argument("--save-session", action="store_true",
+                        help=f"Save the login session (live cookies) to {DEFAULT_SESSION_PATH} and reuse it in later runs")
+    parser.add_argument("--session-file", help="Save and reuse the login session in this file instead (implies --save-session)")
+    parser.add_argument("--login-timeout", type=float,
+                        help=f"Seconds to wait for a manual login (default {INTERACTIVE_LOGIN_TIMEOUT}, wait time when headless)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Only use a ChromeDriver already on this machine, never download one")
+    parser.add_argument("--attach", metavar="HOST:PORT",
+                        help="Use a running Chrome started with --remote-debugging-port instead of launching one")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep a logged-in Chrome open and run audits on request through a local HTTP API")
+    parser.add_argument("--daemon-port", type=int, default=DEFAULT_DAEMON_PORT, help="Port of the daemon's API")
+    parser.add_argument("--debug-port", type=int, default=DEFAULT_DEBUG_PORT,
+                        help="Remote debugging port of the Chrome the daemon launches")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Continue an interrupted run from its checkpoint in output/checkpoints "
+                             "(kept until a run finishes with every task audited)")
+    return parser.parse_args(argv)
 
 def main():
     """Main execution function"""
+    args = parse_args()
+    interactive = len(sys.argv) == 1
+    session_file = args.session_file or (DEFAULT_SESSION_PATH if args.save_session else None)
+    engine_options = {
+        "extraction_engine": args.extraction_engine,
+        "capture_network": args.capture_network,
+        "http_fetch": args.http_fetch,
+        "concurrency": args.concurrency,
+        "rate_limit": args.rate_limit,
+        "tabs": args.tabs,
+        "workers": args.workers,
+        "recycle_after": args.recycle_after,
+        "page_navigation": args.page_navigation,
+        "pipeline": args.pipeline,
+    }
+    
+    if args.daemon:
+        # Options shared by every audit job; the window and refresh come with each request
+        automation_options = {
+            "headless": args.headless,
+            "ledger_path": None if args.no_ledger else args.ledger,
+            "results_path": None if args.no_results_db else args.results_db,
+            "session_file": session_file,
+            "login_timeout": args.login_timeout,
+            "offline": args.offline,
+            **engine_options,
+        }
+        run_daemon(automation_options, port=args.daemon_port, debugger_address=args.attach,
+                   debug_port=args.debug_port, profile_dir=args.profile_dir, headless=args.headless)
+        return
+    
     print("SPX Shopee Receive Task Audit Automation")
     print("=" * 80)
     print("✨ FEATURES:")
@@ -995,32 +2422,41 @@ def main():
     print("=" * 80)
     
     # Configuration
-    headless = False
-    max_tasks = None
-    specific_task = None
+    headless = args.headless
+    max_tasks = args.max_tasks
+    specific_task = args.task
     
-    # Ask user for configuration
+    # Ask user for configuration (command line options skip the prompts)
     try:
-        print("\n🔧 Configuration Options:")
-        response = input("Do you want to run in test mode (process only first 2 tasks)? (y/n): ").strip().lower()
-        if response == 'y':
-            max_tasks = 2
-            print("✅ Running in test mode - will process only 2 tasks with 'Done' status")
-        
-        # Option to process specific task
-        specific_response = input("\nDo you want to process a specific task ID? (y/n): ").strip().lower()
-        if specific_response == 'y':
-            task_id = input("Enter the task ID (e.g., DRT2025080401VEC): ").strip()
-            if task_id:
-                specific_task = task_id
-                print(f"✅ Will process specific task: {specific_task}")
-                max_tasks = None  # Override test mode for specific task
+        if interactive:
+            print("\n🔧 Configuration Options:")
+            response = input("Do you want to run in test mode (process only first 2 tasks)? (y/n): ").strip().lower()
+            if response == 'y':
+                max_tasks = 2
+                print("✅ Running in test mode - will process only 2 tasks with 'Done' status")
+        
+            # Option to process specific task
+            specific_response = input("\nDo you want to process a specific task ID? (y/n): ").strip().lower()
+            if specific_response == 'y':
+                task_id = input("Enter the task ID (e.g., DRT2025080401VEC): ").strip()
+                if task_id:
+                    specific_task = task_id
+                    print(f"✅ Will process specific task: {specific_task}")
+                    max_tasks = None  # Override test mode for specific task
         
     except:
         pass
     
     # Create automation instance
-    automation = SPXAuditAutomationFixed(headless=headless)
+    automation = SPXAuditAutomationFixed(headless=headless, refresh=args.refresh,
+                                         ledger_path=None if args.no_ledger else args.ledger,
+                                         since=args.since, until=args.until, resume=args.resume,
+                                         defer_excel=args.defer_excel,
+                                         results_path=None if args.no_results_db else args.results_db,
+                                         profile_dir=args.profile_dir,
+                                         session_file=session_file,
+                                         login_timeout=args.login_timeout, offline=args.offline,
+                                         debugger_address=args.attach, **engine_options)
     
     try:
         print(f"\n🚀 Starting automation with status checking and accurate tracking counting...")
@@ -1051,24 +2487,34 @@ def main():
             print(f"   • Total sender entries: {total_senders}")
             
             # Show file locations
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             print(f"\n📄 Generated files in 'output' folder:")
-            print(f"   • spx_audit_data_{timestamp}.xlsx")
-            print(f"   • spx_audit_data_{timestamp}.csv")
-            print(f"   • spx_audit_data_{timestamp}.json")
+            for path in automation.export_sink.paths:
+                if os.path.exists(path):
+                    print(f"   • {os.path.basename(path)}")
             print(f"   • spx_audit.log (log file)")
+            if automation.export_sink.pending:
+                print("⏳ Excel workbook is still being written in the background...")
             
+        elif success:
+            print("\n✅ No new tasks to audit - everything visible is already in the ledger")
         else:
             print("❌ Audit failed or no data collected")
             
     except KeyboardInterrupt:
         print("\n⏹️ Process interrupted by user")
+        if automation.checkpoint:
+            print(f"💾 Completed tasks are saved; continue with: --resume {automation.checkpoint.run_id}")
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         print(f"❌ Unexpected error occurred: {str(e)}")
     
+    if automation.export_sink and automation.export_sink.pending:
+        automation.export_sink.wait()
+        print("📄 Excel workbook finished")
+    
     print("\n✨ Process completed.")
-    input("Press Enter to exit...")
+    if interactive:
+        input("Press Enter to exit...")
 
 if __name__ == "__main__":
     main()
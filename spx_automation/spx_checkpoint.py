@@ -0,0 +1,164 @@
+"""
+SPX Checkpoint - Crash-safe progress file of one audit run
+Every record is appended to a JSONL file and fsynced before the run moves on,
+so a Chrome crash, Ctrl+C or a sleeping laptop loses at most the task in flight.
+A run is resumed from its file: the task manifest is reloaded, completed tasks
+are skipped and a multi-page task restarts after its last completed page.
+
+Record types, one JSON object per line:
+    {"type": "tasks", "tasks": [...]}        task manifest entries, in list order
+    {"type": "manifest_complete"}            the list scan finished
+    {"type": "page", "task_id", "page",      one detail page of a task
+     "page_size", "tracking"}
+    {"type": "task", "audit": {...}}         a completed task audit
+"""
+
+import json
+import logging
+import os
+import secrets
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def new_run_id():
+    """Run IDs are the run's start time plus a random suffix, e.g. 20250806_180000_3fa1"""
+    # Two runs started in the same second (daemon jobs, parallel invocations) must not share a file
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(2)}"
+
+
+class RunCheckpoint:
+    def __init__(self, directory, run_id=None):
+        """
+        Open the checkpoint file of a run, creating it for a new run
+
+        Args:
+            directory (str): Folder holding one <run_id>.jsonl file per run
+            run_id (str): Run to resume; None starts a new run
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.resumed = run_id is not None
+        self.run_id = run_id or new_run_id()
+        self.path = os.path.join(directory, f"{self.run_id}.jsonl")
+        if self.resumed and not os.path.exists(self.path):
+            raise FileNotFoundError(f"No checkpoint for run '{self.run_id}' at {self.path}")
+        # A new run never appends to another run's file, even on a suffix collision
+        while not self.resumed and os.path.exists(self.path):
+            self.run_id = new_run_id()
+            self.path = os.path.join(directory, f"{self.run_id}.jsonl")
+
+        self.manifest = []
+        self.manifest_complete = False
+        self.completed = {}
+        self.pages = {}
+        if self.resumed:
+            self._load()
+
+        # Pipeline consumers and the asyncio loop append from other threads
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self.resumed and not self._ends_with_newline():
+            # Terminate a torn last line so the next record starts on its own line
+            self._file.write("\n")
+            self._file.flush()
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self):
+        """Replay the file; a line torn by a crash mid-write is ignored"""
+        with open(self.path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"[CHECKPOINT] Ignoring unreadable line {line_number} of {self.path}")
+                    continue
+
+                kind = record.get("type")
+                if kind == "tasks":
+                    self.manifest.extend(record["tasks"])
+                elif kind == "manifest_complete":
+                    self.manifest_complete = True
+                elif kind == "page":
+                    self.pages.setdefault(record["task_id"], {})[record["page"]] = (record.get("page_size"),
+                                                                                   record["tracking"])
+                elif kind == "task":
+                    audit = record["audit"]
+                    self.completed[audit["receive_task_id"]] = audit
+                    self.pages.pop(audit["receive_task_id"], None)
+
+        logger.info(f"[CHECKPOINT] Run {self.run_id}: {len(self.manifest)} tasks in the manifest "
+                    f"({'complete' if self.manifest_complete else 'partial'}), {len(self.completed)} done, "
+                    f"{len(self.pages)} part-way")
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def add_tasks(self, tasks):
+        """Append task manifest entries (one list page's worth, or the whole list)"""
+        if tasks:
+            self._append({"type": "tasks", "tasks": tasks})
+
+    def complete_manifest(self):
+        self._append({"type": "manifest_complete"})
+
+    def add_page(self, task_id, page, page_size, tracking):
+        """Record the tracking numbers read from one detail page of a task"""
+        self._append({"type": "page", "task_id": task_id, "page": page, "page_size": page_size,
+                      "tracking": tracking})
+
+    def add_task(self, task_audit):
+        self._append({"type": "task", "audit": task_audit})
+
+    def resume_pages(self, task_id, page_size):
+        """
+        Detail pages already read for a task, if it was interrupted part-way
+
+        Args:
+            task_id (str): Receive task ID
+            page_size (int): Current page size; pages read at another size do not line up
+
+        Returns:
+            tuple: (last completed page, sender_id -> tracking list merged over those pages),
+                or (0, {}) when the task starts from its first page
+        """
+        pages = {page: tracking for page, (size, tracking) in self.pages.get(task_id, {}).items() if size == page_size}
+        if not pages:
+            return 0, {}
+
+        # Only a run of consecutive pages from page 1 can be continued
+        last_page = 0
+        while last_page + 1 in pages:
+            last_page += 1
+
+        tracking = {}
+        for page in range(1, last_page + 1):
+            for sender_id, tracking_list in pages[page].items():
+                known = tracking.setdefault(sender_id, [])
+                known.extend(number for number in tracking_list if number not in known)
+        return last_page, tracking
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def remove(self):
+        """Close and delete the file once the run finished cleanly and has nothing left to resume"""
+        self.close()
+        try:
+            os.remove(self.path)
+            logger.info(f"[CHECKPOINT] Run {self.run_id} finished cleanly, removed {self.path}")
+        except OSError as e:
+            logger.warning(f"[CHECKPOINT] Could not remove {self.path}: {str(e)}")
@@ -0,0 +1,224 @@
+"""
+SPX ChromeDriver - Offline, cached ChromeDriver resolution
+webdriver-manager checks the latest driver version over the network on every
+call, which costs seconds per run and fails on machines without internet. The
+driver is resolved once per Chrome major version and cached; later runs (and
+air-gapped machines with a driver already on disk) start without network access.
+
+Resolution order:
+    1. SPX_CHROMEDRIVER environment variable
+    2. Cached path for the installed Chrome's major version
+    3. chromedriver on PATH, or in webdriver-manager's download cache, matching that version
+    4. webdriver-manager download (the only step that needs the network)
+    5. Selenium Manager, which may download as well - so in offline mode a missing
+       driver is an error instead
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.path.join(SCRIPT_DIR, 'output', 'chromedriver_cache.json')
+
+DRIVER_NAME = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+
+VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+\.\d+")
+
+
+def chrome_binary_candidates():
+    """Common Chrome/Chromium install locations on Windows, Linux and macOS"""
+    return [
+        # Google Chrome
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        r"C:\Users\{}\AppData\Local\Google\Chrome\Application\chrome.exe".format(os.getenv('USERNAME')),
+
+        # Microsoft Edge (Chromium-based)
+        r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+        r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+
+        # Linux Chrome and Chromium
+        "/usr/bin/google-chrome",
+        "/usr/bin/google-chrome-stable",
+        "/opt/google/chrome/chrome",
+        "/usr/bin/chromium",
+        "/usr/bin/chromium-browser",
+        "/snap/bin/chromium",
+
+        # macOS
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    ]
+
+
+def find_chrome_binary():
+    """
+    Find the Chrome binary in common installation locations, then on PATH
+
+    Returns:
+        str: Path of the binary, or None
+    """
+    for path in chrome_binary_candidates():
+        if os.path.exists(path):
+            return path
+    for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _run_version(path):
+    """First a.b.c.d version printed by 'path --version', or None"""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except Exception as e:
+        logger.debug(f"[DRIVER] '{path} --version' failed: {str(e)}")
+        return None
+    match = VERSION_PATTERN.search(output or "")
+    return match.group(0) if match else None
+
+
+def chrome_major_version(binary):
+    """
+    Major version of a Chrome binary, read without starting a browser window
+
+    On Windows chrome.exe has no --version output, but its install folder holds
+    a subfolder named after the version
+
+    Returns:
+        int: Major version, or None when it cannot be read
+    """
+    if not binary:
+        return None
+    if binary.lower().endswith(".exe"):
+        try:
+            versions = [name for name in os.listdir(os.path.dirname(binary)) if VERSION_PATTERN.fullmatch(name)]
+        except OSError:
+            versions = []
+        if versions:
+            newest = max(versions, key=lambda name: tuple(int(part) for part in name.split(".")))
+            return int(newest.split(".")[0])
+        return None
+    version = _run_version(binary)
+    return int(version.split(".")[0]) if version else None
+
+
+def driver_major_version(path):
+    version = _run_version(path)
+    return int(version.split(".")[0]) if version else None
+
+
+def downloaded_drivers():
+    """
+    Drivers already in webdriver-manager's download cache (~/.wdm, or ./.wdm with WDM_LOCAL)
+
+    Returns:
+        list: (major version, path) pairs
+    """
+    roots = [os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver"),
+             os.path.join(os.getcwd(), ".wdm", "drivers", "chromedriver")]
+    found = []
+    for root in roots:
+        for folder, _, files in os.walk(root):
+            if DRIVER_NAME not in files:
+                continue
+            # The version is one of the folder names, e.g. .../linux64/119.0.6045.105/chromedriver-linux64
+            match = VERSION_PATTERN.search(os.path.relpath(folder, root))
+            if match:
+                found.append((int(match.group(1)), os.path.join(folder, DRIVER_NAME)))
+    return found
+
+
+class ChromeDriverResolver:
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, allow_download=True):
+        """
+        Args:
+            cache_path (str): JSON file mapping Chrome major versions to driver paths
+            allow_download (bool): Fall back to a webdriver-manager download when nothing local matches
+        """
+        self.cache_path = cache_path
+        self.allow_download = allow_download
+        self.source = None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, major, path):
+        cache = self._load_cache()
+        cache[str(major)] = path
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            logger.warning(f"[DRIVER] Could not write the driver cache {self.cache_path}: {str(e)}")
+
+    def _resolved(self, source, path, major=None):
+        self.source = source
+        logger.info(f"[DRIVER] Using ChromeDriver from {source}: {path}")
+        if major is not None and source != "cache":
+            self._save_cache(major, path)
+        return path
+
+    def resolve(self, chrome_binary=None):
+        """
+        Path of a ChromeDriver matching the installed Chrome
+
+        Args:
+            chrome_binary (str): Chrome binary whose version the driver must match
+
+        Returns:
+            str: Driver path, or None to leave the lookup to Selenium Manager
+
+        Raises:
+            RuntimeError: Downloads are not allowed and no local driver matches
+        """
+        override = os.getenv("SPX_CHROMEDRIVER")
+        if override:
+            return self._resolved("SPX_CHROMEDRIVER", override)
+
+        major = chrome_major_version(chrome_binary or find_chrome_binary())
+
+        # Without Chrome's version a cached driver cannot be known to match, so the cache is
+        # neither read nor written (a driver saved for an unknown version breaks after an update)
+        cached = self._load_cache().get(str(major)) if major is not None else None
+        if cached and os.path.exists(cached):
+            return self._resolved("cache", cached)
+
+        on_path = shutil.which(DRIVER_NAME)
+        if on_path and (major is None or driver_major_version(on_path) == major):
+            return self._resolved("PATH", on_path, major)
+
+        matching = [path for driver_major, path in downloaded_drivers() if major is None or driver_major == major]
+        if matching:
+            return self._resolved("webdriver-manager cache", max(matching, key=os.path.getmtime), major)
+
+        if self.allow_download:
+            try:
+                # Imported here so offline machines never need webdriver-manager
+                from webdriver_manager.chrome import ChromeDriverManager
+                return self._resolved("webdriver-manager download", ChromeDriverManager().install(), major)
+            except Exception as e:
+                logger.warning(f"[DRIVER] webdriver-manager could not provide a driver: {str(e)}")
+
+        if not self.allow_download:
+            # Selenium Manager would download a driver, which offline mode rules out
+            raise RuntimeError(f"Offline mode: no local ChromeDriver matches Chrome {major or '(unknown version)'}; "
+                               f"put a matching {DRIVER_NAME} on PATH or point SPX_CHROMEDRIVER at one")
+
+        logger.warning(f"[DRIVER] No local ChromeDriver for Chrome {major or '(unknown version)'}, "
+                       f"leaving it to Selenium Manager")
+        self.source = "Selenium Manager"
+        return None
@@ -0,0 +1,426 @@
+"""
+SPX Daemon - Long-running audit service with a local HTTP trigger API
+Keeps one logged-in Chrome open (launched with remote debugging, or an already
+running one given with --attach) and runs audit jobs against it on request, so
+each audit skips the Chrome launch, the login and the page warm-up. Every job
+attaches a fresh automation to the browser and detaches when it is done.
+
+    python spx_audit_automation.py --daemon --daemon-port 8766
+
+API (JSON, bound to 127.0.0.1; set SPX_DAEMON_TOKEN to require 'Authorization: Bearer <token>'):
+    GET  /health                  browser and queue state
+    POST /audits                  start an audit: {"task", "since", "until", "max_tasks", "refresh"}, all optional
+    GET  /audits                  all jobs, newest first
+    GET  /audits/<job_id>         status of one job
+    GET  /audits/<job_id>/results the job's task audits, the same JSON array as spx_audit_data_*.json
+
+Jobs skip tasks already in the ledger (unless "refresh" is set), so the results of a
+job without a window hold only the tasks that job audited. For a job with "since" or
+"until" the results cover the whole window: tasks audited by earlier runs are read
+back from the results database (--results-db; tasks from before it existed can be
+loaded with 'spx_results.py import'), and with --no-results-db only the job's own
+tasks are returned.
+"""
+
+import hmac
+import json
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from spx_chromedriver import find_chrome_binary
+from spx_extractors import parse_complete_time
+from spx_results import ResultsStore
+from spx_session import SPX_HOME_URL
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DAEMON_PORT = 8766
+DEFAULT_DEBUG_PORT = 9222
+DEFAULT_DAEMON_PROFILE = os.path.join(SCRIPT_DIR, 'output', 'daemon-chrome-profile')
+
+# Finished jobs kept for status and result requests
+MAX_FINISHED_JOBS = 50
+
+JOB_FIELDS = ("task", "since", "until", "max_tasks", "refresh")
+
+
+def launch_debug_chrome(debug_port, profile_dir, headless=False, timeout=30):
+    """
+    Start Chrome with remote debugging on a persistent profile and wait until it accepts connections
+
+    Returns:
+        subprocess.Popen: The Chrome process
+    """
+    binary = find_chrome_binary()
+    if not binary:
+        raise RuntimeError("no Chrome/Chromium binary found")
+
+    arguments = [binary, f"--remote-debugging-port={debug_port}", f"--user-data-dir={os.path.abspath(profile_dir)}",
+                 "--no-first-run", "--no-default-browser-check", "--window-size=1920,1080"]
+    if headless:
+        arguments.append("--headless=new")
+    process = subprocess.Popen(arguments + [SPX_HOME_URL], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    started = time.time()
+    while time.time() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Chrome exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{debug_port}/json/version", timeout=2):
+                logger.info(f"[DAEMON] Chrome listening on port {debug_port} after {time.time() - started:.1f}s")
+                return process
+        except OSError:
+            time.sleep(0.25)
+
+    process.terminate()
+    raise RuntimeError(f"Chrome did not open remote debugging port {debug_port} within {timeout}s")
+
+
+class AuditDaemon:
+    def __init__(self, automation_options, debugger_address=None, debug_port=DEFAULT_DEBUG_PORT,
+                 profile_dir=None, headless=False):
+        """
+        Args:
+            automation_options (dict): Keyword arguments for each job's SPXAuditAutomationFixed
+            debugger_address (str): 'host:port' of a Chrome to use; None launches one on debug_port
+            debug_port (int): Remote debugging port of the launched Chrome
+            profile_dir (str): Profile of the launched Chrome, which keeps its login across restarts
+            headless (bool): Launch Chrome without a window
+        """
+        self.automation_options = automation_options
+        self.external_browser = debugger_address is not None
+        self.debugger_address = debugger_address or f"127.0.0.1:{debug_port}"
+        self.debug_port = debug_port
+        self.profile_dir = profile_dir or DEFAULT_DAEMON_PROFILE
+        self.headless = headless
+        self.chrome_process = None
+
+        self.jobs = {}
+        self.running_job = None
+        self._jobs_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run_jobs, name="spx-daemon-jobs", daemon=True)
+
+    def browser_running(self):
+        if self.external_browser:
+            return True
+        return self.chrome_process is not None and self.chrome_process.poll() is None
+
+    def ensure_browser(self):
+        """(Re)launch the daemon's Chrome if it is not running"""
+        if self.browser_running():
+            return
+        if self.chrome_process is not None:
+            logger.warning(f"[DAEMON] Chrome exited with code {self.chrome_process.returncode}, relaunching it")
+        self.chrome_process = launch_debug_chrome(self.debug_port, self.profile_dir, self.headless)
+
+    def _attached_automation(self, **options):
+        # Imported here: the automation module imports this one for its --daemon option
+        from spx_audit_automation import SPXAuditAutomationFixed
+        return SPXAuditAutomationFixed(**dict(self.automation_options, debugger_address=self.debugger_address,
+                                              **options))
+
+    def warm_up(self):
+        """Make sure the browser is up and logged in before the first job arrives"""
+        self.ensure_browser()
+        automation = self._attached_automation()
+        try:
+            if not automation.setup_driver():
+                return False
+            return automation.open_spx_homepage()
+        finally:
+            automation.close_driver()
+
+    def start(self):
+        self._worker.start()
+
+    def submit(self, params):
+        """
+        Queue an audit job
+
+        Args:
+            params (dict): Optional task, since, until, max_tasks and refresh
+
+        Returns:
+            dict: The job's status view
+
+        Raises:
+            ValueError: On unknown or malformed parameters
+        """
+        # Imported here for the same reason as in _attached_automation
+        from spx_audit_automation import window_time, window_end_time
+
+        unknown = set(params) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))}")
+        max_tasks = params.get("max_tasks")
+        if max_tasks is not None and (not isinstance(max_tasks, int) or isinstance(max_tasks, bool) or max_tasks < 1):
+            raise ValueError("max_tasks must be a positive integer")
+        try:
+            since = window_time(params["since"]) if params.get("since") else None
+            until = window_end_time(params["until"]) if params.get("until") else None
+        except Exception as e:
+            raise ValueError(str(e))
+
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "status": "queued",
+            "params": {key: params[key] for key in JOB_FIELDS if params.get(key) is not None},
+            "submitted_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "run_id": None,
+            "tasks": None,
+            "total_quantity": None,
+            "files": [],
+            "error": None,
+            "_options": {"since": since, "until": until, "refresh": bool(params.get("refresh"))},
+            "_run": {"max_tasks": max_tasks, "specific_task": params.get("task")},
+            "_results_path": None,
+        }
+        with self._jobs_lock:
+            self.jobs[job["id"]] = job
+            self._prune_jobs()
+        self._queue.put(job["id"])
+        logger.info(f"[DAEMON] Queued job {job['id']} {job['params']}")
+        return self.job_view(job)
+
+    def _prune_jobs(self):
+        finished = [job for job in self.jobs.values() if job["status"] in ("done", "failed")]
+        for job in sorted(finished, key=lambda job: job["submitted_at"])[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job["id"]]
+
+    def job_view(self, job):
+        """Public fields of a job"""
+        return {key: value for key, value in job.items() if not key.startswith("_")}
+
+    def get_job(self, job_id):
+        with self._jobs_lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._jobs_lock:
+            jobs = sorted(self.jobs.values(), key=lambda job: job["submitted_at"], reverse=True)
+            return [self.job_view(job) for job in jobs]
+
+    def job_results(self, job):
+        """
+        Task audits of a finished job; a window job also gets the window's tasks that
+        earlier runs audited (and the ledger therefore skipped) from the results database
+
+        Returns:
+            list: Task audits, newest completion first for window jobs
+        """
+        audits = []
+        if job["_results_path"] and os.path.exists(job["_results_path"]):
+            with open(job["_results_path"], encoding='utf-8') as f:
+                audits = json.load(f)
+
+        since, until = job["_options"]["since"], job["_options"]["until"]
+        results_path = self.automation_options.get("results_path")
+        if not (since or until) or not results_path:
+            return audits
+
+        store = ResultsStore(results_path)
+        try:
+            stored = store.task_audits(since.strftime('%Y-%m-%d') if since else None,
+                                       until.strftime('%Y-%m-%d') if until else None)
+        finally:
+            store.close()
+
+        # The store works in whole days; the job's window may start or end mid-day
+        audited = {audit["receive_task_id"] for audit in audits}
+        for audit in stored:
+            completed = parse_complete_time(audit["complete_time"])
+            if audit["receive_task_id"] in audited or completed is None:
+                continue
+            if (since and completed < since) or (until and completed > until):
+                continue
+            audits.append(audit)
+        logger.info(f"[DAEMON] Job {job['id']}: {len(audited)} tasks audited, "
+                    f"{len(audits) - len(audited)} read back from {results_path}")
+        return sorted(audits, key=lambda audit: parse_complete_time(audit["complete_time"]) or datetime.min,
+                      reverse=True)
+
+    def health(self):
+        return {"status": "ok", "browser": self.debugger_address, "browser_running": self.browser_running(),
+                "queued": self._queue.qsize(), "running_job": self.running_job}
+
+    def _run_jobs(self):
+        """Job worker: audits run one at a time, since they share the one browser"""
+        while True:
+            job_id = self._queue.get()
+            job = self.get_job(job_id)
+            if job is None:
+                continue
+            self.running_job = job_id
+            try:
+                self._run_job(job)
+            finally:
+                self.running_job = None
+
+    def _run_job(self, job):
+        job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+        logger.info(f"[DAEMON] Running job {job['id']}")
+        automation = None
+        try:
+            self.ensure_browser()
+            automation = self._attached_automation(**job["_options"])
+            success = automation.audit_all_tasks(**job["_run"])
+
+            sink = automation.export_sink
+            if sink:
+                sink.wait()
+                job["files"] = [path for path in sink.paths if os.path.exists(path)]
+                job["_results_path"] = sink.writers["json"].writer.path
+            if automation.checkpoint:
+                job["run_id"] = automation.checkpoint.run_id
+            job["tasks"] = len(automation.audit_data)
+            job["total_quantity"] = sum(task["total_quantity"] for task in automation.audit_data)
+            job["status"] = "done" if success else "failed"
+            if not success:
+                job["error"] = "audit failed, see output/spx_audit.log"
+        except Exception as e:
+            logger.error(f"[DAEMON] Job {job['id']} failed: {str(e)}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            logger.info(f"[DAEMON] Job {job['id']} {job['status']}: {job['tasks']} tasks")
+
+    def shutdown(self):
+        """Close a Chrome the daemon launched; an attached one is left running"""
+        if self.chrome_process is not None and self.chrome_process.poll() is None:
+            self.chrome_process.terminate()
+            try:
+                self.chrome_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.chrome_process.kill()
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(f"[DAEMON] {self.address_string()} {format % args}")
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path):
+        size = os.path.getsize(path)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+
+    def _authorized(self):
+        token = self.server.token
+        if not token:
+            return True
+        supplied = self.headers.get("Authorization") or ""
+        if hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+            return True
+        self._send_json({"error": "unauthorized"}, status=401)
+        return False
+
+    def _route(self):
+        return [part for part in self.path.split("?")[0].split("/") if part]
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        daemon = self.server.audit_daemon
+        parts = self._route()
+
+        if parts == ["health"]:
+            self._send_json(daemon.health())
+        elif parts == ["audits"]:
+            self._send_json({"jobs": daemon.list_jobs()})
+        elif len(parts) in (2, 3) and parts[0] == "audits":
+            job = daemon.get_job(parts[1])
+            if job is None:
+                self._send_json({"error": f"unknown job {parts[1]}"}, status=404)
+            elif len(parts) == 2:
+                self._send_json(daemon.job_view(job))
+            elif parts[2] != "results":
+                self._send_json({"error": "not found"}, status=404)
+            elif job["status"] != "done":
+                self._send_json({"error": f"job is {job['status']}"}, status=409)
+            elif job["_options"]["since"] or job["_options"]["until"]:
+                try:
+                    self._send_json(daemon.job_results(job))
+                except Exception as e:
+                    logger.error(f"[DAEMON] Could not read the results of job {job['id']}: {str(e)}")
+                    self._send_json({"error": str(e)}, status=500)
+            elif job["_results_path"] and os.path.exists(job["_results_path"]):
+                self._send_file(job["_results_path"])
+            else:
+                # No new tasks since the ledger's last run: the run left no JSON file behind
+                self._send_json([])
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self._route() != ["audits"]:
+            self._send_json({"error": "not found"}, status=404)
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            params = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            if not isinstance(params, dict):
+                raise ValueError("expected a JSON object")
+            job = self.server.audit_daemon.submit(params)
+        except ValueError as e:
+            self._send_json({"error": str(e)}, status=400)
+            return
+        self._send_json(job, status=202)
+
+
+def run_daemon(automation_options, host="127.0.0.1", port=DEFAULT_DAEMON_PORT, debugger_address=None,
+               debug_port=DEFAULT_DEBUG_PORT, profile_dir=None, headless=False):
+    """Warm up the browser, then serve the trigger API until interrupted"""
+    daemon = AuditDaemon(automation_options, debugger_address, debug_port, profile_dir, headless)
+    print(f"\n🌡️ Starting the browser at {daemon.debugger_address} and checking the SPX login...")
+    if not daemon.warm_up():
+        print("⚠️ Not logged in yet; jobs will wait for the login (or fail after the login timeout)")
+
+    server = ThreadingHTTPServer((host, port), DaemonHandler)
+    server.daemon_threads = True
+    server.audit_daemon = daemon
+    server.token = os.getenv("SPX_DAEMON_TOKEN")
+    daemon.start()
+    print(f"🛰️ SPX audit daemon listening on http://{host}:{server.server_address[1]} "
+          f"(POST /audits to start an audit){' - token required' if server.token else ''}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Daemon stopped")
+    finally:
+        server.server_close()
+        daemon.shutdown()
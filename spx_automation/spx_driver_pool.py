@@ -0,0 +1,155 @@
+"""
+SPX Driver Pool - Multi-process Chrome workers sharing one authenticated session
+Each worker process starts its own Chrome from a session snapshot taken after the
+interactive login, processes its shard of task IDs and streams results back to the
+parent process, which is the single writer of the audit data
+"""
+
+import logging
+import multiprocessing
+import queue
+import time
+
+from spx_ledger import FAILURE_MARKERS
+from spx_session import restore_session
+
+logger = logging.getLogger(__name__)
+
+
+def _start_worker_driver(automation, session):
+    """Start a Chrome instance for a worker and load the shared session into it"""
+    if not automation.setup_driver():
+        raise RuntimeError("could not start Chrome")
+    restore_session(automation.driver, session)
+
+
+def _pool_worker(worker_id, shard, session, automation_options, recycle_after, result_queue):
+    """Worker process: audit a shard of (index, task_info) pairs in a private Chrome instance"""
+    # Imported here so spawned workers load the automation module themselves
+    from spx_audit_automation import SPXAuditAutomationFixed
+
+    stats = {"worker": worker_id, "tasks": 0, "failures": 0, "recycles": 0, "busy_seconds": 0.0}
+    automation = SPXAuditAutomationFixed(**automation_options)
+
+    try:
+        _start_worker_driver(automation, session)
+        tasks_since_start = 0
+
+        for index, task_info in shard:
+            # Recycle the browser every recycle_after tasks to bound Chrome's memory
+            if recycle_after and tasks_since_start >= recycle_after:
+                automation.driver.quit()
+                _start_worker_driver(automation, session)
+                tasks_since_start = 0
+                stats["recycles"] += 1
+
+            started = time.time()
+            sender_data = automation.process_receive_task_detail(task_info["task_id"])
+            stats["busy_seconds"] += time.time() - started
+            stats["tasks"] += 1
+            tasks_since_start += 1
+            if any(marker in sender_data for marker in FAILURE_MARKERS):
+                stats["failures"] += 1
+
+            result_queue.put(("result", index, automation.build_task_audit(task_info, sender_data)))
+
+    except Exception as e:
+        logger.error(f"[POOL] Worker {worker_id} stopped: {str(e)}")
+        stats["error"] = str(e)
+    finally:
+        if automation.driver:
+            automation.driver.quit()
+        result_queue.put(("stats", worker_id, stats))
+
+
+def run_driver_pool(tasks_data, session, workers, automation_options, recycle_after=50, on_result=None):
+    """
+    Audit tasks across a pool of Chrome worker processes
+
+    Args:
+        tasks_data (list): {task_id, complete_time, status} dicts to audit
+        session (dict): Snapshot from spx_session.snapshot_session after login
+        workers (int): Number of Chrome worker processes
+        automation_options (dict): Keyword arguments for each worker's SPXAuditAutomationFixed
+        recycle_after (int): Restart a worker's Chrome after this many tasks (0 to never recycle)
+        on_result (callable): Called as on_result(index, task_audit) in the parent as results arrive
+
+    Tasks left unprocessed by a worker that stopped or died are returned as ERROR
+    audits (and passed to on_result) so they count as failures, not as audited
+
+    Returns:
+        tuple: (task audits in original task order, per-worker stats)
+    """
+    from spx_audit_automation import SPXAuditAutomationFixed
+
+    workers = max(1, min(workers, len(tasks_data)))
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+
+    indexed = list(enumerate(tasks_data))
+    processes = []
+    for worker_id in range(workers):
+        shard = indexed[worker_id::workers]
+        process = context.Process(
+            target=_pool_worker,
+            args=(worker_id + 1, shard, session, automation_options, recycle_after, result_queue),
+            name=f"spx-worker-{worker_id + 1}",
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+        logger.info(f"[POOL] Worker {worker_id + 1} started with {len(shard)} tasks")
+
+    started = time.time()
+    results = {}
+    worker_stats = {}
+
+    while len(worker_stats) < workers:
+        try:
+            message = result_queue.get(timeout=5)
+        except queue.Empty:
+            # A worker that died without reporting would otherwise block forever
+            dead = [p for p in processes if not p.is_alive() and p.exitcode not in (0, None)]
+            if len(dead) + len(worker_stats) >= workers and result_queue.empty():
+                break
+            continue
+
+        if message[0] == "result":
+            _, index, task_audit = message
+            results[index] = task_audit
+            if on_result:
+                on_result(index, task_audit)
+        else:
+            _, worker_id, stats = message
+            worker_stats[worker_id] = stats
+
+    for process in processes:
+        process.join(timeout=10)
+
+    # The rest of a stopped worker's shard was never audited
+    for index, task_info in indexed:
+        if index in results:
+            continue
+        worker_id = index % workers + 1
+        stats = worker_stats.setdefault(worker_id, {
+            "worker": worker_id, "tasks": 0, "failures": 0, "recycles": 0, "busy_seconds": 0.0,
+            "error": f"exited with code {processes[worker_id - 1].exitcode} without reporting"
+        })
+        stats["failures"] += 1
+        stats["unprocessed"] = stats.get("unprocessed", 0) + 1
+        results[index] = SPXAuditAutomationFixed.build_task_audit(task_info, {"ERROR": 0})
+        if on_result:
+            on_result(index, results[index])
+
+    elapsed = time.time() - started
+    for worker_id in sorted(worker_stats):
+        stats = worker_stats[worker_id]
+        throughput = stats["tasks"] / stats["busy_seconds"] * 60 if stats["busy_seconds"] else 0
+        logger.info(f"[POOL] Worker {worker_id}: {stats['tasks']} tasks, {throughput:.1f} tasks/min, "
+                    f"{stats['failures']} failures, {stats['recycles']} browser recycles")
+        if stats.get("unprocessed"):
+            logger.error(f"[POOL] Worker {worker_id} stopped ({stats.get('error')}); "
+                         f"{stats['unprocessed']} of its tasks were recorded as ERROR")
+    logger.info(f"[POOL] {len(tasks_data)} tasks handled by {workers} workers in {elapsed:.1f}s")
+
+    return [results[index] for index in sorted(results)], worker_stats
@@ -0,0 +1,392 @@
+"""
+SPX Exporters - Streaming writers for the audit output files
+Each task audit is written to the JSON, CSV and Excel files as soon as the task
+finishes, so memory stays flat over long runs and completed tasks are on disk
+straight away. The files keep the layout of the original pandas exports: an
+indented JSON array of task audits, one CSV row per task and sender, and an
+Excel workbook with Detailed_Data and Task_Summary sheets.
+
+Each task is flattened once and the rows are shared by all writers, which run on
+their own threads so the slow Excel writer never holds up the run; the workbook
+can even be finished in the background after the JSON and CSV are durable.
+
+With pyarrow installed, the detail rows are also written as typed Parquet files
+partitioned by completion day (output/parquet/complete_date=YYYY-MM-DD/), so
+later analysis reads only the days and columns it needs. Runs only ever add files,
+so a task that is audited again (--refresh, or a retry after a failure) appears
+once per audit: readers keep, per receive_task_id, the rows with the newest
+processed_at. Failed tasks (ERROR/NO_DATA placeholders) are left out of the
+dataset, and tasks reloaded by --resume are not added a second time.
+"""
+
+import csv
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from spx_extractors import parse_complete_time
+from spx_ledger import audit_failed
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, the Parquet export is skipped without it
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# One row per task and sender (CSV and the Detailed_Data sheet)
+DETAIL_COLUMNS = ("receive_task_id", "complete_time", "status", "sender_id", "tracking_count",
+                  "total_task_quantity", "sender_count", "processed_at")
+
+# One row per task (Task_Summary sheet)
+SUMMARY_COLUMNS = ("receive_task_id", "complete_time", "status", "total_senders", "total_tracking_numbers",
+                   "processed_at")
+
+
+def flatten_task(task):
+    """Detail rows (tuples in DETAIL_COLUMNS order) of one task audit"""
+    return [
+        (task["receive_task_id"], task["complete_time"], task["status"], sender_id, quantity,
+         task["total_quantity"], task["sender_count"], task["processed_at"])
+        for sender_id, quantity in task["sender_data"].items()
+    ]
+
+
+def summarize_task(task):
+    """Summary row (tuple in SUMMARY_COLUMNS order) of one task audit"""
+    return (task["receive_task_id"], task["complete_time"], task["status"], len(task["sender_data"]),
+            task["total_quantity"], task["processed_at"])
+
+
+class JsonArrayWriter:
+    """Writes task audits as the elements of an indented JSON array, same bytes as json.dump(indent=2)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write("[")
+
+    def write(self, task, rows=None):
+        element = json.dumps(task, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self._file.write(("," if self.count else "") + "\n  " + element)
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n]" if self.count else "]")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        return self.count
+
+
+class CsvRowWriter:
+    """Appends one row per task and sender, formatted like DataFrame.to_csv(index=False)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file, lineterminator=os.linesep)
+
+    def write(self, task, rows=None):
+        rows = flatten_task(task) if rows is None else rows
+        if rows and not self.count:
+            self._writer.writerow(DETAIL_COLUMNS)
+        self._writer.writerows(rows)
+        self._file.flush()
+        self.count += len(rows)
+
+    def close(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        return self.count
+
+
+class ExcelStreamWriter:
+    """Builds the Detailed_Data and Task_Summary sheets in openpyxl's constant-memory write-only mode"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._workbook = Workbook(write_only=True)
+        self._detailed = self._workbook.create_sheet("Detailed_Data")
+        self._summary = self._workbook.create_sheet("Task_Summary")
+        self._detail_rows = 0
+
+    def write(self, task, rows=None):
+        rows = flatten_task(task) if rows is None else rows
+        if rows and not self._detail_rows:
+            self._detailed.append(DETAIL_COLUMNS)
+        for row in rows:
+            self._detailed.append(row)
+        self._detail_rows += len(rows)
+
+        if not self.count:
+            self._summary.append(SUMMARY_COLUMNS)
+        self._summary.append(summarize_task(task))
+        self.count += 1
+
+    def close(self):
+        if self.count:
+            # The detail sheet is left out when no task had senders, as before
+            if not self._detail_rows:
+                self._workbook.remove(self._detailed)
+            self._workbook.save(self.path)
+        return self.count
+
+
+def parquet_schema():
+    """Typed columns of the Parquet export; complete_date is the partition column"""
+    return pa.schema([
+        ("receive_task_id", pa.dictionary(pa.int32(), pa.string())),
+        ("complete_time", pa.timestamp("s")),
+        ("status", pa.dictionary(pa.int8(), pa.string())),
+        ("sender_id", pa.int64()),
+        ("tracking_count", pa.int32()),
+        ("total_task_quantity", pa.int32()),
+        ("sender_count", pa.int32()),
+        ("processed_at", pa.timestamp("us")),
+        ("complete_date", pa.string()),
+    ])
+
+
+class ParquetPartitionWriter:
+    """Writes the detail rows as Parquet files partitioned by completion day (hive-style complete_date=...)"""
+
+    def __init__(self, root, run_id, chunk_rows=50000):
+        """
+        Args:
+            root (str): Dataset folder shared by all runs, e.g. output/parquet
+            run_id (str): Prefix of this run's files inside each day's partition
+            chunk_rows (int): Rows buffered before they are written out
+        """
+        if pa is None:
+            raise ImportError("pyarrow is not installed")
+        self.path = root
+        self.run_id = run_id
+        self.chunk_rows = chunk_rows
+        self.count = 0
+        self._chunks = 0
+        self._schema = parquet_schema()
+        self._columns = {name: [] for name in self._schema.names}
+
+    def write(self, task, rows=None):
+        # The dataset holds real counts only; placeholders would add up as data
+        if audit_failed(task):
+            return
+        rows = flatten_task(task) if rows is None else rows
+        completed = parse_complete_time(task["complete_time"])
+        try:
+            processed = datetime.fromisoformat(task["processed_at"])
+        except (TypeError, ValueError):
+            processed = None
+
+        for receive_task_id, _, status, sender_id, quantity, total, senders, _ in rows:
+            columns = self._columns
+            columns["receive_task_id"].append(receive_task_id)
+            columns["complete_time"].append(completed)
+            columns["status"].append(status)
+            # Placeholder senders (ERROR, UNKNOWN_SENDER) have no numeric ID
+            columns["sender_id"].append(int(sender_id) if str(sender_id).isdigit() else None)
+            columns["tracking_count"].append(quantity)
+            columns["total_task_quantity"].append(total)
+            columns["sender_count"].append(senders)
+            columns["processed_at"].append(processed)
+            columns["complete_date"].append(completed.strftime('%Y-%m-%d') if completed else None)
+
+        self.count += len(rows)
+        if len(self._columns["receive_task_id"]) >= self.chunk_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._columns["receive_task_id"]:
+            return
+        table = pa.table(self._columns, schema=self._schema)
+        pq.write_to_dataset(table, self.path, partition_cols=["complete_date"],
+                            basename_template=f"{self.run_id}-{self._chunks}-{{i}}.parquet",
+                            existing_data_behavior="overwrite_or_ignore")
+        self._chunks += 1
+        self._columns = {name: [] for name in self._schema.names}
+
+    def close(self):
+        self._flush()
+        return self.count
+
+
+class _WriterThread:
+    """Feeds one writer from its own bounded queue on a background thread"""
+
+    def __init__(self, kind, writer, backlog=1000):
+        self.kind = kind
+        self.writer = writer
+        self.written = None
+        self._queue = queue.Queue(maxsize=backlog)
+        # Not a daemon: a deferred workbook is still finished if the main thread exits first
+        self._thread = threading.Thread(target=self._run, name=f"spx-export-{kind}")
+        self._thread.start()
+
+    def put(self, task, rows):
+        self._queue.put((task, rows))
+
+    def finish(self):
+        self._queue.put(None)
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            task, rows = item
+            try:
+                self.writer.write(task, rows)
+            except Exception as e:
+                logger.error(f"[EXPORT] Could not write task {task['receive_task_id']} to {self.kind}: {str(e)}")
+
+        try:
+            self.written = self.writer.close()
+        except Exception as e:
+            logger.error(f"[EXPORT] Error finishing {self.kind} export: {str(e)}")
+            self.written = 0
+
+        if self.written:
+            logger.info(f"Data exported to {self.writer.path}")
+        else:
+            if os.path.isfile(self.writer.path):
+                os.remove(self.writer.path)
+            logger.warning(f"No data to export to {self.kind.upper()}")
+
+
+class AuditExportSink:
+    def __init__(self, output_dir, base_filename, timestamp, defer_excel=False, parquet=True):
+        """
+        Open the JSON, CSV and Excel files of one run
+
+        Args:
+            output_dir (str): Folder the files are written to
+            base_filename (str): File name prefix, e.g. 'spx_audit_data'
+            timestamp (str): Run timestamp appended to the prefix
+            defer_excel (bool): Let close() return once the JSON and CSV are durable while
+                the workbook is still being finished in the background
+            parquet (bool): Also write the day-partitioned Parquet dataset (needs pyarrow)
+        """
+        stem = os.path.join(output_dir, f"{base_filename}_{timestamp}")
+        self.defer_excel = defer_excel
+        # Open every file before starting any writer thread
+        writers = {
+            "json": JsonArrayWriter(f"{stem}.json"),
+            "csv": CsvRowWriter(f"{stem}.csv"),
+            "xlsx": ExcelStreamWriter(f"{stem}.xlsx"),
+        }
+        if parquet and pa is not None:
+            writers["parquet"] = ParquetPartitionWriter(os.path.join(output_dir, "parquet"), f"{base_filename}_{timestamp}")
+        elif parquet:
+            logger.info("[EXPORT] pyarrow is not installed, skipping the Parquet export")
+        self.writers = {kind: _WriterThread(kind, writer) for kind, writer in writers.items()}
+        self.task_count = 0
+        # Tasks that finished ahead of an earlier index, held back to keep the files in task order
+        self._held = {}
+        self._next_index = 0
+        self.closed = False
+        self.success = False
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self):
+        return [writer_thread.writer.path for writer_thread in self.writers.values()]
+
+    @property
+    def pending(self):
+        """Writers still finishing their file in the background"""
+        return [kind for kind, writer_thread in self.writers.items() if writer_thread.written is None]
+
+    def write(self, task, index=None, resumed=False):
+        """
+        Flatten one finished task audit once and hand it to every writer (safe to call from worker threads)
+
+        Args:
+            task (dict): Finished task audit
+            index (int): Position of the task in the run's task list; tasks that finish out of order
+                are held back until every earlier index is written or skipped, so the files list
+                tasks in task order. Without an index the task is written straight away
+            resumed (bool): The task was reloaded from an interrupted run's checkpoint; it goes to
+                this run's files but not to the Parquet dataset, which already holds it
+        """
+        rows = flatten_task(task)
+        with self._lock:
+            if self.closed:
+                return
+            if index is None:
+                self._put(task, rows, skip_dataset=resumed)
+                return
+            self._held[index] = (task, rows)
+            self._release()
+
+    def skip(self, index):
+        """Mark a task index that will never be written, releasing the tasks held behind it"""
+        with self._lock:
+            if self.closed:
+                return
+            self._held[index] = None
+            self._release()
+
+    def _put(self, task, rows, skip_dataset=False):
+        for kind, writer_thread in self.writers.items():
+            if not (skip_dataset and kind == "parquet"):
+                writer_thread.put(task, rows)
+        self.task_count += 1
+
+    def _release(self):
+        """Write held tasks for as long as the next index in order is available"""
+        while self._next_index in self._held:
+            held = self._held.pop(self._next_index)
+            self._next_index += 1
+            if held is not None:
+                self._put(*held)
+
+    def close(self, wait=True):
+        """
+        Finish all files; a run without any task leaves no files behind, as before
+
+        Args:
+            wait (bool): Also wait for a deferred workbook (ignored unless defer_excel is set)
+
+        Returns:
+            bool: True if every file that was waited for was written
+        """
+        with self._lock:
+            if not self.closed:
+                # An interrupted run never fills its gaps; what was held back is written in index order
+                for index in sorted(self._held):
+                    if self._held[index] is not None:
+                        self._put(*self._held[index])
+                self._held = {}
+                self.closed = True
+                for writer_thread in self.writers.values():
+                    writer_thread.finish()
+
+        waited = [kind for kind in self.writers if wait or not self.defer_excel or kind != "xlsx"]
+        for kind in waited:
+            self.writers[kind].join()
+        if "xlsx" not in waited and self.writers["xlsx"].written is None:
+            logger.info("[EXPORT] Excel workbook is being finished in the background")
+
+        self.success = all(self.writers[kind].written for kind in waited)
+        return self.success
+
+    def wait(self):
+        """Block until every file, including a deferred workbook, is finished"""
+        return self.close(wait=True)
@@ -0,0 +1,643 @@
+"""
+SPX Extractors - Browser-side snapshot scripts and pure-Python row parsing
+Keeps the column rules for SPX tables in one place so every extraction
+engine (per-element DOM walk, JS snapshot, HTML parse) counts tracking numbers the same way
+"""
+
+import logging
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional, the standard library parser is used instead
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+DONE_WORDS = ('done', 'completed', 'success', 'finished')
+PENDING_WORDS = ('pending', 'processing', 'in progress', 'running')
+FAILED_WORDS = ('failed', 'error', 'cancelled')
+
+# Class fragments that mark a status badge inside a task row
+STATUS_CLASS_HINTS = ('status', 'success', 'fail', 'pending')
+
+# Returns every row of every table body as a plain array of cell texts in one round-trip
+TABLE_SNAPSHOT_JS = """
+const rows = document.querySelectorAll('table tbody tr');
+return Array.from(rows, function (tr) {
+    return Array.from(tr.querySelectorAll('td'), function (td) {
+        return (td.innerText || td.textContent || '').trim();
+    });
+});
+"""
+
+
+def is_sender_id(text):
+    """Sender IDs are purely numeric and at least 8 digits long (e.g. 1257601721)"""
+    return text.isdigit() and len(text) >= 8
+
+
+def is_tracking_number(text):
+    """SPX tracking numbers start with PH (e.g. PH251249207504S)"""
+    return text.startswith('PH') and len(text) >= 10
+
+
+def parse_tracking_rows(rows):
+    """
+    Group tracking numbers by sender ID from a table snapshot
+
+    Args:
+        rows (list): One list of stripped cell texts per table row
+
+    Returns:
+        dict: sender_id -> list of tracking numbers, in row order
+    """
+    tracking_data = {}
+
+    for row_idx, cells in enumerate(rows):
+        # Need at least Sender ID, SPX Tracking Number, and other columns
+        if len(cells) < 3:
+            continue
+
+        # Column 1: Sender ID, Column 3: SPX Tracking Number
+        sender_id = cells[0] if is_sender_id(cells[0]) else None
+        tracking_number = cells[2] if is_tracking_number(cells[2]) else None
+
+        if sender_id and tracking_number:
+            tracking_data.setdefault(sender_id, []).append(tracking_number)
+            logger.debug(f"Row {row_idx}: Sender {sender_id} -> Tracking {tracking_number}")
+        else:
+            logger.debug(f"Row {row_idx}: Incomplete data - {cells[:5]}")
+
+    return tracking_data
+
+
+# Walks the task table rows in the browser and classifies each row's status there,
+# returning one {task_id, complete_time, status} object per receive task row
+TASK_ROWS_JS = """
+const DONE_WORDS = ['done', 'completed', 'success', 'finished'];
+const PENDING_WORDS = ['pending', 'processing', 'in progress', 'running'];
+const FAILED_WORDS = ['failed', 'error', 'cancelled'];
+const TIME_PATTERN = /\\d{4}-\\d{2}-\\d{2}/;
+
+function textOf(el) {
+    return (el.innerText || el.textContent || '').trim();
+}
+
+function hasAny(text, words) {
+    return words.some(function (word) { return text.indexOf(word) !== -1; });
+}
+
+const tasks = [];
+document.querySelectorAll('table tbody tr').forEach(function (tr) {
+    const cells = Array.from(tr.querySelectorAll('td'), textOf);
+    const taskId = cells.find(function (text) { return text.startsWith('DRT') && text.length >= 10; });
+    if (!taskId) {
+        return;
+    }
+
+    let completeTime = 'N/A';
+    let status = 'Unknown';
+
+    // Extract time and status from row cells (later cells win, as in the per-element walk)
+    cells.forEach(function (text) {
+        const lower = text.toLowerCase();
+        if (TIME_PATTERN.test(text) || text.indexOf(':') !== -1) {
+            completeTime = text;
+        }
+        if (hasAny(lower, DONE_WORDS)) {
+            status = 'Done';
+        } else if (hasAny(lower, PENDING_WORDS)) {
+            status = 'Pending';
+        } else if (hasAny(lower, FAILED_WORDS)) {
+            status = 'Failed';
+        }
+    });
+
+    // Status badges identified by CSS class take precedence over cell text
+    const badges = tr.querySelectorAll("[class*='status'], [class*='success'], [class*='fail'], [class*='pending']");
+    for (const badge of badges) {
+        const cls = badge.getAttribute('class') || '';
+        const text = textOf(badge).toLowerCase();
+        if (cls.indexOf('success') !== -1 || text.indexOf('done') !== -1 || text.indexOf('completed') !== -1) {
+            status = 'Done';
+            break;
+        } else if (cls.indexOf('fail') !== -1 || text.indexOf('error') !== -1 || text.indexOf('failed') !== -1) {
+            status = 'Failed';
+            break;
+        } else if (cls.indexOf('pending') !== -1 || text.indexOf('processing') !== -1 || text.indexOf('running') !== -1) {
+            status = 'Pending';
+            break;
+        }
+    }
+
+    tasks.push({task_id: taskId, complete_time: completeTime, status: status});
+});
+return tasks;
+"""
+
+
+def looks_like_complete_time(text):
+    """Completion times render as 'YYYY-MM-DD HH:MM:SS'; any dated or clock-like text qualifies"""
+    return bool(re.search(r'\d{4}-\d{2}-\d{2}', text)) or ":" in text
+
+
+def parse_complete_time(text):
+    """
+    Parse a completion time as rendered in the task list ('YYYY-MM-DD HH:MM:SS')
+
+    Returns:
+        datetime: The parsed time (midnight for a bare date), or None if the text holds no date
+    """
+    match = re.search(r'(\d{4}-\d{2}-\d{2})(?:[ T](\d{2}:\d{2})(:\d{2})?)?', text or "")
+    if not match:
+        return None
+    date, clock, seconds = match.groups()
+    try:
+        return datetime.strptime(f"{date} {clock or '00:00'}{seconds or ':00'}", '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def page_older_than(rows, bound):
+    """
+    Whether a task list page holds only tasks completed before bound
+
+    Rows without a readable completion time (e.g. pending tasks) are ignored; a page
+    with no readable times at all is never considered older
+    """
+    times = [parse_complete_time(row["complete_time"]) for row in rows]
+    times = [completed for completed in times if completed is not None]
+    return bool(times) and all(completed < bound for completed in times)
+
+
+def split_task_rows(rows):
+    """
+    Dedupe task rows by task ID and split them by status in a single pass
+
+    Args:
+        rows (list): {task_id, complete_time, status} dicts in page order
+
+    Returns:
+        tuple: (Done tasks, skipped non-Done tasks), first occurrence of each ID wins
+    """
+    tasks_data = []
+    skipped_tasks = []
+    seen = set()
+
+    for row in rows:
+        if row["task_id"] in seen:
+            continue
+        seen.add(row["task_id"])
+
+        if row["status"] == "Done":
+            tasks_data.append(row)
+        else:
+            skipped_tasks.append(row)
+
+    return tasks_data, skipped_tasks
+
+
+def merge_task_pages(pages):
+    """
+    Merge task list pages scanned out of order into one deduplicated manifest
+
+    Args:
+        pages (dict): page number -> (Done tasks, skipped tasks) as returned per page
+
+    Returns:
+        tuple: (Done tasks, skipped non-Done tasks) in page order; a task that shifted
+            onto the next page while the list was being scanned is kept once
+    """
+    rows = []
+    for page in sorted(pages):
+        tasks_data, skipped_tasks = pages[page]
+        rows.extend(tasks_data)
+        rows.extend(skipped_tasks)
+    return split_task_rows(rows)
+
+
+# Returns the outerHTML of every table on the page so it can be parsed offline in one round-trip
+TABLES_HTML_JS = """
+return Array.from(document.querySelectorAll('table'), function (table) {
+    return table.outerHTML;
+}).join('\\n');
+"""
+
+
+def _normalize_text(text):
+    """Collapse whitespace the way rendered cell text reads"""
+    return " ".join(text.split())
+
+
+def classify_task_row(cells, badges):
+    """
+    Build a task row from parsed cell texts and status badges (mirrors TASK_ROWS_JS)
+
+    Args:
+        cells (list): Cell texts of one table row
+        badges (list): (class attribute, text) pairs of status-like elements in the row
+
+    Returns:
+        dict: {task_id, complete_time, status}, or None if the row has no task ID
+    """
+    task_id = next((text for text in cells if text.startswith('DRT') and len(text) >= 10), None)
+    if not task_id:
+        return None
+
+    complete_time = "N/A"
+    status = "Unknown"
+
+    for text in cells:
+        lower = text.lower()
+        if looks_like_complete_time(text):
+            complete_time = text
+        if any(word in lower for word in DONE_WORDS):
+            status = "Done"
+        elif any(word in lower for word in PENDING_WORDS):
+            status = "Pending"
+        elif any(word in lower for word in FAILED_WORDS):
+            status = "Failed"
+
+    for badge_class, badge_text in badges:
+        badge_text = badge_text.lower()
+        if "success" in badge_class or "done" in badge_text or "completed" in badge_text:
+            status = "Done"
+            break
+        elif "fail" in badge_class or "error" in badge_text or "failed" in badge_text:
+            status = "Failed"
+            break
+        elif "pending" in badge_class or "processing" in badge_text or "running" in badge_text:
+            status = "Pending"
+            break
+
+    return {"task_id": task_id, "complete_time": complete_time, "status": status}
+
+
+class _TableRowParser(HTMLParser):
+    """Standard library fallback that collects tbody rows, cell texts and status badges"""
+
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._tbody_depth = 0
+        self._row = None
+        self._open = []  # (tag, collector) for elements open inside the current row
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tbody':
+            self._tbody_depth += 1
+            return
+        if not self._tbody_depth:
+            return
+        if tag == 'tr':
+            self._row = {"cells": [], "badges": []}
+            self._open = []
+            return
+        if self._row is None:
+            return
+        if tag in self.VOID_TAGS:
+            if tag == 'br':
+                self.handle_data(" ")
+            return
+
+        collector = None
+        css_class = dict(attrs).get('class') or ''
+        if tag == 'td':
+            collector = {"kind": "cell", "parts": []}
+        elif any(hint in css_class for hint in STATUS_CLASS_HINTS):
+            collector = {"kind": "badge", "class": css_class, "parts": []}
+        self._open.append((tag, collector))
+
+    def handle_endtag(self, tag):
+        if tag == 'tbody':
+            self._tbody_depth = max(0, self._tbody_depth - 1)
+            return
+        if self._row is None:
+            return
+        if tag == 'tr':
+            self.rows.append(self._row)
+            self._row = None
+            return
+
+        # Close up to the matching open tag, tolerating unclosed children
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                for _, collector in reversed(self._open[index:]):
+                    self._finish(collector)
+                del self._open[index:]
+                break
+
+    def handle_data(self, data):
+        for _, collector in self._open:
+            if collector is not None:
+                collector["parts"].append(data)
+
+    def _finish(self, collector):
+        if collector is None:
+            return
+        text = _normalize_text("".join(collector["parts"]))
+        if collector["kind"] == "cell":
+            self._row["cells"].append(text)
+        else:
+            self._row["badges"].append((collector["class"], text))
+
+
+def parse_table_html(html):
+    """
+    Parse table body rows out of page or table HTML
+
+    Args:
+        html (str): driver.page_source, a table's outerHTML, or a saved fixture
+
+    Returns:
+        list: One {cells, badges} dict per tbody row
+    """
+    if not html or not html.strip():
+        return []
+
+    if lxml_html is not None:
+        document = lxml_html.fromstring(html)
+        # text_content() drops <br>, where innerText (and the fallback parser) break the text
+        for br in document.iter('br'):
+            br.tail = " " + (br.tail or "")
+        rows = []
+        for tr in document.xpath('//tbody//tr'):
+            cells = [_normalize_text(td.text_content()) for td in tr.xpath('.//td')]
+            badges = [
+                (element.get('class') or '', _normalize_text(element.text_content()))
+                for element in tr.xpath('.//*[@class]')
+                if any(hint in element.get('class') for hint in STATUS_CLASS_HINTS)
+            ]
+            rows.append({"cells": cells, "badges": badges})
+        return rows
+
+    parser = _TableRowParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+def parse_tracking_html(html):
+    """Group tracking numbers by sender ID from page or table HTML"""
+    return parse_tracking_rows([row["cells"] for row in parse_table_html(html)])
+
+
+def parse_task_rows_html(html):
+    """Extract {task_id, complete_time, status} rows from task list HTML"""
+    rows = []
+    for row in parse_table_html(html):
+        task = classify_task_row(row["cells"], row["badges"])
+        if task:
+            rows.append(task)
+    return rows
+
+
+# Key fragments used to pick fields out of SPX API records, most specific first
+SENDER_ID_KEY_HINTS = ('sender_id', 'shop_id', 'seller_id', 'sender', 'shop', 'seller')
+COMPLETE_TIME_KEY_HINTS = ('complete_time', 'completed_time', 'finish_time', 'complete', 'finish')
+TOTAL_KEY_NAMES = ('total', 'total_count', 'count')
+
+TASK_ID_PATTERN = re.compile(r'^DRT\w{7,}$')
+TRACKING_NUMBER_PATTERN = re.compile(r'^PH\w{8,}$')
+
+
+def iter_record_lists(payload):
+    """Yield every list of dict records nested anywhere in a JSON payload"""
+    if isinstance(payload, list):
+        if payload and all(isinstance(item, dict) for item in payload):
+            yield payload
+        for item in payload:
+            yield from iter_record_lists(item)
+    elif isinstance(payload, dict):
+        for value in payload.values():
+            yield from iter_record_lists(value)
+
+
+def _find_field(record, key_hints, accept):
+    """Return the first value whose key matches a hint (in hint order) and passes accept()"""
+    for hint in key_hints:
+        for key, value in record.items():
+            if hint in key.lower() and accept(value):
+                return value
+    return None
+
+
+def _format_api_time(value):
+    """API times arrive as unix seconds/milliseconds or strings; render them like the UI does"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return "N/A"
+
+
+def _classify_status_value(record):
+    """Classify a task status from the textual status fields of an API record"""
+    for key, value in record.items():
+        if 'status' in key.lower() and isinstance(value, str):
+            lower = value.lower()
+            if any(word in lower for word in DONE_WORDS):
+                return "Done"
+            if any(word in lower for word in PENDING_WORDS):
+                return "Pending"
+            if any(word in lower for word in FAILED_WORDS):
+                return "Failed"
+    return "Unknown"
+
+
+def find_total(payload):
+    """Return the total record count advertised by a list payload, if any"""
+    if isinstance(payload, dict):
+        for name in TOTAL_KEY_NAMES:
+            value = payload.get(name)
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+        for value in payload.values():
+            total = find_total(value)
+            if total is not None:
+                return total
+    return None
+
+
+def decode_task_records(payload):
+    """
+    Decode receive tasks from an SPX task list API payload by field name rather than column position
+
+    Returns:
+        list: {task_id, complete_time, status} rows, or an empty list if the payload holds no tasks
+    """
+    for records in iter_record_lists(payload):
+        rows = []
+        for record in records:
+            task_id = next((value for value in record.values()
+                            if isinstance(value, str) and TASK_ID_PATTERN.match(value)), None)
+            if not task_id:
+                continue
+            complete_time = _find_field(record, COMPLETE_TIME_KEY_HINTS, lambda value: value not in (None, "", 0))
+            rows.append({
+                "task_id": task_id,
+                "complete_time": _format_api_time(complete_time),
+                "status": _classify_status_value(record)
+            })
+        if rows:
+            return rows
+    return []
+
+
+def decode_tracking_records(payload):
+    """
+    Decode tracking numbers grouped by sender ID from an SPX task detail API payload
+
+    Returns:
+        dict: sender_id -> list of tracking numbers, empty if the payload holds no parcels
+    """
+    def is_sender_value(value):
+        return (isinstance(value, int) and not isinstance(value, bool) and value > 0) or \
+            (isinstance(value, str) and is_sender_id(value))
+
+    for records in iter_record_lists(payload):
+        tracking_data = {}
+        for record in records:
+            tracking_number = next((value for value in record.values()
+                                    if isinstance(value, str) and TRACKING_NUMBER_PATTERN.match(value)), None)
+            sender_id = _find_field(record, SENDER_ID_KEY_HINTS, is_sender_value)
+            if tracking_number and sender_id is not None:
+                tracking_data.setdefault(str(sender_id), []).append(tracking_number)
+        if tracking_data:
+            return tracking_data
+    return {}
+
+
+# Readiness snapshot of the current tab: table row count, first row key and active pager item
+# (a number, like the page numbers it is compared with)
+PAGE_STATE_JS = """
+const rows = document.querySelectorAll('table tbody tr');
+const active = document.querySelector('li.pager-item.active');
+return {
+    url: window.location.href,
+    ready_state: document.readyState,
+    rows: rows.length,
+    first_row: rows.length ? (rows[0].innerText || rows[0].textContent || '').trim() : '',
+    active_page: active ? parseInt(active.textContent.trim(), 10) : null
+};
+"""
+
+# Clicks the pager item after the active one (or the single-step next button) without waiting;
+# returns false when already on the last page
+CLICK_NEXT_PAGE_JS = """
+const items = Array.from(document.querySelectorAll('li.pager-item'));
+const active = items.find(function (li) { return li.classList.contains('active'); });
+const current = active ? parseInt(active.textContent.trim(), 10) : NaN;
+const pages = items.map(function (li) { return parseInt(li.textContent.trim(), 10); })
+    .filter(function (page) { return !isNaN(page); });
+const maxPage = pages.length ? Math.max.apply(null, pages) : 0;
+const nextButton = document.querySelector("span.pager-next:not([class*='disabled'])");
+
+if (!isNaN(current) && current >= maxPage) {
+    return false;
+}
+const target = items.find(function (li) { return li.textContent.trim() === String(current + 1); });
+if (target) {
+    target.click();
+    return true;
+}
+if (nextButton) {
+    nextButton.click();
+    return true;
+}
+return false;
+"""
+
+
+# "Total N" and "N / Page" read from the pager in one call
+PAGER_INFO_JS = """
+function firstMatch(xpath, pattern) {
+    const nodes = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < nodes.snapshotLength; i++) {
+        const match = pattern.exec((nodes.snapshotItem(i).textContent || '').trim());
+        if (match) {
+            return parseInt(match[1], 10);
+        }
+    }
+    return null;
+}
+const active = document.querySelector('li.pager-item.active');
+return {
+    total: firstMatch("//*[contains(text(), 'Total')]", /Total\\s+(\\d+)/),
+    page_size: firstMatch("//*[contains(text(), '/ Page')]", /(\\d+)\\s*\\/\\s*Page/),
+    active_page: active ? parseInt(active.textContent.trim(), 10) : null
+};
+"""
+
+# Opens the "N / Page" page-size selector
+OPEN_PAGE_SIZE_SELECTOR_JS = """
+const nodes = document.evaluate("//*[contains(text(), '/ Page')]", document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+if (!nodes.snapshotLength) {
+    return false;
+}
+nodes.snapshotItem(0).click();
+return true;
+"""
+
+# Once the selector's options are rendered, clicks the largest "N / Page" option.
+# Returns the chosen size, or null while the dropdown has not rendered yet
+PICK_LARGEST_PAGE_SIZE_JS = """
+const current = arguments[0];
+const nodes = document.evaluate("//*[contains(text(), '/ Page')]", document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+let best = null;
+let bestSize = 0;
+for (let i = 0; i < nodes.snapshotLength; i++) {
+    const node = nodes.snapshotItem(i);
+    const match = /(\\d+)\\s*\\/\\s*Page/.exec((node.textContent || '').trim());
+    if (match && parseInt(match[1], 10) > bestSize) {
+        bestSize = parseInt(match[1], 10);
+        best = node;
+    }
+}
+if (nodes.snapshotLength < 2) {
+    return null;
+}
+if (bestSize > current) {
+    best.click();
+}
+return bestSize;
+"""
+
+# Login-completion snapshot: where the tab is and whether the app's navigation menu
+# (only rendered for a logged-in user) links to the receive-task page
+LOGIN_STATE_JS = """
+const menuLink = Array.from(document.querySelectorAll("a[href*='receive-task'], [class*='menu'] a, [class*='menu'] li"))
+    .some(function (element) {
+        const href = element.getAttribute('href') || '';
+        const text = (element.innerText || element.textContent || '').trim().toLowerCase();
+        return href.indexOf('receive-task') !== -1 || text === 'receive task';
+    });
+return {url: window.location.href, menu: menuLink};
+"""
+
+# Jumps straight to page arguments[0] through the pager's own jump-to-page input,
+# so the app's router loads that page without clicking through the ones before it
+GOTO_PAGE_JS = """
+const page = String(arguments[0]);
+const input = document.querySelector("input[class*='jumper-input'], [class*='jumper-input'] input");
+if (!input) {
+    return false;
+}
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+setValue.call(input, page);
+input.dispatchEvent(new Event('input', {bubbles: true}));
+input.dispatchEvent(new Event('change', {bubbles: true}));
+const button = document.querySelector("button[class*='jumper-button']");
+if (button) {
+    button.click();
+} else {
+    input.dispatchEvent(new KeyboardEvent('keydown', {key: 'Enter', keyCode: 13, bubbles: true}));
+}
+return true;
+"""
@@ -0,0 +1,258 @@
+"""
+SPX HTTP Client - Browserless fetch engine reusing the Selenium login session
+Fetches the receive task list and task details straight from SPX's backend
+endpoints over a pooled keep-alive session instead of rendering pages, either
+one task at a time or many concurrently under a bounded asyncio pipeline
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from spx_extractors import decode_task_records, decode_tracking_records, find_total
+
+logger = logging.getLogger(__name__)
+
+SPX_BASE_URL = os.getenv("SPX_BASE_URL", "https://sp.spx.shopee.ph")
+
+# Backend endpoints behind the receive task pages. Capture mode records the real
+# ones it sees (automation.api_endpoints), which take precedence over these defaults
+DEFAULT_API_PATHS = {
+    "task_list": os.getenv("SPX_TASK_LIST_API", "/sp-api/inbound/receive_task/list"),
+    "task_detail": os.getenv("SPX_TASK_DETAIL_API", "/sp-api/inbound/receive_task/detail"),
+}
+
+# Query parameter names used by the list and detail endpoints, overridable like the paths
+PAGE_PARAM = os.getenv("SPX_PAGE_PARAM", "pageno")
+PAGE_SIZE_PARAM = os.getenv("SPX_PAGE_SIZE_PARAM", "count")
+TASK_ID_PARAM = os.getenv("SPX_TASK_ID_PARAM", "receive_task_id")
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class SPXApiError(Exception):
+    """Raised when an SPX endpoint answers with a non-zero retcode or a non-JSON body"""
+
+
+class RateLimiter:
+    """Thread-safe per-host request spacing: at most `rate` requests per second to each host"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def acquire(self, host):
+        """Block until the next request slot for this host"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SPXHttpClient:
+    def __init__(self, base_url=SPX_BASE_URL, cookies=None, headers=None, api_paths=None,
+                 pool_size=10, timeout=15, rate_limit=None):
+        """
+        Initialize a pooled HTTP client for the SPX backend
+
+        Args:
+            base_url (str): Scheme and host of the SPX site (or a local stand-in server)
+            cookies (list): Selenium-style cookie dicts ({name, value, domain, path})
+            headers (dict): Extra headers sent with every request
+            api_paths (dict): Overrides for DEFAULT_API_PATHS, paths or absolute URLs
+            pool_size (int): Keep-alive connections kept open per host
+            timeout (float): Per-request timeout in seconds
+            rate_limit (float): Maximum requests per second per host (None for unlimited)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.api_paths = dict(DEFAULT_API_PATHS)
+        self.api_paths.update(api_paths or {})
+        # Incremented from worker threads (concurrent detail fetches, pipeline consumers)
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+        self.session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.session.headers.update({
+            "Accept": "application/json, text/plain, */*",
+            "Referer": f"{self.base_url}/inbound-management/receive-task",
+        })
+        self.session.headers.update(headers or {})
+
+        for cookie in cookies or []:
+            self.session.cookies.set(cookie["name"], cookie["value"],
+                                     domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+
+    @classmethod
+    def from_driver(cls, driver, api_endpoints=None, **kwargs):
+        """
+        Build a client from a logged-in Selenium driver's cookies and browser headers
+
+        Args:
+            driver: Logged-in WebDriver on the SPX site
+            api_endpoints (dict): Endpoints discovered by network capture, if any
+        """
+        base_url = kwargs.pop("base_url", SPX_BASE_URL)
+
+        headers = {"User-Agent": driver.execute_script("return navigator.userAgent")}
+        cookies = driver.get_cookies()
+
+        # Django-style CSRF protection expects the token cookie echoed back as a header
+        csrf_token = next((c["value"] for c in cookies if c["name"].lower() == "csrftoken"), None)
+        if csrf_token:
+            headers["X-CSRFToken"] = csrf_token
+
+        logger.info(f"Exported {len(cookies)} session cookies from the browser for HTTP fetching")
+        return cls(base_url=base_url, cookies=cookies, headers=headers, api_paths=api_endpoints, **kwargs)
+
+    def get_json(self, endpoint, params=None):
+        """GET an SPX endpoint and return the decoded JSON body"""
+        url = urljoin(self.base_url + "/", self.api_paths[endpoint])
+        if self.rate_limiter:
+            self.rate_limiter.acquire(urlparse(url).netloc)
+        with self._count_lock:
+            self.request_count += 1
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+
+        try:
+            payload = response.json()
+        except ValueError:
+            raise SPXApiError(f"{url} did not return JSON (session expired?)")
+
+        if isinstance(payload, dict) and payload.get("retcode", 0) != 0:
+            raise SPXApiError(f"{url} returned retcode {payload.get('retcode')}: {payload.get('message', '')}")
+        return payload
+
+    def iter_task_list_pages(self, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield (page number, task rows, total) for every receive task list page
+
+        The server may cap the page size below the one requested, so a short page does not
+        mean the last page: the scan stops once 'total' rows are seen, or at an empty page
+        """
+        page = 1
+        seen = 0
+        previous_rows = None
+        while True:
+            payload = self.get_json("task_list", {PAGE_PARAM: page, PAGE_SIZE_PARAM: page_size})
+            rows = decode_task_records(payload)
+            total = find_total(payload)
+            # A server that ignores the page parameter keeps answering with the same page
+            if not rows or rows == previous_rows:
+                return
+            yield page, rows, total
+
+            seen += len(rows)
+            if total is not None and seen >= total:
+                return
+            previous_rows = rows
+            page += 1
+
+    def fetch_task_list(self, page_size=DEFAULT_PAGE_SIZE):
+        """Fetch every receive task row across all list pages"""
+        all_rows = []
+        for page, rows, total in self.iter_task_list_pages(page_size):
+            logger.info(f"[HTTP] Task list page {page}: {len(rows)} tasks (total: {total})")
+            all_rows.extend(rows)
+        return all_rows
+
+    def fetch_task_detail(self, task_id, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Fetch every parcel of one receive task across all detail pages
+
+        Returns:
+            dict: sender_id -> list of unique tracking numbers
+        """
+        all_tracking_data = {}
+        unique = set()
+        page = 1
+        seen = 0
+        while True:
+            payload = self.get_json("task_detail", {TASK_ID_PARAM: task_id, PAGE_PARAM: page,
+                                                    PAGE_SIZE_PARAM: page_size})
+            page_tracking_data = decode_tracking_records(payload)
+            total = find_total(payload)
+
+            page_rows = 0
+            unique_before = len(unique)
+            for sender_id, tracking_list in page_tracking_data.items():
+                known = all_tracking_data.setdefault(sender_id, [])
+                for tracking in tracking_list:
+                    page_rows += 1
+                    if (sender_id, tracking) not in unique:
+                        unique.add((sender_id, tracking))
+                        known.append(tracking)
+
+            seen += page_rows
+            # Pages may be shorter than requested (capped by the server), so only the total,
+            # an empty page or a page repeating known parcels ends the task
+            if not page_rows or (total is not None and seen >= total) or len(unique) == unique_before:
+                break
+            page += 1
+
+        logger.info(f"[HTTP] Task {task_id}: {seen} parcels over {page} pages")
+        return all_tracking_data
+
+    def close(self):
+        self.session.close()
+
+
+async def _fetch_task_details_async(client, task_ids, concurrency, on_result):
+    """Fetch task details on a bounded thread pool, at most `concurrency` in flight"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="spx-detail") as executor:
+        async def fetch_one(index, task_id):
+            async with semaphore:
+                try:
+                    result = await loop.run_in_executor(executor, client.fetch_task_detail, task_id)
+                except Exception as e:
+                    result = e
+            if on_result:
+                on_result(index, task_id, result)
+            return result
+
+        return await asyncio.gather(*(fetch_one(index, task_id) for index, task_id in enumerate(task_ids)))
+
+
+def fetch_task_details_concurrently(client, task_ids, concurrency=8, on_result=None):
+    """
+    Fetch many task details concurrently over one pooled client
+
+    Args:
+        client (SPXHttpClient): Client carrying the logged-in session (and optional rate limit)
+        task_ids (list): Receive task IDs to fetch
+        concurrency (int): Maximum number of tasks in flight
+        on_result (callable): Called as on_result(index, task_id, result) as each task finishes
+
+    Returns:
+        list: Per task, in task_ids order, the sender -> tracking dict or the exception raised
+    """
+    started = time.time()
+    results = asyncio.run(_fetch_task_details_async(client, task_ids, max(1, concurrency), on_result))
+
+    elapsed = time.time() - started
+    failures = sum(isinstance(result, Exception) for result in results)
+    logger.info(f"[HTTP] Fetched {len(task_ids)} task details in {elapsed:.1f}s with concurrency {concurrency} "
+                f"({len(task_ids) / elapsed if elapsed else 0:.1f} tasks/s, {failures} failed)")
+    return results
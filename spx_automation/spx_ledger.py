@@ -0,0 +1,140 @@
+"""
+SPX Ledger - Persistent record of audited receive tasks
+Done tasks never change, so once a task has been audited its sender counts are
+kept in a local SQLite database keyed by receive_task_id and later runs only
+fetch the tasks that are not in the ledger yet
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed_tasks (
+    receive_task_id TEXT PRIMARY KEY,
+    complete_time TEXT,
+    status TEXT,
+    sender_data TEXT NOT NULL,
+    total_quantity INTEGER NOT NULL,
+    sender_count INTEGER NOT NULL,
+    processed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ledger_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Newest completion time up to which every Done task has been audited
+WATERMARK_KEY = "complete_time_watermark"
+
+# Placeholder senders of a task whose detail could not be read: ERROR when the page failed,
+# NO_DATA when it rendered no parcels in time
+FAILURE_MARKERS = ("ERROR", "NO_DATA")
+
+
+def audit_failed(task_audit):
+    """Whether a task audit is a failure placeholder rather than real sender counts"""
+    return any(marker in task_audit["sender_data"] for marker in FAILURE_MARKERS)
+
+
+class TaskLedger:
+    def __init__(self, path):
+        """
+        Open (or create) the ledger database
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # Pipeline consumers record results from their own threads
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(LEDGER_SCHEMA)
+        self.connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM processed_tasks").fetchone()[0]
+
+    def processed_ids(self, task_ids):
+        """
+        Which of the given task IDs are already in the ledger
+
+        Returns:
+            set: Task IDs recorded by an earlier run
+        """
+        task_ids = list(task_ids)
+        found = set()
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(task_ids), 500):
+                chunk = task_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT receive_task_id FROM processed_tasks WHERE receive_task_id IN ({placeholders})", chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    def get(self, task_id):
+        """The recorded audit of one task, or None"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT receive_task_id, complete_time, status, sender_data, total_quantity, sender_count, "
+                "processed_at FROM processed_tasks WHERE receive_task_id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "receive_task_id": row[0],
+            "complete_time": row[1],
+            "status": row[2],
+            "sender_data": json.loads(row[3]),
+            "total_quantity": row[4],
+            "sender_count": row[5],
+            "processed_at": row[6],
+        }
+
+    def record(self, task_audits):
+        """
+        Store task audits, replacing earlier records of the same tasks
+
+        Tasks whose detail failed (sender_data holds a FAILURE_MARKERS placeholder) are not
+        recorded, so the next run fetches them again
+
+        Returns:
+            int: Number of tasks recorded
+        """
+        rows = [
+            (audit["receive_task_id"], audit["complete_time"], audit["status"], json.dumps(audit["sender_data"]),
+             audit["total_quantity"], audit["sender_count"], audit["processed_at"])
+            for audit in task_audits
+            if not audit_failed(audit)
+        ]
+        with self._lock:
+            self.connection.executemany("INSERT OR REPLACE INTO processed_tasks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.connection.commit()
+        return len(rows)
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM ledger_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self.connection.execute("INSERT OR REPLACE INTO ledger_meta VALUES (?, ?)", (key, value))
+            self.connection.commit()
+
+    def get_watermark(self):
+        """The completion-time watermark as 'YYYY-MM-DD HH:MM:SS', or None before the first full run"""
+        return self.get_meta(WATERMARK_KEY)
+
+    def set_watermark(self, value):
+        self.set_meta(WATERMARK_KEY, value)
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
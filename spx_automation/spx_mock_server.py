@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+SPX Mock Server - Local stand-in for the SPX receive task endpoints
+Serves a deterministic set of receive tasks and parcels with the same paths,
+query parameters, pagination and {retcode, data: {total, list}} envelope the
+HTTP fetch engine expects, so it can be exercised offline:
+
+    python spx_mock_server.py --port 8765 --tasks 60
+    SPX_BASE_URL=http://127.0.0.1:8765 python spx_audit_automation.py --http-fetch --concurrency 8
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from spx_http_client import DEFAULT_API_PATHS, PAGE_PARAM, PAGE_SIZE_PARAM, TASK_ID_PARAM
+
+SESSION_COOKIE = "spx_mock_session"
+
+
+def build_dataset(task_count=60, max_parcels=120, seed=7):
+    """
+    Build a reproducible list of receive tasks with parcels
+
+    Returns:
+        list: Task dicts ordered newest first, each with a 'parcels' list
+    """
+    rng = random.Random(seed)
+    senders = [1257601721 + index * 37 for index in range(25)]
+    newest = datetime(2025, 8, 6, 18, 0, 0)
+
+    tasks = []
+    for index in range(task_count):
+        complete_time = newest - timedelta(minutes=45 * index)
+        status = "Done" if index % 7 else "Pending"
+        task_id = f"DRT{complete_time:%Y%m%d}{index:02d}MCK"
+        parcels = [
+            {
+                "shop_id": rng.choice(senders),
+                "tracking_no": f"PH25{index:04d}{parcel:06d}S",
+                "receive_time": int((complete_time - timedelta(minutes=parcel % 30)).timestamp()),
+            }
+            for parcel in range(rng.randint(1, max_parcels))
+        ]
+        tasks.append({
+            "receive_task_id": task_id,
+            "complete_time": int(complete_time.timestamp()),
+            "status_name": status,
+            "parcels": parcels,
+        })
+    return tasks
+
+
+class MockSPXHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real backend
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _page(self, records, query):
+        page = max(1, int(query.get(PAGE_PARAM, ["1"])[0]))
+        size = max(1, min(self.server.max_page_size, int(query.get(PAGE_SIZE_PARAM, ["24"])[0])))
+        start = (page - 1) * size
+        return {"retcode": 0, "message": "success",
+                "data": {"total": len(records), "pageno": page, "count": size, "list": records[start:start + size]}}
+
+    def do_GET(self):
+        self.server.request_count += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if self.server.require_cookie and SESSION_COOKIE not in (self.headers.get("Cookie") or ""):
+            self._send_json({"retcode": 401, "message": "not logged in"})
+            return
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == DEFAULT_API_PATHS["task_list"]:
+            rows = [{key: value for key, value in task.items() if key != "parcels"} for task in self.server.tasks]
+            self._send_json(self._page(rows, query))
+        elif url.path == DEFAULT_API_PATHS["task_detail"]:
+            task_id = query.get(TASK_ID_PARAM, [""])[0]
+            task = self.server.tasks_by_id.get(task_id)
+            if task is None:
+                self._send_json({"retcode": 404, "message": f"unknown task {task_id}"})
+                return
+            parcels = [dict(parcel, receive_task_id=task_id) for parcel in task["parcels"]]
+            self._send_json(self._page(parcels, query))
+        else:
+            self._send_json({"retcode": 404, "message": "not found"}, status=404)
+
+
+def start_server(host="127.0.0.1", port=0, tasks=None, latency=0.0, max_page_size=100,
+                 require_cookie=False, verbose=False):
+    """
+    Start the mock server on a background thread
+
+    Returns:
+        tuple: (server, base_url); call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), MockSPXHandler)
+    server.daemon_threads = True
+    server.tasks = tasks if tasks is not None else build_dataset()
+    server.tasks_by_id = {task["receive_task_id"]: task for task in server.tasks}
+    server.latency = latency
+    server.max_page_size = max_page_size
+    server.require_cookie = require_cookie
+    server.verbose = verbose
+    server.request_count = 0
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the SPX receive task endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tasks", type=int, default=60, help="Number of receive tasks to serve")
+    parser.add_argument("--max-parcels", type=int, default=120, help="Upper bound of parcels per task")
+    parser.add_argument("--latency", type=float, default=0.0, help="Artificial seconds of latency per request")
+    parser.add_argument("--max-page-size", type=int, default=100, help="Largest page size the server honours")
+    parser.add_argument("--require-cookie", action="store_true",
+                        help=f"Reject requests without a '{SESSION_COOKIE}' cookie")
+    args = parser.parse_args()
+
+    tasks = build_dataset(args.tasks, args.max_parcels)
+    server, base_url = start_server(args.host, args.port, tasks, args.latency, args.max_page_size,
+                                    args.require_cookie, verbose=True)
+    print(f"SPX mock server listening on {base_url} ({len(tasks)} tasks)")
+    print(f"  task list:   {base_url}{DEFAULT_API_PATHS['task_list']}?{PAGE_PARAM}=1&{PAGE_SIZE_PARAM}=24")
+    print(f"  task detail: {base_url}{DEFAULT_API_PATHS['task_detail']}?{TASK_ID_PARAM}={tasks[0]['receive_task_id']}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+SPX Pipeline - Streaming list-and-detail execution
+The task list producer feeds each page's Done tasks into a bounded queue as soon
+as the page is scanned, and detail consumers work on them concurrently, so detail
+results start arriving while the list is still being scanned. The bounded queue
+pauses the producer whenever the consumers fall behind, keeping memory flat.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the task stream for one consumer
+_DONE = object()
+
+
+def run_list_detail_pipeline(task_pages, make_consumer, consumers=4, queue_size=None, max_tasks=None,
+                             on_result=None, on_failure=None):
+    """
+    Run detail consumers on threads while task list pages are produced on the calling thread
+
+    Args:
+        task_pages (iterable): Yields lists of Done task dicts, one list per scanned page; it is
+            consumed on the calling thread, so it may drive the caller's own browser
+        make_consumer (callable): Called as make_consumer(consumer_id) on each consumer thread;
+            returns (process, close) where process(task_info) returns a task audit and close()
+            releases the consumer's resources
+        consumers (int): Number of concurrent detail consumers
+        queue_size (int): Tasks buffered between producer and consumers, defaults to 2 per consumer
+        max_tasks (int): Stop producing after this many tasks
+        on_result (callable): Called as on_result(index, task_audit) as each task finishes
+        on_failure (callable): Called as on_failure(index, task_info) for each task that failed
+
+    Returns:
+        tuple: (task audits in production order, pipeline stats)
+    """
+    consumers = max(1, consumers)
+    tasks = queue.Queue(maxsize=queue_size or consumers * 2)
+    results = {}
+    results_lock = threading.Lock()
+    stats = {"pages": 0, "produced": 0, "completed": 0, "failures": 0, "producer_blocked_seconds": 0.0,
+             "first_result_seconds": None}
+    started = time.time()
+
+    def consume(consumer_id):
+        close = None
+        try:
+            process, close = make_consumer(consumer_id)
+        except Exception as e:
+            logger.error(f"[PIPE] Consumer {consumer_id} could not start: {str(e)}")
+            process = None
+
+        while True:
+            item = tasks.get()
+            if item is _DONE:
+                break
+            index, task_info = item
+            try:
+                if process is None:
+                    raise RuntimeError("consumer not started")
+                task_audit = process(task_info)
+            except Exception as e:
+                logger.error(f"[PIPE] Consumer {consumer_id} failed on {task_info['task_id']}: {str(e)}")
+                task_audit = None
+
+            with results_lock:
+                if task_audit is None:
+                    stats["failures"] += 1
+                else:
+                    results[index] = task_audit
+                    stats["completed"] += 1
+                    if stats["first_result_seconds"] is None:
+                        stats["first_result_seconds"] = time.time() - started
+                        logger.info(f"[PIPE] First detail result after {stats['first_result_seconds']:.1f}s")
+            if task_audit is not None and on_result:
+                on_result(index, task_audit)
+            elif task_audit is None and on_failure:
+                on_failure(index, task_info)
+
+        if close:
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"[PIPE] Consumer {consumer_id} close failed: {str(e)}")
+
+    threads = [threading.Thread(target=consume, args=(consumer_id + 1,), name=f"spx-consumer-{consumer_id + 1}",
+                                daemon=True)
+               for consumer_id in range(consumers)]
+    for thread in threads:
+        thread.start()
+    logger.info(f"[PIPE] Started {consumers} detail consumers (queue size {tasks.maxsize})")
+
+    try:
+        for page_tasks in task_pages:
+            stats["pages"] += 1
+            for task_info in page_tasks:
+                if max_tasks and stats["produced"] >= max_tasks:
+                    break
+                # Blocks while the queue is full: the backpressure that pauses the list scan
+                put_started = time.time()
+                tasks.put((stats["produced"], task_info))
+                stats["producer_blocked_seconds"] += time.time() - put_started
+                stats["produced"] += 1
+            if max_tasks and stats["produced"] >= max_tasks:
+                break
+    except Exception as e:
+        # The tasks of the pages never scanned are missing, so the run counts as failed
+        logger.error(f"[PIPE] Task list producer stopped: {str(e)}")
+        stats["failures"] += 1
+        stats["producer_error"] = str(e)
+    finally:
+        for _ in threads:
+            tasks.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    stats["elapsed_seconds"] = time.time() - started
+    logger.info(f"[PIPE] {stats['completed']}/{stats['produced']} tasks done by {consumers} consumers in "
+                f"{stats['elapsed_seconds']:.1f}s ({stats['failures']} failed, producer paused "
+                f"{stats['producer_blocked_seconds']:.1f}s by backpressure)")
+
+    return [results[index] for index in sorted(results)], stats
@@ -0,0 +1,310 @@
+"""
+SPX Results - Queryable SQLite store of audit results
+Every audited task is kept in a local database with one row per task and one
+row per task and sender, indexed by sender, task and completion day, so
+questions like "how many parcels did seller X hand over in August" are one
+query instead of loading every JSON export in output/
+
+Usage:
+    python spx_results.py daily --sender 1257601721 --since 2025-08-01 --until 2025-08-31
+    python spx_results.py top --limit 10
+    python spx_results.py tasks 1257601721
+    python spx_results.py import output/spx_audit_data_*.json
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from spx_extractors import parse_complete_time
+from spx_ledger import audit_failed
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_PATH = os.path.join(SCRIPT_DIR, 'output', 'spx_results.sqlite3')
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    receive_task_id TEXT PRIMARY KEY,
+    complete_time TEXT,
+    complete_date TEXT,
+    status TEXT,
+    total_quantity INTEGER NOT NULL,
+    sender_count INTEGER NOT NULL,
+    processed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_senders (
+    receive_task_id TEXT NOT NULL REFERENCES tasks(receive_task_id) ON DELETE CASCADE,
+    sender_id TEXT NOT NULL,
+    complete_date TEXT,
+    tracking_count INTEGER NOT NULL,
+    PRIMARY KEY (receive_task_id, sender_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_complete_date ON tasks (complete_date);
+CREATE INDEX IF NOT EXISTS idx_task_senders_sender_date ON task_senders (sender_id, complete_date);
+CREATE INDEX IF NOT EXISTS idx_task_senders_date ON task_senders (complete_date);
+"""
+
+
+def complete_date(complete_time):
+    """'YYYY-MM-DD' of a task's completion time, or None when it cannot be read"""
+    completed = parse_complete_time(complete_time)
+    return completed.strftime('%Y-%m-%d') if completed else None
+
+
+class ResultsStore:
+    def __init__(self, path=DEFAULT_RESULTS_PATH):
+        """
+        Open (or create) the results database
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(RESULTS_SCHEMA)
+        self.connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def record(self, task_audits):
+        """
+        Store task audits, replacing earlier results of the same tasks
+
+        Tasks whose detail failed (ERROR or NO_DATA placeholders) are not stored, as in
+        the ledger, so the results only hold real counts. A task listed more than once in
+        the batch (older exports can repeat tasks) is stored once, from its last entry
+
+        Returns:
+            int: Number of tasks stored
+        """
+        latest = {}
+        for audit in task_audits:
+            if not audit_failed(audit):
+                latest[audit["receive_task_id"]] = audit
+
+        task_rows = []
+        sender_rows = []
+        for audit in latest.values():
+            day = complete_date(audit["complete_time"])
+            task_rows.append((audit["receive_task_id"], audit["complete_time"], day, audit["status"],
+                              audit["total_quantity"], audit["sender_count"], audit["processed_at"]))
+            sender_rows.extend((audit["receive_task_id"], str(sender_id), day, quantity)
+                               for sender_id, quantity in audit["sender_data"].items())
+
+        with self._lock:
+            with self.connection:
+                # A re-audited task replaces its sender rows as a whole (the cascade drops the old ones)
+                self.connection.executemany("DELETE FROM tasks WHERE receive_task_id = ?",
+                                            [(row[0],) for row in task_rows])
+                self.connection.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", task_rows)
+                self.connection.executemany("INSERT INTO task_senders VALUES (?, ?, ?, ?)", sender_rows)
+        return len(task_rows)
+
+    def import_json(self, paths):
+        """
+        Load JSON exports of earlier runs (the spx_audit_data_*.json files)
+
+        Returns:
+            int: Number of tasks stored
+        """
+        recorded = 0
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    recorded += self.record(json.load(f))
+            except Exception as e:
+                logger.error(f"[RESULTS] Could not import {path}: {str(e)}")
+        return recorded
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _window(column, since, until):
+        """WHERE clauses and parameters for an inclusive 'YYYY-MM-DD' day window"""
+        clauses, params = [], []
+        if since:
+            clauses.append(f"{column} >= ?")
+            params.append(since)
+        if until:
+            clauses.append(f"{column} <= ?")
+            params.append(until)
+        return clauses, params
+
+    def parcels_per_sender_per_day(self, sender_id=None, since=None, until=None):
+        """
+        Parcels handed over per sender and completion day
+
+        Returns:
+            list: (complete_date, sender_id, tasks, parcels) rows, by day then most parcels
+        """
+        clauses, params = self._window("complete_date", since, until)
+        if sender_id:
+            clauses.append("sender_id = ?")
+            params.append(str(sender_id))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(
+            "SELECT complete_date, sender_id, COUNT(*), SUM(tracking_count) FROM task_senders "
+            f"{where} GROUP BY complete_date, sender_id ORDER BY complete_date, SUM(tracking_count) DESC", params)
+
+    def top_senders(self, since=None, until=None, limit=10):
+        """
+        Senders with the most parcels in a day window
+
+        Returns:
+            list: (sender_id, tasks, parcels) rows, most parcels first
+        """
+        clauses, params = self._window("complete_date", since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(
+            "SELECT sender_id, COUNT(*), SUM(tracking_count) FROM task_senders "
+            f"{where} GROUP BY sender_id ORDER BY SUM(tracking_count) DESC LIMIT ?", params + [limit])
+
+    def tasks_for_sender(self, sender_id, since=None, until=None):
+        """
+        Receive tasks a sender's parcels arrived in
+
+        Returns:
+            list: (receive_task_id, complete_time, tracking_count, task total) rows, newest first
+        """
+        clauses, params = self._window("s.complete_date", since, until)
+        clauses.insert(0, "s.sender_id = ?")
+        params.insert(0, str(sender_id))
+        return self._query(
+            "SELECT t.receive_task_id, t.complete_time, s.tracking_count, t.total_quantity "
+            "FROM task_senders s JOIN tasks t ON t.receive_task_id = s.receive_task_id "
+            f"WHERE {' AND '.join(clauses)} ORDER BY t.complete_time DESC", params)
+
+    def task_audits(self, since=None, until=None):
+        """
+        Stored tasks of a completion-day window, rebuilt as task audits
+
+        Returns:
+            list: Task audit dicts in the shape of the spx_audit_data_*.json exports, newest first
+        """
+        clauses, params = self._window("t.complete_date", since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(
+            "SELECT t.receive_task_id, t.complete_time, t.status, t.total_quantity, t.sender_count, t.processed_at, "
+            "s.sender_id, s.tracking_count FROM tasks t LEFT JOIN task_senders s ON s.receive_task_id = t.receive_task_id "
+            f"{where} ORDER BY t.complete_date DESC, t.receive_task_id", params)
+
+        audits = {}
+        for task_id, complete_time, status, total_quantity, sender_count, processed_at, sender_id, tracking_count in rows:
+            audit = audits.setdefault(task_id, {
+                "receive_task_id": task_id,
+                "complete_time": complete_time,
+                "status": status,
+                "sender_data": {},
+                "total_quantity": total_quantity,
+                "sender_count": sender_count,
+                "processed_at": processed_at
+            })
+            if sender_id is not None:
+                audit["sender_data"][sender_id] = tracking_count
+        return sorted(audits.values(), key=lambda audit: parse_complete_time(audit["complete_time"]) or datetime.min,
+                      reverse=True)
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+def day(text):
+    """argparse type for day arguments"""
+    try:
+        return datetime.strptime(text.strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected 'YYYY-MM-DD', got '{text}'")
+
+
+def print_table(columns, rows, total_column=None):
+    """Print query rows as an aligned text table, with an optional total of one column"""
+    if not rows:
+        print("No results")
+        return
+
+    cells = [[str(value) for value in row] for row in rows]
+    if total_column is not None:
+        total = ["" for _ in columns]
+        total[0] = "TOTAL"
+        total[total_column] = str(sum(row[total_column] or 0 for row in rows))
+        cells.append(total)
+    widths = [max(len(column), *(len(row[index]) for row in cells)) for index, column in enumerate(columns)]
+
+    for row in [columns, ["-" * width for width in widths]] + cells:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Query the SPX audit results database")
+    parser.add_argument("--db", default=DEFAULT_RESULTS_PATH, help="SQLite results database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    daily = commands.add_parser("daily", help="Parcels per sender per completion day")
+    daily.add_argument("--sender", help="Only this sender ID")
+    daily.add_argument("--since", type=day, help="First day, YYYY-MM-DD")
+    daily.add_argument("--until", type=day, help="Last day, YYYY-MM-DD")
+
+    top = commands.add_parser("top", help="Senders with the most parcels (this week by default)")
+    top.add_argument("--since", type=day, help="First day, YYYY-MM-DD (default: this Monday)")
+    top.add_argument("--until", type=day, help="Last day, YYYY-MM-DD")
+    top.add_argument("--limit", type=int, default=10, help="Number of senders shown")
+
+    tasks = commands.add_parser("tasks", help="Receive tasks holding a sender's parcels")
+    tasks.add_argument("sender", help="Sender ID")
+    tasks.add_argument("--since", type=day, help="First day, YYYY-MM-DD")
+    tasks.add_argument("--until", type=day, help="Last day, YYYY-MM-DD")
+
+    load = commands.add_parser("import", help="Load JSON exports of earlier runs")
+    load.add_argument("files", nargs="*", help="JSON files (default: output/spx_audit_data_*.json)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Query command line"""
+    args = parse_args(argv)
+    store = ResultsStore(args.db)
+    try:
+        if args.command == "daily":
+            rows = store.parcels_per_sender_per_day(args.sender, args.since, args.until)
+            print_table(("Date", "Sender ID", "Tasks", "Parcels"), rows, total_column=3)
+        elif args.command == "top":
+            since = args.since
+            if not since and not args.until:
+                today = datetime.now().date()
+                since = (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d')
+                print(f"Week starting {since}")
+            rows = store.top_senders(since, args.until, args.limit)
+            print_table(("Sender ID", "Tasks", "Parcels"), rows)
+        elif args.command == "tasks":
+            rows = store.tasks_for_sender(args.sender, args.since, args.until)
+            print_table(("Receive Task", "Complete Time", "Parcels", "Task Total"), rows, total_column=2)
+        elif args.command == "import":
+            files = args.files or sorted(glob.glob(os.path.join(SCRIPT_DIR, 'output', 'spx_audit_data_*.json')))
+            recorded = store.import_json(files)
+            print(f"✅ Imported {recorded} tasks from {len(files)} files ({len(store)} tasks in {store.path})")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
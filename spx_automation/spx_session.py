@@ -0,0 +1,104 @@
+"""
+SPX Session - Snapshot and restore of an authenticated browser session
+Lets additional Chrome instances reuse the one interactive SPX login, and
+later runs reuse it too through a saved session file
+"""
+
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+SPX_HOME_URL = "https://sp.spx.shopee.ph/"
+
+# Cookie fields accepted by WebDriver's add_cookie
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+
+def snapshot_session(driver):
+    """
+    Capture the logged-in state of a driver
+
+    Returns:
+        dict: {cookies, local_storage, user_agent}, picklable so it can be handed to other processes
+    """
+    return {
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(
+            "const items = {};"
+            "for (let i = 0; i < localStorage.length; i++) {"
+            "    const key = localStorage.key(i);"
+            "    items[key] = localStorage.getItem(key);"
+            "}"
+            "return items;"
+        ) or {},
+        "user_agent": driver.execute_script("return navigator.userAgent"),
+    }
+
+
+def restore_session(driver, session, home_url=SPX_HOME_URL):
+    """Load a session snapshot into a fresh driver (cookies can only be set on their own domain)"""
+    driver.get(home_url)
+
+    restored = 0
+    for cookie in session.get("cookies", []):
+        try:
+            driver.add_cookie({key: value for key, value in cookie.items() if key in COOKIE_FIELDS})
+            restored += 1
+        except Exception as e:
+            logger.debug(f"Could not restore cookie {cookie.get('name')}: {str(e)}")
+
+    local_storage = session.get("local_storage") or {}
+    if local_storage:
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) { localStorage.setItem(key, value); }",
+            local_storage
+        )
+
+    logger.info(f"Restored {restored} cookies and {len(local_storage)} localStorage entries")
+    return restored
+
+
+def save_session_file(session, path):
+    """
+    Write a session snapshot for later runs
+
+    The file holds live login cookies, so it is replaced atomically and kept readable
+    by the current user only (on POSIX; Windows ignores the mode, so keep the file
+    out of shared or synced folders)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as f:
+        json.dump({"saved_at": time.time(), **session}, f)
+    os.replace(temp_path, path)
+    logger.info(f"Saved {len(session.get('cookies', []))} cookies to {path}")
+
+
+def load_session_file(path):
+    """
+    Read a saved session snapshot, leaving out cookies that have expired since
+
+    Returns:
+        dict: The snapshot, or None when there is no usable file
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            session = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable session file {path}: {str(e)}")
+        return None
+
+    now = time.time()
+    session["cookies"] = [cookie for cookie in session.get("cookies", [])
+                          if not cookie.get("expiry") or cookie["expiry"] > now]
+    if not session["cookies"]:
+        logger.info(f"Every cookie in {path} has expired")
+        return None
+    return session
@@ -0,0 +1,185 @@
+"""
+SPX Waits - Condition-based waits that replace fixed time.sleep calls
+Each wait polls one cheap page-state snapshot, returns as soon as its readiness
+predicate holds, and records how long it took so a run can report time spent
+waiting versus working
+"""
+
+import logging
+import time
+
+from spx_extractors import PAGE_STATE_JS
+
+logger = logging.getLogger(__name__)
+
+
+# Readiness predicates over the PAGE_STATE_JS snapshot
+
+def document_ready():
+    """The document has finished loading"""
+    return lambda state: state["ready_state"] == "complete"
+
+
+def tbody_has_rows(url_fragment=None):
+    """The table body has rendered rows (on a page whose URL contains url_fragment, if given)"""
+    def condition(state):
+        return state["rows"] > 0 and (url_fragment is None or url_fragment in state["url"])
+    return condition
+
+
+def active_pager_changed(previous_page):
+    """The active pager item is no longer previous_page"""
+    return lambda state: state["active_page"] is not None and state["active_page"] != previous_page
+
+
+def first_row_changed(previous_key):
+    """Rows are rendered and the first row differs from the one seen before the click"""
+    return lambda state: state["rows"] > 0 and state["first_row"] != previous_key
+
+
+def row_count_above(previous_rows):
+    """More rows are rendered than before (e.g. after switching to a larger page size)"""
+    return lambda state: state["rows"] > previous_rows
+
+
+def on_page(page, previous_state=None):
+    """The active pager item is page and, if a previous state is given, the rows were replaced"""
+    def condition(state):
+        if state["rows"] <= 0 or state["active_page"] != page:
+            return False
+        return previous_state is None or state["first_row"] != previous_state["first_row"]
+    return condition
+
+
+def page_or_login(url_fragment):
+    """Rows rendered on a page whose URL contains url_fragment, or a redirect to the login page"""
+    return lambda state: "login" in state["url"].lower() or (state["rows"] > 0 and url_fragment in state["url"])
+
+
+def logged_in(auth_cookie=None):
+    """
+    Login completed, over LOGIN_STATE_JS snapshots: the receive-task menu rendered, the auth
+    cookie was set, or the tab left the login page it was on earlier
+    """
+    seen_login = {"value": False}
+
+    def condition(state):
+        on_login = "login" in state["url"].lower()
+        seen_login["value"] = seen_login["value"] or on_login
+        if auth_cookie and auth_cookie in state.get("cookies", ()):
+            return True
+        return not on_login and (state["menu"] or seen_login["value"])
+    return condition
+
+
+def page_changed(previous_state):
+    """After a pager click: the active page moved or the first row changed"""
+    pager_moved = active_pager_changed(previous_state["active_page"])
+    rows_moved = first_row_changed(previous_state["first_row"])
+    return lambda state: state["rows"] > 0 and (pager_moved(state) or rows_moved(state))
+
+
+class WaitEngine:
+    def __init__(self, driver, timeout=10, poll_interval=0.1):
+        """
+        Initialize the wait engine
+
+        Args:
+            driver: WebDriver whose current page is polled
+            timeout (float): Default seconds before a wait gives up
+            poll_interval (float): Seconds between page-state polls
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.waits = []
+        self.started = time.time()
+
+    def start_run(self):
+        """Reset the accounting, e.g. once the interactive login is over"""
+        self.waits = []
+        self.started = time.time()
+
+    def page_state(self):
+        """One-call snapshot of row count, first row key, active page and load state"""
+        return self.driver.execute_script(PAGE_STATE_JS)
+
+    def until(self, name, condition, timeout=None, probe=None):
+        """
+        Poll until condition(page_state) holds
+
+        Args:
+            name (str): Label used in the latency summary (e.g. 'detail page load')
+            condition (callable): Predicate over the page-state snapshot
+            timeout (float): Seconds before giving up, defaults to the engine timeout
+            probe (callable): Alternative snapshot to poll instead of page_state
+
+        Returns:
+            dict: The page state that satisfied the condition, or None on timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        probe = probe or self.page_state
+        started = time.time()
+        state = None
+
+        while True:
+            try:
+                state = probe()
+                if state and condition(state):
+                    self._record(name, started, True)
+                    return state
+            except Exception as e:
+                # Scripts can fail mid-navigation; keep polling until the timeout
+                logger.debug(f"[WAIT] {name}: page state unavailable ({str(e)})")
+
+            if time.time() - started >= timeout:
+                self._record(name, started, False)
+                logger.warning(f"[WAIT] {name}: condition not met after {timeout:.1f}s")
+                return None
+            time.sleep(self.poll_interval)
+
+    def sleep(self, name, seconds):
+        """A fixed pause that is still accounted for in the summary"""
+        started = time.time()
+        time.sleep(seconds)
+        self._record(name, started, True)
+
+    def _record(self, name, started, satisfied):
+        elapsed = time.time() - started
+        self.waits.append({"name": name, "seconds": elapsed, "satisfied": satisfied})
+        logger.debug(f"[WAIT] {name}: {elapsed:.2f}s ({'ok' if satisfied else 'timeout'})")
+
+    def summary(self):
+        """
+        Summarize observed wait latencies
+
+        Returns:
+            dict: total/waiting/working seconds and per-wait-name count, mean, max and timeouts
+        """
+        total = time.time() - self.started
+        waiting = sum(wait["seconds"] for wait in self.waits)
+
+        by_name = {}
+        for wait in self.waits:
+            entry = by_name.setdefault(wait["name"], {"count": 0, "seconds": 0.0, "max": 0.0, "timeouts": 0})
+            entry["count"] += 1
+            entry["seconds"] += wait["seconds"]
+            entry["max"] = max(entry["max"], wait["seconds"])
+            entry["timeouts"] += 0 if wait["satisfied"] else 1
+
+        for entry in by_name.values():
+            entry["mean"] = entry["seconds"] / entry["count"]
+
+        return {"total_seconds": total, "waiting_seconds": waiting,
+                "working_seconds": max(0.0, total - waiting), "waits": by_name}
+
+    def log_summary(self):
+        """Log time spent waiting compared with working"""
+        summary = self.summary()
+        total = summary["total_seconds"] or 1
+        logger.info(f"[WAIT] Run took {summary['total_seconds']:.1f}s: waiting {summary['waiting_seconds']:.1f}s "
+                    f"({summary['waiting_seconds'] / total:.0%}), working {summary['working_seconds']:.1f}s")
+        for name, entry in sorted(summary["waits"].items(), key=lambda item: -item[1]["seconds"]):
+            logger.info(f"[WAIT]   {name}: {entry['count']} waits, mean {entry['mean']:.2f}s, "
+                        f"max {entry['max']:.2f}s, {entry['timeouts']} timeouts")
+        return summary
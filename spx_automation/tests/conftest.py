@@ -0,0 +1,129 @@
+"""
+Shared test setup: the automation modules are imported from the folder above,
+the same way the scripts import each other
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Minimal DOM stand-in for the page-state scripts: table rows and an active pager item
+FAKE_DOM_JS = """
+const page = JSON.parse(process.argv[process.argv.length - 1]);
+const rows = page.rows.map(function (text) { return {innerText: text, textContent: text}; });
+const document = {
+    readyState: 'complete',
+    querySelectorAll: function (selector) { return selector === 'table tbody tr' ? rows : []; },
+    querySelector: function (selector) {
+        return selector === 'li.pager-item.active' && page.active !== null ? {textContent: page.active} : null;
+    }
+};
+const window = {location: {href: page.url}};
+console.log(JSON.stringify((function () { %s })()));
+"""
+
+
+@pytest.fixture
+def run_page_script():
+    """Run one of the in-browser snapshot scripts under Node against a fake page"""
+    node = shutil.which("node")
+    if not node:
+        pytest.skip("node is not installed")
+
+    def run(script, rows, active, url="https://sp.spx.shopee.ph/inbound-management/receive-task"):
+        page = json.dumps({"rows": rows, "active": active, "url": url})
+        output = subprocess.run([node, "-e", FAKE_DOM_JS % script, "--", page], capture_output=True, text=True,
+                                check=True).stdout
+        return json.loads(output)
+    return run
+
+
+@pytest.fixture
+def task_audit():
+    """Factory for task audits shaped like SPXAuditAutomationFixed.build_task_audit's records"""
+    def make(task_id, sender_data=None, complete_time="2025-08-06 09:15:00", processed_at="2025-08-06T13:57:34",
+             status="Done"):
+        sender_data = {"111": 1} if sender_data is None else sender_data
+        return {
+            "receive_task_id": task_id,
+            "complete_time": complete_time,
+            "status": status,
+            "sender_data": sender_data,
+            "total_quantity": sum(sender_data.values()),
+            "sender_count": len(sender_data),
+            "processed_at": processed_at
+        }
+    return make
+
+
+# Newest first, as SPX lists them: one page of 2 tasks, then an older page
+LIST_PAGES = [
+    [{"task_id": "DRT3", "complete_time": "2025-08-05 20:00:00", "status": "Done"},
+     {"task_id": "DRT2", "complete_time": "2025-08-05 12:00:00", "status": "Done"}],
+    [{"task_id": "DRT1", "complete_time": "2025-08-04 09:00:00", "status": "Done"}],
+]
+
+
+@pytest.fixture
+def make_automation(tmp_path, monkeypatch):
+    """Automation whose browser steps are replaced by a scripted task list"""
+    import spx_audit_automation
+    from spx_audit_automation import SPXAuditAutomationFixed
+    from spx_ledger import TaskLedger
+    from spx_waits import WaitEngine
+
+    monkeypatch.setattr(spx_audit_automation, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(spx_audit_automation, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    ledger_path = str(tmp_path / "ledger.sqlite3")
+
+    def make(navigation_fails=False, page_read_fails=False):
+        automation = SPXAuditAutomationFixed(headless=True, ledger_path=ledger_path, results_path=None)
+        shown = {"page": 0}
+
+        def setup_driver():
+            automation.waits = WaitEngine(None)
+            return True
+
+        def scan_current_page_tasks():
+            if page_read_fails and shown["page"] == 1:
+                automation.scan_errors += 1
+                return [], []
+            return list(LIST_PAGES[shown["page"]]), []
+
+        def navigate_to_next_page_in_task_list(page_info):
+            if navigation_fails:
+                return False
+            shown["page"] += 1
+            return True
+
+        def audit_tasks(tasks_data):
+            for index, task_info in enumerate(tasks_data):
+                task_audit = automation.build_task_audit(task_info, {"111": 1})
+                automation.audit_data.append(task_audit)
+                automation.task_finished(task_audit, index)
+
+        automation.setup_driver = setup_driver
+        automation.open_spx_homepage = lambda: True
+        automation.navigate_to_receive_tasks = lambda: True
+        automation.plan_task_list_scan = lambda start_page=1: (1, None)
+        automation.scan_current_page_tasks = scan_current_page_tasks
+        automation.check_for_next_page_in_task_list = lambda: shown["page"] < len(LIST_PAGES) - 1
+        automation.navigate_to_next_page_in_task_list = navigate_to_next_page_in_task_list
+        automation.audit_tasks = audit_tasks
+        return automation
+
+    def watermark():
+        ledger = TaskLedger(ledger_path)
+        try:
+            return ledger.get_watermark()
+        finally:
+            ledger.close()
+
+    return make, watermark
@@ -0,0 +1,89 @@
+"""Run checkpoints: unique run IDs, torn-line recovery, part-way tasks and clean-run cleanup"""
+
+import json
+import os
+import re
+
+import pytest
+
+from spx_checkpoint import RunCheckpoint, new_run_id
+
+
+def test_run_ids_carry_a_random_suffix():
+    assert re.match(r"^\d{8}_\d{6}_[0-9a-f]{4}$", new_run_id())
+
+
+def test_a_new_run_never_reuses_an_existing_file(tmp_path, monkeypatch):
+    run_ids = iter(["20250806_180000_0000", "20250806_180000_0000", "20250806_180000_0001"])
+    monkeypatch.setattr("spx_checkpoint.new_run_id", lambda: next(run_ids))
+    RunCheckpoint(str(tmp_path)).close()
+    checkpoint = RunCheckpoint(str(tmp_path))
+    checkpoint.close()
+    assert checkpoint.run_id == "20250806_180000_0001"
+
+
+def test_resume_of_an_unknown_run_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RunCheckpoint(str(tmp_path), "20250806_180000_0000")
+
+
+def test_a_torn_last_line_is_ignored_and_terminated(tmp_path, task_audit):
+    checkpoint = RunCheckpoint(str(tmp_path))
+    checkpoint.add_tasks([{"task_id": "DRT1"}, {"task_id": "DRT2"}])
+    checkpoint.complete_manifest()
+    checkpoint.add_task(task_audit("DRT1"))
+    checkpoint.close()
+    with open(checkpoint.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "task", "audit": {"receive_task_id": "DR')
+
+    resumed = RunCheckpoint(str(tmp_path), checkpoint.run_id)
+    assert resumed.manifest_complete
+    assert [task["task_id"] for task in resumed.manifest] == ["DRT1", "DRT2"]
+    assert list(resumed.completed) == ["DRT1"]
+
+    # Records appended after the resume start on a line of their own
+    resumed.add_task(task_audit("DRT2"))
+    resumed.close()
+    with open(checkpoint.path, encoding='utf-8') as f:
+        assert json.loads(f.read().splitlines()[-1])["audit"]["receive_task_id"] == "DRT2"
+    reloaded = RunCheckpoint(str(tmp_path), checkpoint.run_id)
+    assert set(reloaded.completed) == {"DRT1", "DRT2"}
+    reloaded.close()
+
+
+def test_resume_pages_continue_after_the_last_consecutive_page(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path))
+    checkpoint.add_page("DRT1", 1, 100, {"111": ["SPX1", "SPX2"]})
+    checkpoint.add_page("DRT1", 2, 100, {"111": ["SPX2", "SPX3"], "222": ["SPX4"]})
+    checkpoint.add_page("DRT1", 4, 100, {"222": ["SPX9"]})
+    checkpoint.close()
+
+    resumed = RunCheckpoint(str(tmp_path), checkpoint.run_id)
+    assert resumed.resume_pages("DRT1", 100) == (2, {"111": ["SPX1", "SPX2", "SPX3"], "222": ["SPX4"]})
+    # Pages read at another page size do not line up with the current ones
+    assert resumed.resume_pages("DRT1", 50) == (0, {})
+    assert resumed.resume_pages("DRT2", 100) == (0, {})
+    resumed.close()
+
+
+def test_a_finished_task_drops_its_pages(tmp_path, task_audit):
+    checkpoint = RunCheckpoint(str(tmp_path))
+    checkpoint.add_page("DRT1", 1, 100, {"111": ["SPX1"]})
+    checkpoint.add_task(task_audit("DRT1"))
+    checkpoint.close()
+    resumed = RunCheckpoint(str(tmp_path), checkpoint.run_id)
+    assert resumed.resume_pages("DRT1", 100) == (0, {})
+    resumed.close()
+
+
+def test_a_clean_run_removes_its_checkpoint(make_automation, tmp_path):
+    make, _ = make_automation
+    assert make().audit_all_tasks()
+    assert os.listdir(tmp_path / "checkpoints") == []
+
+
+def test_an_incomplete_run_keeps_its_checkpoint(make_automation, tmp_path):
+    make, _ = make_automation
+    automation = make(navigation_fails=True)
+    assert automation.audit_all_tasks()
+    assert os.listdir(tmp_path / "checkpoints") == [f"{automation.checkpoint.run_id}.jsonl"]
@@ -0,0 +1,48 @@
+"""ChromeDriver resolution without a matching local driver, or without Chrome's version"""
+
+import json
+import sys
+
+import pytest
+
+import spx_chromedriver
+from spx_chromedriver import ChromeDriverResolver
+
+
+@pytest.fixture
+def no_local_driver(monkeypatch):
+    """A machine with Chrome 120 but no cached, PATH or webdriver-manager driver"""
+    monkeypatch.delenv("SPX_CHROMEDRIVER", raising=False)
+    monkeypatch.setattr(spx_chromedriver, "chrome_major_version", lambda binary: 120)
+    monkeypatch.setattr(spx_chromedriver.shutil, "which", lambda name: None)
+    monkeypatch.setattr(spx_chromedriver, "downloaded_drivers", lambda: [])
+
+
+def test_offline_resolution_fails_instead_of_falling_back_to_selenium_manager(no_local_driver, tmp_path):
+    resolver = ChromeDriverResolver(str(tmp_path / "cache.json"), allow_download=False)
+    with pytest.raises(RuntimeError, match="Offline mode"):
+        resolver.resolve("/usr/bin/google-chrome")
+    assert resolver.source is None
+
+
+def test_online_resolution_still_leaves_the_lookup_to_selenium_manager(no_local_driver, tmp_path, monkeypatch):
+    # webdriver-manager unavailable, so the download step falls through
+    monkeypatch.setitem(sys.modules, "webdriver_manager.chrome", None)
+    resolver = ChromeDriverResolver(str(tmp_path / "cache.json"))
+    assert resolver.resolve("/usr/bin/google-chrome") is None
+    assert resolver.source == "Selenium Manager"
+
+
+def test_an_unknown_chrome_version_never_uses_the_driver_cache(tmp_path, monkeypatch):
+    stale_driver = tmp_path / "chromedriver-old"
+    stale_driver.write_text("")
+    cache_path = tmp_path / "cache.json"
+    cache_path.write_text(json.dumps({"unknown": str(stale_driver)}))
+    monkeypatch.delenv("SPX_CHROMEDRIVER", raising=False)
+    monkeypatch.setattr(spx_chromedriver, "chrome_major_version", lambda binary: None)
+    monkeypatch.setattr(spx_chromedriver.shutil, "which", lambda name: "/usr/bin/chromedriver")
+
+    resolver = ChromeDriverResolver(str(cache_path))
+    assert resolver.resolve("/usr/bin/google-chrome") == "/usr/bin/chromedriver"
+    assert resolver.source == "PATH"
+    assert json.loads(cache_path.read_text()) == {"unknown": str(stale_driver)}
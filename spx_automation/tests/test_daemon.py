@@ -0,0 +1,52 @@
+"""Daemon results for window jobs over days earlier runs already audited"""
+
+import json
+from datetime import datetime
+
+from spx_daemon import AuditDaemon
+from spx_results import ResultsStore
+
+
+def finished_job(results_path, since=None, until=None):
+    return {"id": "job", "_results_path": results_path, "_options": {"since": since, "until": until, "refresh": False}}
+
+
+def test_window_job_includes_tasks_audited_by_earlier_runs(tmp_path, task_audit):
+    results_db = str(tmp_path / "results.sqlite3")
+    store = ResultsStore(results_db)
+    store.record([
+        task_audit("DRT1", {"111": 2}, complete_time="2025-08-05 08:00:00"),
+        task_audit("DRT2", {"222": 1}, complete_time="2025-08-05 20:00:00"),
+        task_audit("DRT3", {"333": 4}, complete_time="2025-08-04 12:00:00"),
+    ])
+    store.close()
+
+    # The job itself only audited one new task; the ledger skipped the others
+    export = tmp_path / "spx_audit_data_job.json"
+    export.write_text(json.dumps([task_audit("DRT4", {"444": 1}, complete_time="2025-08-05 21:00:00")]),
+                      encoding='utf-8')
+
+    daemon = AuditDaemon({"results_path": results_db})
+    job = finished_job(str(export), since=datetime(2025, 8, 5, 12, 0), until=datetime(2025, 8, 5, 23, 59, 59))
+    assert [audit["receive_task_id"] for audit in daemon.job_results(job)] == ["DRT4", "DRT2"]
+
+
+def test_window_job_without_new_tasks_is_not_empty(tmp_path, task_audit):
+    results_db = str(tmp_path / "results.sqlite3")
+    store = ResultsStore(results_db)
+    store.record([task_audit("DRT1", {"111": 2}, complete_time="2025-08-05 08:00:00")])
+    store.close()
+
+    daemon = AuditDaemon({"results_path": results_db})
+    job = finished_job(None, since=datetime(2025, 8, 5))
+    assert daemon.job_results(job) == [task_audit("DRT1", {"111": 2}, complete_time="2025-08-05 08:00:00")]
+
+
+def test_job_without_window_returns_only_its_own_tasks(tmp_path, task_audit):
+    results_db = str(tmp_path / "results.sqlite3")
+    store = ResultsStore(results_db)
+    store.record([task_audit("DRT1", {"111": 2}, complete_time="2025-08-05 08:00:00")])
+    store.close()
+
+    daemon = AuditDaemon({"results_path": results_db})
+    assert daemon.job_results(finished_job(None)) == []
@@ -0,0 +1,55 @@
+"""Streaming export sink: task order in the files, and what reaches the Parquet dataset"""
+
+import json
+
+import pytest
+
+from spx_exporters import AuditExportSink
+
+
+def exported_ids(sink):
+    json_path = next(path for path in sink.paths if path.endswith(".json"))
+    with open(json_path, encoding='utf-8') as f:
+        return [task["receive_task_id"] for task in json.load(f)]
+
+
+def test_out_of_order_tasks_are_written_in_index_order(tmp_path, task_audit):
+    sink = AuditExportSink(str(tmp_path), "spx_audit_data", "test", parquet=False)
+    sink.write(task_audit("RESUMED"))
+    for index in (2, 0, 3, 1):
+        sink.write(task_audit(f"DRT{index}"), index)
+    assert sink.close()
+    assert exported_ids(sink) == ["RESUMED", "DRT0", "DRT1", "DRT2", "DRT3"]
+
+
+def test_skipped_index_releases_later_tasks(tmp_path, task_audit):
+    sink = AuditExportSink(str(tmp_path), "spx_audit_data", "test", parquet=False)
+    sink.write(task_audit("DRT2"), 2)
+    sink.write(task_audit("DRT0"), 0)
+    assert sink.task_count == 1
+    sink.skip(1)
+    assert sink.task_count == 2
+    assert sink.close()
+    assert exported_ids(sink) == ["DRT0", "DRT2"]
+
+
+def test_close_writes_tasks_held_behind_a_gap(tmp_path, task_audit):
+    sink = AuditExportSink(str(tmp_path), "spx_audit_data", "test", parquet=False)
+    sink.write(task_audit("DRT3"), 3)
+    sink.write(task_audit("DRT1"), 1)
+    assert sink.close()
+    assert exported_ids(sink) == ["DRT1", "DRT3"]
+
+
+def test_parquet_dataset_leaves_out_failed_and_resumed_tasks(tmp_path, task_audit):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = AuditExportSink(str(tmp_path), "spx_audit_data", "test")
+    sink.write(task_audit("RESUMED"), resumed=True)
+    sink.write(task_audit("DRT0", {"111": 2, "222": 1}), 0)
+    sink.write(task_audit("DRT1", {"ERROR": 0}), 1)
+    assert sink.close()
+
+    assert exported_ids(sink) == ["RESUMED", "DRT0", "DRT1"]
+    table = pq.read_table(str(tmp_path / "parquet"))
+    assert sorted(set(table.column("receive_task_id").to_pylist())) == ["DRT0"]
+    assert sum(table.column("tracking_count").to_pylist()) == 3
@@ -0,0 +1,61 @@
+"""Network capture decoders: SPX API payloads are read by field name, not position"""
+
+from datetime import datetime
+
+from spx_extractors import decode_task_records, decode_tracking_records, find_total, iter_record_lists
+
+
+def test_task_records_are_decoded_by_field_name():
+    payload = {"retcode": 0, "data": {"total": 2, "list": [
+        {"status_text": "Completed", "receive_task_id": "DRT2508060001", "complete_time": "2025-08-06 09:15:00"},
+        {"complete_time": 0, "receive_task_id": "DRT2508060002", "status_name": "Processing"},
+    ]}}
+    assert decode_task_records(payload) == [
+        {"task_id": "DRT2508060001", "complete_time": "2025-08-06 09:15:00", "status": "Done"},
+        {"task_id": "DRT2508060002", "complete_time": "N/A", "status": "Pending"},
+    ]
+
+
+def test_unix_times_are_rendered_like_the_ui():
+    seconds = int(datetime(2025, 8, 6, 9, 15).timestamp())
+    for value in (seconds, seconds * 1000):
+        records = decode_task_records({"list": [{"id": "DRT2508060001", "finish_time": value, "status": "done"}]})
+        assert records[0]["complete_time"] == "2025-08-06 09:15:00"
+
+
+def test_numeric_status_codes_are_unknown():
+    records = decode_task_records({"list": [{"receive_task_id": "DRT2508060001", "status": 3}]})
+    assert records[0]["status"] == "Unknown"
+
+
+def test_payloads_without_tasks_decode_to_nothing():
+    assert decode_task_records({"retcode": 0, "data": {"total": 0, "list": []}}) == []
+    # The first record list holding tasks wins, other lists (e.g. filters) are skipped
+    payload = {"filters": [{"name": "Done"}], "data": {"list": [{"task": "DRT2508060001"}]}}
+    assert [row["task_id"] for row in decode_task_records(payload)] == ["DRT2508060001"]
+
+
+def test_tracking_records_are_grouped_by_sender():
+    payload = {"data": {"list": [
+        {"tracking_number": "PH251249207504S", "shop_id": 1257601721, "shop_name": "Shop A"},
+        {"sender_id": "1257601721", "tracking_number": "PH251249207505S"},
+        {"seller_id": "3344556677", "tracking_number": "PH251249207506S"},
+        {"sender_id": "", "tracking_number": "PH251249207507S"},
+        {"sender_id": True, "tracking_number": "PH251249207508S"},
+    ]}}
+    assert decode_tracking_records(payload) == {
+        "1257601721": ["PH251249207504S", "PH251249207505S"],
+        "3344556677": ["PH251249207506S"],
+    }
+    assert decode_tracking_records({"data": {"list": []}}) == {}
+
+
+def test_find_total_searches_nested_payloads():
+    assert find_total({"retcode": 0, "data": {"total": 120, "list": []}}) == 120
+    assert find_total({"data": {"total_count": 7}}) == 7
+    assert find_total({"data": {"total": True, "list": []}}) is None
+
+
+def test_iter_record_lists_finds_nested_lists():
+    payload = {"a": [{"x": 1}], "b": {"c": [[{"y": 2}]]}}
+    assert list(iter_record_lists(payload)) == [[{"x": 1}], [{"y": 2}]]
@@ -0,0 +1,69 @@
+"""HTML parse engine: lxml and the standard library parser read the same rows"""
+
+import pytest
+
+import spx_extractors
+from spx_extractors import parse_table_html, parse_task_rows_html, parse_tracking_html
+
+TASK_LIST_HTML = """
+<html><body>
+<table><thead><tr><th>Task ID</th><th>Complete Time</th><th>Status</th></tr></thead>
+<tbody>
+  <tr><td>DRT2508060001</td><td>2025-08-06 09:15:00</td>
+      <td><span class="status-tag success">Completed</span></td></tr>
+  <tr><td>DRT2508060002</td><td>-</td><td><span class="status-tag pending">Processing</span></td></tr>
+  <tr><td>DRT2508060003</td><td>2025-08-06 10:00:00</td><td><span class="status-tag fail">Failed</span></td></tr>
+  <tr><td>Loading<br>more</td><td></td><td></td></tr>
+</tbody></table>
+</body></html>
+"""
+
+TRACKING_HTML = """
+<table><tbody>
+  <tr><td>1257601721</td><td>Shop A</td><td><a href="#">PH251249207504S</a></td></tr>
+  <tr><td>1257601721</td><td>Shop A</td><td>PH251249207505S</td></tr>
+  <tr><td>3344556677</td><td>Shop B</td><td>
+      PH251249207506S
+  </td></tr>
+  <tr><td>12345</td><td>Too short</td><td>PH251249207507S</td></tr>
+  <tr><td>3344556677</td><td>Shop B</td>
+</tbody></table>
+"""
+
+
+@pytest.fixture(params=["lxml", "stdlib"])
+def html_parser(request, monkeypatch):
+    """Run each test with lxml and again with the standard library fallback"""
+    if request.param == "lxml":
+        if spx_extractors.lxml_html is None:
+            pytest.skip("lxml is not installed")
+    else:
+        monkeypatch.setattr(spx_extractors, "lxml_html", None)
+    return request.param
+
+
+def test_task_rows_and_statuses(html_parser):
+    assert parse_task_rows_html(TASK_LIST_HTML) == [
+        {"task_id": "DRT2508060001", "complete_time": "2025-08-06 09:15:00", "status": "Done"},
+        {"task_id": "DRT2508060002", "complete_time": "N/A", "status": "Pending"},
+        {"task_id": "DRT2508060003", "complete_time": "2025-08-06 10:00:00", "status": "Failed"},
+    ]
+
+
+def test_only_tbody_rows_and_normalized_cells(html_parser):
+    rows = parse_table_html(TASK_LIST_HTML)
+    assert len(rows) == 4
+    assert rows[0]["badges"] == [("status-tag success", "Completed")]
+    assert rows[3]["cells"][0] == "Loading more"
+
+
+def test_tracking_numbers_grouped_by_sender(html_parser):
+    assert parse_tracking_html(TRACKING_HTML) == {
+        "1257601721": ["PH251249207504S", "PH251249207505S"],
+        "3344556677": ["PH251249207506S"],
+    }
+
+
+def test_empty_html(html_parser):
+    assert parse_table_html("") == []
+    assert parse_task_rows_html("<table><tbody></tbody></table>") == []
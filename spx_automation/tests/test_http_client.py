@@ -0,0 +1,82 @@
+"""HTTP fetch engine pagination against the local mock server"""
+
+import pytest
+
+from spx_http_client import SPXHttpClient, fetch_task_details_concurrently
+from spx_mock_server import build_dataset, start_server
+
+
+@pytest.fixture
+def capped_server():
+    """Mock server that honours at most 24 rows per page, whatever page size is requested"""
+    tasks = build_dataset(task_count=150, max_parcels=300)
+    server, base_url = start_server(tasks=tasks, max_page_size=24)
+    yield tasks, base_url
+    server.shutdown()
+
+
+def test_task_list_reads_every_page_when_the_server_caps_the_page_size(capped_server):
+    tasks, base_url = capped_server
+    client = SPXHttpClient(base_url=base_url)
+    try:
+        rows = client.fetch_task_list(page_size=100)
+    finally:
+        client.close()
+    assert len(rows) == len(tasks)
+
+
+def test_task_detail_reads_every_page_when_the_server_caps_the_page_size(capped_server):
+    tasks, base_url = capped_server
+    task = max(tasks, key=lambda task: len(task["parcels"]))
+    assert len(task["parcels"]) > 24
+
+    client = SPXHttpClient(base_url=base_url)
+    try:
+        tracking = client.fetch_task_detail(task["receive_task_id"], page_size=100)
+    finally:
+        client.close()
+    assert sum(len(numbers) for numbers in tracking.values()) == len(task["parcels"])
+
+
+def test_uncapped_server_needs_no_extra_request():
+    tasks = build_dataset(task_count=30)
+    server, base_url = start_server(tasks=tasks)
+    client = SPXHttpClient(base_url=base_url)
+    try:
+        assert len(client.fetch_task_list(page_size=100)) == 30
+        assert client.request_count == 1
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_concurrent_fetches_count_every_request():
+    tasks = build_dataset(task_count=40, max_parcels=10)
+    server, base_url = start_server(tasks=tasks)
+    client = SPXHttpClient(base_url=base_url)
+    try:
+        task_ids = [task["receive_task_id"] for task in tasks]
+        results = fetch_task_details_concurrently(client, task_ids, concurrency=8)
+        assert not any(isinstance(result, Exception) for result in results)
+        assert client.request_count == len(task_ids)
+    finally:
+        client.close()
+        server.shutdown()
+
+
+class NumericStatusClient:
+    """Backend whose task list carries numeric status codes, which decode as 'Unknown'"""
+
+    def iter_task_list_pages(self):
+        yield 1, [{"task_id": "DRT1", "complete_time": "2025-08-06 09:15:00", "status": "Unknown"}], 1
+
+
+def test_numeric_task_statuses_fall_back_to_the_browser_scan():
+    from spx_audit_automation import SPXAuditAutomationFixed
+
+    automation = SPXAuditAutomationFixed(ledger_path=None, results_path=None)
+    automation.http_client = NumericStatusClient()
+    browser_tasks = [{"task_id": "DRT1", "complete_time": "2025-08-06 09:15:00", "status": "Done"}]
+    automation.navigate_to_receive_tasks = lambda: True
+    automation.scan_and_extract_tasks = lambda start_page=1: browser_tasks
+    assert automation.scan_tasks_http() == browser_tasks
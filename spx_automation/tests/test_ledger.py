@@ -0,0 +1,62 @@
+"""Task ledger: what is recorded, and which tasks later runs skip"""
+
+import pytest
+
+from spx_audit_automation import SPXAuditAutomationFixed
+from spx_ledger import TaskLedger, audit_failed
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = TaskLedger(str(tmp_path / "ledger.sqlite3"))
+    yield ledger
+    ledger.close()
+
+
+def test_failed_audits_are_not_recorded(ledger, task_audit):
+    recorded = ledger.record([task_audit("DRT1"), task_audit("DRT2", {"ERROR": 0}), task_audit("DRT3", {"NO_DATA": 0})])
+    assert recorded == 1
+    assert ledger.processed_ids(["DRT1", "DRT2", "DRT3"]) == {"DRT1"}
+
+
+def test_audit_failed_markers(task_audit):
+    assert audit_failed(task_audit("DRT1", {"ERROR": 0}))
+    assert audit_failed(task_audit("DRT1", {"NO_DATA": 0}))
+    assert not audit_failed(task_audit("DRT1", {"111": 3}))
+
+
+def test_rerecording_a_task_replaces_it(ledger, task_audit):
+    ledger.record([task_audit("DRT1", {"111": 1})])
+    ledger.record([task_audit("DRT1", {"111": 4, "222": 1})])
+    assert len(ledger) == 1
+    assert ledger.get("DRT1")["sender_data"] == {"111": 4, "222": 1}
+
+
+def test_processed_ids_spans_many_chunks(ledger, task_audit):
+    ledger.record([task_audit(f"DRT{number}") for number in range(1200)])
+    assert len(ledger.processed_ids(f"DRT{number}" for number in range(0, 2400, 2))) == 600
+
+
+def test_first_run_records_into_an_empty_ledger(tmp_path, task_audit):
+    # An empty ledger has length 0, which must not read as "no ledger"
+    ledger_path = str(tmp_path / "ledger.sqlite3")
+    automation = SPXAuditAutomationFixed(ledger_path=ledger_path, results_path=None)
+    automation.ledger = TaskLedger(ledger_path)
+    automation.audit_data = [task_audit("DRT1")]
+    automation.record_to_ledger()
+    assert automation.ledger.processed_ids(["DRT1"]) == {"DRT1"}
+    automation.ledger.close()
+
+
+def test_known_tasks_are_skipped_unless_refreshing(tmp_path, task_audit):
+    ledger_path = str(tmp_path / "ledger.sqlite3")
+    automation = SPXAuditAutomationFixed(ledger_path=ledger_path, results_path=None)
+    automation.ledger = TaskLedger(ledger_path)
+    automation.ledger.record([task_audit("DRT1")])
+    tasks = [{"task_id": "DRT1", "complete_time": "2025-08-06 09:15:00", "status": "Done"},
+             {"task_id": "DRT2", "complete_time": "2025-08-06 10:15:00", "status": "Done"}]
+
+    assert [task["task_id"] for task in automation.skip_processed_tasks(tasks)] == ["DRT2"]
+    automation.refresh = True
+    assert automation.skip_processed_tasks(tasks) == tasks
+    automation.ledger.close()
@@ -0,0 +1,90 @@
+"""List/detail pipeline: backpressure on the list scan and producer failures"""
+
+import threading
+
+from spx_pipeline import run_list_detail_pipeline
+
+
+def make_pages(page_count, page_size):
+    return [[{"task_id": f"DRT{page}_{row}"} for row in range(page_size)] for page in range(page_count)]
+
+
+def echo_consumer(consumer_id):
+    return (lambda task_info: {"receive_task_id": task_info["task_id"]}), None
+
+
+def test_results_come_back_in_production_order():
+    pages = make_pages(3, 4)
+    task_audits, stats = run_list_detail_pipeline(iter(pages), echo_consumer, consumers=3)
+
+    assert [audit["receive_task_id"] for audit in task_audits] == [task["task_id"] for page in pages for task in page]
+    assert stats["pages"] == 3
+    assert stats["produced"] == stats["completed"] == 12
+    assert stats["failures"] == 0
+
+
+def test_a_full_queue_pauses_the_producer():
+    release = threading.Event()
+    scanned = []
+
+    def task_pages():
+        for page in make_pages(4, 2):
+            scanned.append(page)
+            yield page
+
+    def blocked_consumer(consumer_id):
+        def process(task_info):
+            release.wait(5)
+            return {"receive_task_id": task_info["task_id"]}
+        return process, None
+
+    def unblock():
+        scanned_while_blocked.append(len(scanned))
+        release.set()
+
+    # At most one task in the consumer and one in the queue: the producer stalls by the second page
+    scanned_while_blocked = []
+    timer = threading.Timer(0.3, unblock)
+    timer.start()
+    task_audits, stats = run_list_detail_pipeline(task_pages(), blocked_consumer, consumers=1, queue_size=1)
+    timer.join()
+
+    assert scanned_while_blocked[0] <= 2
+    assert len(task_audits) == 8
+    assert stats["producer_blocked_seconds"] > 0.1
+
+
+def test_a_producer_error_counts_as_a_failure():
+    def task_pages():
+        yield make_pages(1, 2)[0]
+        raise RuntimeError("pagination failed")
+
+    task_audits, stats = run_list_detail_pipeline(task_pages(), echo_consumer, consumers=2)
+
+    assert len(task_audits) == 2
+    assert stats["failures"] == 1
+    assert stats["producer_error"] == "pagination failed"
+
+
+def test_failed_tasks_reach_on_failure():
+    failed = []
+
+    def flaky_consumer(consumer_id):
+        def process(task_info):
+            if task_info["task_id"].endswith("_1"):
+                raise RuntimeError("detail page did not load")
+            return {"receive_task_id": task_info["task_id"]}
+        return process, None
+
+    task_audits, stats = run_list_detail_pipeline(iter(make_pages(2, 2)), flaky_consumer, consumers=2,
+                                                  on_failure=lambda index, task_info: failed.append(index))
+
+    assert len(task_audits) == 2
+    assert stats["failures"] == 2
+    assert sorted(failed) == [1, 3]
+
+
+def test_max_tasks_stops_the_producer():
+    task_audits, stats = run_list_detail_pipeline(iter(make_pages(5, 3)), echo_consumer, consumers=2, max_tasks=4)
+    assert len(task_audits) == 4
+    assert stats["pages"] == 2
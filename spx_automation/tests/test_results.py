@@ -0,0 +1,58 @@
+"""Results store: batches with repeated tasks and re-imports of earlier exports"""
+
+import json
+import os
+
+import pytest
+
+from spx_results import ResultsStore
+
+EXPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output',
+                           'spx_audit_data_20250806_135734.json')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_repeated_task_in_one_batch_keeps_the_last_entry(store, task_audit):
+    recorded = store.record([
+        task_audit("DRT1", {"111": 2}),
+        task_audit("DRT2", {"222": 1}),
+        task_audit("DRT1", {"111": 5, "333": 1}, processed_at="2025-08-06T14:00:00"),
+    ])
+    assert recorded == 2
+    assert len(store) == 2
+    assert store.tasks_for_sender("111")[0][2] == 5
+    assert store.tasks_for_sender("333")[0][0] == "DRT1"
+
+
+def test_failed_entries_do_not_replace_a_good_one(store, task_audit):
+    store.record([task_audit("DRT1", {"111": 2}), task_audit("DRT1", {"ERROR": 0})])
+    assert store.tasks_for_sender("111")[0][2] == 2
+
+
+@pytest.mark.skipif(not os.path.exists(EXPORT_PATH), reason="no earlier export in output/")
+def test_reimporting_an_export_with_repeated_tasks(store):
+    with open(EXPORT_PATH, encoding='utf-8') as f:
+        audits = json.load(f)
+    unique = {audit["receive_task_id"] for audit in audits
+              if not any(marker in audit["sender_data"] for marker in ("ERROR", "NO_DATA"))}
+    assert len(unique) < len(audits)
+
+    assert store.import_json([EXPORT_PATH]) == len(unique)
+    assert store.import_json([EXPORT_PATH]) == len(unique)
+    assert len(store) == len(unique)
+
+
+def test_task_audits_round_trip_a_day_window(store, task_audit):
+    audits = [task_audit("DRT1", {"111": 2, "222": 3}),
+              task_audit("DRT2", {"111": 1}, complete_time="2025-08-07 10:00:00")]
+    store.record(audits)
+
+    assert store.task_audits(since="2025-08-07") == [audits[1]]
+    assert store.task_audits(until="2025-08-06") == [audits[0]]
+    assert [audit["receive_task_id"] for audit in store.task_audits()] == ["DRT2", "DRT1"]
@@ -0,0 +1,43 @@
+"""Readiness predicates against the page-state snapshot PAGE_STATE_JS really returns"""
+
+from spx_extractors import PAGE_STATE_JS
+from spx_waits import on_page, page_changed, active_pager_changed
+
+
+def test_page_state_active_page_is_a_number(run_page_script):
+    state = run_page_script(PAGE_STATE_JS, ["DRT2 Done"], " 2 ")
+    assert state["active_page"] == 2
+    assert state["rows"] == 1
+
+
+def test_page_state_without_pager(run_page_script):
+    state = run_page_script(PAGE_STATE_JS, [], None)
+    assert state["active_page"] is None
+    assert state["rows"] == 0
+
+
+def test_on_page_matches_snapshot(run_page_script):
+    state = run_page_script(PAGE_STATE_JS, ["DRT2 Done"], "2")
+    assert on_page(2)(state)
+    assert not on_page(3)(state)
+
+
+def test_on_page_waits_for_new_rows(run_page_script):
+    before = run_page_script(PAGE_STATE_JS, ["DRT1 Done"], "1")
+    stale = run_page_script(PAGE_STATE_JS, ["DRT1 Done"], "2")
+    moved = run_page_script(PAGE_STATE_JS, ["DRT2 Done"], "2")
+    assert not on_page(2, before)(stale)
+    assert on_page(2, before)(moved)
+
+
+def test_on_page_needs_rows(run_page_script):
+    state = run_page_script(PAGE_STATE_JS, [], "2")
+    assert not on_page(2)(state)
+
+
+def test_page_changed_after_click(run_page_script):
+    before = run_page_script(PAGE_STATE_JS, ["DRT1 Done"], "1")
+    after = run_page_script(PAGE_STATE_JS, ["DRT2 Done"], "2")
+    assert page_changed(before)(after)
+    assert not page_changed(before)(before)
+    assert active_pager_changed(before["active_page"])(after)
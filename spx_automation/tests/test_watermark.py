@@ -0,0 +1,48 @@
+"""The watermark only moves after a run whose task list scan reached its end"""
+
+from spx_audit_automation import SPXAuditAutomationFixed
+from spx_ledger import TaskLedger
+
+
+def test_complete_scan_advances_the_watermark(make_automation):
+    make, watermark = make_automation
+    automation = make()
+    assert automation.audit_all_tasks()
+    assert automation.scan_complete and automation.full_run
+    assert watermark() == "2025-08-05 20:00:00"
+
+
+def test_failed_page_navigation_leaves_the_watermark(make_automation):
+    make, watermark = make_automation
+    automation = make(navigation_fails=True)
+    assert automation.audit_all_tasks()
+    assert len(automation.audit_data) == 2
+    assert not automation.scan_complete and not automation.full_run
+    assert watermark() is None
+
+
+def test_unreadable_page_leaves_the_watermark(make_automation):
+    make, watermark = make_automation
+    automation = make(page_read_fails=True)
+    assert automation.audit_all_tasks()
+    assert not automation.full_run
+    assert watermark() is None
+
+
+def test_watermark_stays_below_a_failed_task(tmp_path, task_audit):
+    ledger_path = str(tmp_path / "ledger.sqlite3")
+    automation = SPXAuditAutomationFixed(ledger_path=ledger_path, results_path=None)
+    automation.ledger = TaskLedger(ledger_path)
+    automation.full_run = True
+    automation.audit_data = [task_audit("DRT3", complete_time="2025-08-05 20:00:00"),
+                             task_audit("DRT2", {"ERROR": 0}, complete_time="2025-08-05 12:00:00"),
+                             task_audit("DRT1", complete_time="2025-08-04 09:00:00")]
+    automation.advance_watermark()
+    assert automation.ledger.get_watermark() == "2025-08-04 09:00:00"
+
+    # A failed pipeline (e.g. its list producer stopped) never moves it
+    automation.pipeline_stats = {"failures": 1}
+    automation.audit_data = [task_audit("DRT4", complete_time="2025-08-06 08:00:00")]
+    automation.advance_watermark()
+    assert automation.ledger.get_watermark() == "2025-08-04 09:00:00"
+    automation.ledger.close()